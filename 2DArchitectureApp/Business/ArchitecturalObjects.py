@@ -1,5 +1,5 @@
 import uuid
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, Iterable
 from enum import Enum
 import math
 
@@ -147,6 +147,33 @@ class Wall(ArchitecturalObject):
         import math
         return math.sqrt((self.x2 - self.x1) ** 2 + (self.y2 - self.y1) ** 2)
 
+    def set_endpoints(self, x1: float, y1: float, x2: float, y2: float):
+        #capetele peretelui; bbox-ul e recalculat ca in constructor
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.x = min(x1, x2)
+        self.y = min(y1, y2)
+        self.width = max(abs(x2 - x1), self.thickness)
+        self.height = max(abs(y2 - y1), self.thickness)
+
+    def set_position(self, x: float, y: float):
+        #mutarea bbox-ului muta si capetele
+        dx = x - self.x
+        dy = y - self.y
+        self.set_endpoints(self.x1 + dx, self.y1 + dy, self.x2 + dx, self.y2 + dy)
+
+    def rotate_about_center(self, angle: float):
+        #rotirea peretelui = rotirea capetelor in jurul mijlocului
+        cx = (self.x1 + self.x2) / 2
+        cy = (self.y1 + self.y2) / 2
+        a = math.radians(angle)
+        cos_a, sin_a = math.cos(a), math.sin(a)
+
+        def rot(px, py):
+            dx, dy = px - cx, py - cy
+            return cx + dx * cos_a - dy * sin_a, cy + dx * sin_a + dy * cos_a
+
+        self.set_endpoints(*rot(self.x1, self.y1), *rot(self.x2, self.y2))
+
 
 class Door(ArchitecturalObject):
     #clasa pt usi
@@ -157,12 +184,17 @@ class Door(ArchitecturalObject):
         self.color = "#A88F6E"
         self.opening_direction = "right"  # right, left
         self.opening_angle = 90  # grade
+        # peretele gazda si pozitia centrului de-a lungul lui (de la x1, y1)
+        self.host_wall_id: Optional[str] = None
+        self.offset = 0.0
 
     def to_dict(self) -> Dict:
         data = super().to_dict()
         data.update({
             'opening_direction': self.opening_direction,
-            'opening_angle': self.opening_angle
+            'opening_angle': self.opening_angle,
+            'host_wall_id': self.host_wall_id,
+            'offset': self.offset
         })
         return data
 
@@ -180,6 +212,8 @@ class Door(ArchitecturalObject):
         door.color = data.get('color', '#A88F6E')
         door.opening_direction = data.get('opening_direction', 'right')
         door.opening_angle = data.get('opening_angle', 90)
+        door.host_wall_id = data.get('host_wall_id')
+        door.offset = data.get('offset', 0.0)
         return door
 
 
@@ -190,9 +224,16 @@ class Window(ArchitecturalObject):
         super().__init__(x, y, width, height)
         self.layer = "doors_windows"
         self.color = "#7CB9E8"
+        self.host_wall_id: Optional[str] = None
+        self.offset = 0.0
 
     def to_dict(self) -> Dict:
-        return super().to_dict()
+        data = super().to_dict()
+        data.update({
+            'host_wall_id': self.host_wall_id,
+            'offset': self.offset
+        })
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict):
@@ -206,6 +247,8 @@ class Window(ArchitecturalObject):
         window.rotation = data.get('rotation', 0.0)
         window.layer = data.get('layer', 'doors_windows')
         window.color = data.get('color', '#7CB9E8')
+        window.host_wall_id = data.get('host_wall_id')
+        window.offset = data.get('offset', 0.0)
         return window
 
 
@@ -287,4 +330,31 @@ class Transform:
             obj.set_position(obj.x, obj.y + old_height - new_height)
         elif anchor == "bottomright":
             obj.set_size(new_width, new_height)
-            obj.set_position(obj.x + old_width - new_width, obj.y + old_height - new_height)
\ No newline at end of file
+            obj.set_position(obj.x + old_width - new_width, obj.y + old_height - new_height)
+
+
+def plan_bounds(walls: Iterable[Wall], others: Iterable[ArchitecturalObject],
+                margin: float = 0) -> Tuple[float, float, float, float]:
+    #limitele planului (x, y, w, h); cercul circumscris acopera orice rotatie
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+
+    for wl in walls:
+        half = wl.thickness / 2
+        min_x = min(min_x, wl.x1 - half, wl.x2 - half)
+        min_y = min(min_y, wl.y1 - half, wl.y2 - half)
+        max_x = max(max_x, wl.x1 + half, wl.x2 + half)
+        max_y = max(max_y, wl.y1 + half, wl.y2 + half)
+
+    for o in others:
+        cx, cy = o.get_center()
+        r = math.hypot(o.width, o.height) / 2
+        min_x = min(min_x, cx - r)
+        min_y = min(min_y, cy - r)
+        max_x = max(max_x, cx + r)
+        max_y = max(max_y, cy + r)
+
+    if min_x == math.inf:
+        return 0, 0, 100, 100
+
+    return min_x - margin, min_y - margin, (max_x - min_x) + 2 * margin, (max_y - min_y) + 2 * margin
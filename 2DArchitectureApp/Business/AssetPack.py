@@ -0,0 +1,200 @@
+"""Pachet precompilat pentru biblioteca de simboluri.
+
+Build (o singura data, necesita Pillow):
+    python -m Business.AssetPack [resources/svgs] [resources/assets.pack]
+
+Format (little-endian):
+    header  : magic(8) version(u32) count(u32) index_offset(u64) index_size(u64)
+    blobs   : pixeli RGBA premultiplicati, aliniati la 64 octeti
+    index   : JSON cu metadate si offset-urile fiecarui nivel mip
+
+La rulare fisierul e deschis cu mmap si nivelurile sunt citite direct din
+maparea de memorie, fara copiere si fara decodare.
+"""
+import base64
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Dict, List, Optional
+
+from .SymbolLibrary import RESOURCES_DIR, SVG_DIR, SYMBOLS, symbols_for_asset
+
+MAGIC = b"ARCHPAK1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+ALIGN = 64
+PIXEL_FORMAT = "RGBa"  # RGBA premultiplicat, ordine fixa a octetilor
+DEFAULT_PACK_PATH = os.path.join(RESOURCES_DIR, "assets.pack")
+
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+
+# =============================== BUILD ===============================
+
+def _read_svg(svg_dir: str, asset: str) -> bytes:
+    path = os.path.join(svg_dir, asset)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    # fallback pe arhiva livrata langa SVG-uri
+    for name in os.listdir(svg_dir):
+        if name.endswith(".zip"):
+            with zipfile.ZipFile(os.path.join(svg_dir, name)) as z:
+                if asset in z.namelist():
+                    return z.read(asset)
+
+    raise FileNotFoundError(asset)
+
+
+def _embedded_png(svg_data: bytes) -> bytes:
+    for _, el in ET.iterparse(io.BytesIO(svg_data), events=("end",)):
+        if el.tag.endswith("image"):
+            href = el.get(XLINK_HREF) or el.get("href") or ""
+            return base64.b64decode(href.split(",", 1)[1])
+    raise ValueError("SVG fara imagine incorporata")
+
+
+def build_pack(svg_dir: str = SVG_DIR, out_path: str = DEFAULT_PACK_PATH,
+               mip_levels: int = 4, min_size: int = 8) -> int:
+    """Compileaza simbolurile din svg_dir intr-un singur pachet. Returneaza nr. de simboluri."""
+    from PIL import Image
+
+    index: Dict[str, Dict] = {}
+    tmp_path = out_path + ".tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(b"\0" * HEADER.size)
+
+        assets = sorted({s.asset for s in SYMBOLS.values()})
+        for asset in assets:
+            sheet = Image.open(io.BytesIO(_embedded_png(_read_svg(svg_dir, asset)))).convert("RGBA")
+
+            for sym in symbols_for_asset(asset):
+                if sym.source_rect:
+                    x, y, w, h = sym.source_rect
+                    img = sheet.crop((x, y, x + w, y + h))
+                else:
+                    img = sheet
+
+                mips: List[Dict] = []
+                level = img
+                for _ in range(mip_levels):
+                    pad = (-f.tell()) % ALIGN
+                    f.write(b"\0" * pad)
+
+                    data = level.convert(PIXEL_FORMAT).tobytes()
+                    mips.append({
+                        "width": level.width,
+                        "height": level.height,
+                        "stride": level.width * 4,
+                        "offset": f.tell(),
+                        "size": len(data),
+                    })
+                    f.write(data)
+
+                    nw, nh = level.width // 2, level.height // 2
+                    if min(nw, nh) < min_size:
+                        break
+                    level = level.resize((nw, nh), Image.LANCZOS)
+
+                index[sym.name] = {
+                    "asset": asset,
+                    "category": sym.category,
+                    "label": sym.label,
+                    "natural_size": [img.width, img.height],
+                    "mips": mips,
+                }
+
+        index_data = json.dumps({"pixel_format": PIXEL_FORMAT, "symbols": index}).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index_data)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(index), index_offset, len(index_data)))
+
+    os.replace(tmp_path, out_path)
+    return len(index)
+
+
+# =============================== RUNTIME ===============================
+
+class AssetPack:
+    #pachet mapat in memorie, citit la cerere
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        # ACCESS_COPY: mapare privata, paginile sunt doar citite (fara copiere)
+        # dar buffer-ul e scriibil, deci QImage il poate referi direct
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, count, index_offset, index_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Pachet de asset-uri invalid: {path}")
+
+        meta = json.loads(self._mm[index_offset:index_offset + index_size])
+        self.pixel_format = meta["pixel_format"]
+        self.symbols: Dict[str, Dict] = meta["symbols"]
+        self._images = {}
+
+    @classmethod
+    def open_default(cls) -> Optional['AssetPack']:
+        if not os.path.exists(DEFAULT_PACK_PATH):
+            return None
+        try:
+            return cls(DEFAULT_PACK_PATH)
+        except Exception as e:
+            print(f"Eroare la deschiderea pachetului de asset-uri: {e}")
+            return None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.symbols
+
+    def metadata(self, name: str) -> Optional[Dict]:
+        return self.symbols.get(name)
+
+    def choose_level(self, name: str, width_px: float, height_px: float) -> int:
+        #cel mai mic nivel care inca acopera dimensiunea ceruta
+        mips = self.symbols[name]["mips"]
+        level = 0
+        for i, m in enumerate(mips):
+            if m["width"] >= width_px and m["height"] >= height_px:
+                level = i
+        return level
+
+    def view(self, name: str, level: int = 0) -> memoryview:
+        """Pixelii nivelului ca memoryview peste mmap (zero-copy)."""
+        m = self.symbols[name]["mips"][level]
+        return memoryview(self._mm)[m["offset"]:m["offset"] + m["size"]]
+
+    def qimage(self, name: str, level: int = 0):
+        """QImage care refera direct memoria mapata (fara copiere)."""
+        key = (name, level)
+        img = self._images.get(key)
+        if img is not None:
+            return img
+
+        import ctypes
+        from PyQt5 import sip
+        from PyQt5.QtGui import QImage
+
+        m = self.symbols[name]["mips"][level]
+        addr = ctypes.addressof(ctypes.c_char.from_buffer(self._mm, m["offset"]))
+        img = QImage(sip.voidptr(addr), m["width"], m["height"], m["stride"],
+                     QImage.Format_RGBA8888_Premultiplied)
+        self._images[key] = img
+        return img
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    src = args[0] if len(args) > 0 else SVG_DIR
+    dst = args[1] if len(args) > 1 else DEFAULT_PACK_PATH
+    n = build_pack(src, dst)
+    print(f"{n} simboluri scrise in {dst} ({os.path.getsize(dst) / 1024:.0f} KB)")
@@ -0,0 +1,128 @@
+import math
+import os
+from itertools import chain
+from typing import Dict, List
+
+from .ProjectManager import ProjectManager
+from .ChunkedProject import ChunkedFile, CHUNKED_EXT, TILE_SIZE
+from .DxfImport import import_dxf
+
+MAX_REPORTED_ISSUES = 100
+
+
+def load_manager(path: str) -> ProjectManager:
+    pm = ProjectManager()
+    if not pm.load_project(path):
+        raise ValueError("fisierul nu poate fi incarcat ca proiect")
+    if pm.tiles:
+        # un proiect fragmentat e incarcat complet si tratat ca unul obisnuit
+        pm.tiles.budget = math.inf
+        pm.ensure_view(pm.tiles.extent(), time_budget=math.inf)
+        pm.tiles = None
+        pm._sync_to_project()
+    return pm
+
+
+def output_path(path: str, out_dir: str, ext: str) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(out_dir, base + ext)
+
+
+def validate_file(path: str) -> Dict:
+    """Verifica un proiect cu regulile editorului.
+
+    Obiectele sunt trecute printr-un plan gol cu ProjectManager.check_objects, ca
+    la lipire: peretii fata de peretii dinaintea lor, deschiderile pe peretele
+    gazda (intervalele per perete), mobilierul fata de pereti si deschideri,
+    toate prin grila spatiala si cu regulile straturilor (COLLISION_LAYERS).
+    """
+    pm = load_manager(path)
+    walls, openings, furniture = pm._walls, pm._doors + pm._windows, pm._furniture
+    checker = ProjectManager()
+    checker.create_new_project()
+    accepted = {id(o) for o in checker.check_objects(chain(walls, openings, furniture))}
+
+    issues: List[Dict] = []
+    count = 0
+    for objs, problem in ((walls, "intersecteaza alt perete"),
+                          (openings, "nu are loc pe niciun perete (iese din perete "
+                                     "sau se suprapune cu alta deschidere)"),
+                          (furniture, "se suprapune cu un perete sau o deschidere")):
+        for o in objs:
+            if id(o) in accepted:
+                continue
+            count += 1
+            if len(issues) < MAX_REPORTED_ISSUES:
+                issues.append({"type": type(o).__name__, "id": o.id, "problem": problem})
+
+    return {
+        "objects": len(pm.get_all_objects()),
+        "valid": count == 0,
+        "issue_count": count,
+        "issues": issues,
+    }
+
+
+def convert_file(path: str, out_dir: str) -> Dict:
+    """Reincarca si rescrie proiectul in formatul JSON curent."""
+    pm = load_manager(path)
+    out = output_path(path, out_dir, ".json")
+    if not pm.save_project(out):
+        raise IOError(f"nu s-a putut scrie {out}")
+    return {"output": out, "objects": len(pm.get_all_objects())}
+
+
+def chunk_file(path: str, out_dir: str, tile_size: int = TILE_SIZE) -> Dict:
+    """Rescrie proiectul ca fisier fragmentat pe tile-uri, deschis pe bucati de aplicatie."""
+    pm = load_manager(path)
+    out = output_path(path, out_dir, CHUNKED_EXT)
+    chunked = ChunkedFile.create(out, pm.current_project, pm.display_list, tile_size)
+    return {"output": out, "objects": len(pm.display_list), "tiles": len(chunked.tiles)}
+
+
+def import_dxf_file(path: str, out_dir: str) -> Dict:
+    """Transforma un desen DXF intr-un proiect JSON; raporteaza entitatile respinse."""
+    pm = ProjectManager()
+    pm.create_new_project(os.path.splitext(os.path.basename(path))[0])
+    report = import_dxf(pm, path)
+    out = output_path(path, out_dir, ".json")
+    if not pm.save_project(out):
+        raise IOError(f"nu s-a putut scrie {out}")
+    return {
+        "output": out,
+        "objects": report.added,
+        "skipped": report.skipped,
+        "rejected_count": len(report.rejected),
+        "rejected": report.rejected[:MAX_REPORTED_ISSUES],
+    }
+
+
+def trace_scan_file(path: str, out_dir: str, scale: float = 1.0) -> Dict:
+    """Trasarea peretilor dintr-un plan scanat, salvata ca proiect JSON."""
+    from .RasterTrace import TraceSettings, import_raster
+
+    pm = ProjectManager()
+    pm.create_new_project(os.path.splitext(os.path.basename(path))[0])
+    # fisierele sunt deja impartite pe procese, deci fiecare e trasat intr-un singur proces
+    added, rejected = import_raster(pm, path, TraceSettings(scale=scale), jobs=1)
+    out = output_path(path, out_dir, ".json")
+    if not pm.save_project(out):
+        raise IOError(f"nu s-a putut scrie {out}")
+    return {"output": out, "objects": len(added), "rejected_count": len(rejected)}
+
+
+def takeoff_file(path: str, out_dir: str, fmt: str = "csv") -> Dict:
+    pm = load_manager(path)
+    out = output_path(path, out_dir, "." + fmt)
+    if not pm.export_takeoff(out):
+        raise IOError(f"nu s-a putut scrie {out}")
+    return {"output": out, "totals": pm.quantity_takeoff()["totals"]}
+
+
+def export_svg_file(path: str, out_dir: str) -> Dict:
+    pm = load_manager(path)
+    out = output_path(path, out_dir, ".svg")
+    if not pm.export_svg(out):
+        raise IOError(f"nu s-a putut scrie {out}")
+    return {"output": out, "objects": len(pm.get_all_objects())}
@@ -0,0 +1,328 @@
+"""Proiect fragmentat pe tile-uri spatiale, pentru planuri prea mari ca sa
+fie tinute integral in memorie.
+
+Fisierul incepe cu un antet fix (MAGIC, pozitia si lungimea indexului).
+Indexul (JSON) contine setarile proiectului si, pentru fiecare tile, pozitia
+blocului lui in fisier, numarul de obiecte si dreptunghiul ocupat de ele.
+Fiecare bloc e JSON comprimat cu zlib. Un tile modificat e scris la sfarsitul
+fisierului impreuna cu un index nou; abia apoi antetul e mutat pe indexul nou,
+asa ca o scriere intrerupta lasa fisierul vechi valid. `batch.py chunk`
+rescrie fisierul compact.
+"""
+import json
+import math
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall, Door, Window, Furniture
+from .Project import Project
+
+MAGIC = b"A2DCHNK1"
+HEADER = struct.Struct("<8sQQ")
+CHUNKED_EXT = ".a2dc"
+TILE_SIZE = 2048
+# cate obiecte pot fi incarcate simultan (ARCH_TILE_BUDGET suprascrie valoarea)
+DEFAULT_BUDGET = int(os.environ.get("ARCH_TILE_BUDGET", 250_000))
+
+TileKey = Tuple[int, int]
+KINDS = (("walls", Wall), ("doors", Door), ("windows", Window), ("furniture", Furniture))
+PROJECT_FIELDS = ("name", "width", "height", "created_date", "modified_date", "grid_size",
+                  "grid_visible", "snap_to_grid", "zoom_level", "pan_x", "pan_y", "layers",
+                  "underlay", "heights")
+
+
+def is_chunked(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def tile_key(x: float, y: float, tile_size: int = TILE_SIZE) -> TileKey:
+    return int(math.floor(x / tile_size)), int(math.floor(y / tile_size))
+
+
+def _key_str(key: TileKey) -> str:
+    return f"{key[0]},{key[1]}"
+
+
+def _key_parse(text: str) -> TileKey:
+    tx, ty = text.split(",")
+    return int(tx), int(ty)
+
+
+def _union(boxes: Iterable[Tuple[float, float, float, float]]):
+    x0 = y0 = math.inf
+    x1 = y1 = -math.inf
+    for x, y, w, h in boxes:
+        x0, y0 = min(x0, x), min(y0, y)
+        x1, y1 = max(x1, x + w), max(y1, y + h)
+    if x0 == math.inf:
+        return None
+    return [x0, y0, x1 - x0, y1 - y0]
+
+
+class ChunkedFile:
+    """Citirea si scrierea blocurilor unui fisier fragmentat."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index: Dict = {}
+        with open(path, "rb") as f:
+            magic, offset, length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("fisierul nu e un proiect fragmentat")
+            f.seek(offset)
+            self.index = json.loads(f.read(length).decode("utf-8"))
+
+    @property
+    def tile_size(self) -> int:
+        return self.index["tile_size"]
+
+    @property
+    def tiles(self) -> Dict[str, Dict]:
+        return self.index["tiles"]
+
+    def project(self) -> Project:
+        data = self.index["project"]
+        project = Project(data.get("name", "Proiect"), data.get("width", 1000), data.get("height", 800))
+        for field in PROJECT_FIELDS:
+            if field in data:
+                setattr(project, field, data[field])
+        project.filepath = self.path
+        return project
+
+    def read_tile(self, key: TileKey) -> Dict[str, List[Dict]]:
+        entry = self.tiles.get(_key_str(key))
+        if entry is None:
+            return {}
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            return json.loads(zlib.decompress(f.read(entry["length"])).decode("utf-8"))
+
+    def write_tiles(self, tiles: Dict[TileKey, Dict[str, List[Dict]]], project: Optional[Project] = None):
+        """Scrie tile-urile date (cele goale sunt sterse din index) si un index nou."""
+        with open(self.path, "r+b") as f:
+            # totul se adauga la sfarsit; blocurile vechi raman pana la o rescriere completa
+            f.seek(0, os.SEEK_END)
+            for key, data in tiles.items():
+                count = sum(len(data.get(kind, ())) for kind, _ in KINDS)
+                if not count:
+                    self.tiles.pop(_key_str(key), None)
+                    continue
+                blob = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+                self.tiles[_key_str(key)] = {
+                    "offset": f.tell(), "length": len(blob), "count": count, "bbox": data["bbox"]
+                }
+                f.write(blob)
+
+            if project is not None:
+                self.index["project"] = {field: getattr(project, field) for field in PROJECT_FIELDS}
+            self.index["overflow"] = _overflow(self.tiles, self.tile_size)
+            self._write_index(f)
+
+    def _write_index(self, f):
+        raw = json.dumps(self.index, ensure_ascii=False).encode("utf-8")
+        offset = f.tell()
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, offset, len(raw)))
+
+    @staticmethod
+    def create(path: str, project: Project, objects: Iterable[ArchitecturalObject],
+               tile_size: int = TILE_SIZE) -> "ChunkedFile":
+        """Scrie un fisier fragmentat nou cu obiectele date (usile raman in tile-ul peretelui)."""
+        objects = list(objects)
+        walls = {o.id: o for o in objects if isinstance(o, Wall)}
+        grouped: Dict[TileKey, List[ArchitecturalObject]] = {}
+        for o in objects:
+            host = walls.get(getattr(o, "host_wall_id", None))
+            grouped.setdefault(tile_key(*(host or o).get_center(), tile_size), []).append(o)
+
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, HEADER.size, 0))
+            index = {"version": 1, "tile_size": tile_size, "tiles": {},
+                     "project": {field: getattr(project, field) for field in PROJECT_FIELDS}}
+            for key, objs in grouped.items():
+                data = serialize_tile(objs)
+                blob = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+                index["tiles"][_key_str(key)] = {
+                    "offset": f.tell(), "length": len(blob), "count": len(objs), "bbox": data["bbox"]
+                }
+                f.write(blob)
+            index["overflow"] = _overflow(index["tiles"], tile_size)
+
+            chunked = ChunkedFile.__new__(ChunkedFile)
+            chunked.path = path
+            chunked.index = index
+            chunked._write_index(f)
+        return chunked
+
+
+def serialize_tile(objects: Iterable[ArchitecturalObject]) -> Dict:
+    from .SpatialIndex import obstacle_box
+
+    data = {kind: [] for kind, _ in KINDS}
+    objects = list(objects)
+    for o in objects:
+        for kind, cls in KINDS:
+            if isinstance(o, cls):
+                data[kind].append(o.to_dict())
+                break
+    data["bbox"] = _union(obstacle_box(o) for o in objects)
+    return data
+
+
+def _overflow(tiles: Dict[str, Dict], tile_size: int) -> float:
+    """Cat depasesc obiectele marginile tile-ului lor (cel mai rau caz)."""
+    worst = 0.0
+    for text, entry in tiles.items():
+        tx, ty = _key_parse(text)
+        x, y, w, h = entry["bbox"]
+        x0, y0 = tx * tile_size, ty * tile_size
+        worst = max(worst, x0 - x, y0 - y, x + w - x0 - tile_size, y + h - y0 - tile_size)
+    return worst
+
+
+class TileResidency:
+    """Ce tile-uri sunt in memorie, ce obiecte are fiecare si care sunt modificate.
+
+    Tile-urile rezidente sunt tinute in ordine LRU; cand bugetul de obiecte
+    e depasit, cele mai vechi tile-uri din afara vederii sunt scoase.
+    """
+
+    def __init__(self, chunked: ChunkedFile, budget: int = DEFAULT_BUDGET):
+        self.file = chunked
+        self.budget = budget
+        self.resident: "OrderedDict[TileKey, Dict[ArchitecturalObject, None]]" = OrderedDict()
+        self.dirty = set()
+        self.count = 0
+        self._tile_of: Dict[int, TileKey] = {}
+
+    @property
+    def path(self) -> str:
+        return self.file.path
+
+    def tiles_in(self, x: float, y: float, w: float, h: float) -> List[TileKey]:
+        """Tile-urile al caror continut atinge zona, cele din centru primele."""
+        size = self.file.tile_size
+        m = self.file.index.get("overflow", 0.0)
+        kx0, ky0 = tile_key(x - m, y - m, size)
+        kx1, ky1 = tile_key(x + w + m, y + h + m, size)
+        tiles = self.file.tiles
+
+        found = []
+        if (kx1 - kx0 + 1) * (ky1 - ky0 + 1) > len(tiles):
+            candidates = (_key_parse(t) for t in tiles)
+        else:
+            candidates = ((tx, ty) for tx in range(kx0, kx1 + 1) for ty in range(ky0, ky1 + 1))
+        for key in candidates:
+            if not (kx0 <= key[0] <= kx1 and ky0 <= key[1] <= ky1):
+                continue
+            entry = tiles.get(_key_str(key))
+            if entry is None:
+                continue
+            bx, by, bw, bh = entry["bbox"]
+            if bx < x + w and x < bx + bw and by < y + h and y < by + bh:
+                found.append(key)
+
+        cx, cy = x + w / 2, y + h / 2
+        found.sort(key=lambda k: ((k[0] + 0.5) * size - cx) ** 2 + ((k[1] + 0.5) * size - cy) ** 2)
+        return found
+
+    def extent(self):
+        """Dreptunghiul ocupat de tot proiectul (x, y, w, h)."""
+        return _union(e["bbox"] for e in self.file.tiles.values()) or [0, 0, 0, 0]
+
+    def count_of(self, key: TileKey) -> int:
+        entry = self.file.tiles.get(_key_str(key))
+        return entry["count"] if entry else 0
+
+    def bbox_of(self, key: TileKey):
+        entry = self.file.tiles.get(_key_str(key))
+        return entry["bbox"] if entry else None
+
+    # ----------------------------- REZIDENTA -----------------------------
+
+    def loaded(self, key: TileKey, objects: List[ArchitecturalObject]):
+        self.resident[key] = dict.fromkeys(objects)
+        for o in objects:
+            self._tile_of[id(o)] = key
+        self.count += len(objects)
+
+    def unloaded(self, key: TileKey) -> List[ArchitecturalObject]:
+        objects = list(self.resident.pop(key, ()))
+        for o in objects:
+            self._tile_of.pop(id(o), None)
+        self.count -= len(objects)
+        self.dirty.discard(key)
+        return objects
+
+    def touch(self, key: TileKey):
+        self.resident.move_to_end(key)
+
+    def total(self) -> int:
+        """Numarul de obiecte din proiect, incarcate sau nu."""
+        stored = sum(e["count"] for k, e in self.file.tiles.items() if _key_parse(k) not in self.resident)
+        return stored + self.count
+
+    def victims(self, keep: Iterable[TileKey], incoming: int = 0) -> List[TileKey]:
+        """Tile-urile de scos (LRU) ca sa mai incapa `incoming` obiecte in buget."""
+        keep = set(keep)
+        over = self.count + incoming - self.budget
+        out = []
+        for key, objs in self.resident.items():
+            if over <= 0:
+                break
+            if key in keep:
+                continue
+            out.append(key)
+            over -= len(objs)
+        return out
+
+    # ------------------------------ MODIFICARI ----------------------------
+
+    def tile_of(self, obj: ArchitecturalObject) -> Optional[TileKey]:
+        return self._tile_of.get(id(obj))
+
+    def target(self, obj: ArchitecturalObject, host: Optional[ArchitecturalObject] = None) -> TileKey:
+        """Tile-ul unui obiect nou: cel al gazdei (daca are) sau cel al centrului lui."""
+        key = self.tile_of(host) if host is not None else None
+        if key is None:
+            key = tile_key(*obj.get_center(), self.file.tile_size)
+        return key
+
+    def add(self, obj: ArchitecturalObject, key: TileKey):
+        # tile-ul trebuie sa fie incarcat (sau gol), altfel scrierea lui ar pierde obiecte
+        self.resident.setdefault(key, {})[obj] = None
+        self._tile_of[id(obj)] = key
+        self.count += 1
+        self.dirty.add(key)
+
+    def remove(self, obj: ArchitecturalObject):
+        key = self._tile_of.pop(id(obj), None)
+        if key is not None:
+            self.resident[key].pop(obj, None)
+            self.count -= 1
+            self.dirty.add(key)
+
+    def changed(self, obj: ArchitecturalObject):
+        # un obiect ramane in tile-ul lui si dupa mutare; bbox-ul tile-ului se recalculeaza
+        key = self._tile_of.get(id(obj))
+        if key is not None:
+            self.dirty.add(key)
+
+    def flush(self, keys: Optional[Iterable[TileKey]] = None, project: Optional[Project] = None) -> int:
+        """Scrie tile-urile modificate (toate sau doar `keys`); returneaza cate."""
+        keys = [k for k in (self.dirty if keys is None else keys) if k in self.dirty]
+        tiles = {k: serialize_tile(self.resident.get(k, ())) for k in keys}
+        if tiles or project is not None:
+            self.file.write_tiles(tiles, project)
+        self.dirty.difference_update(keys)
+        return len(keys)
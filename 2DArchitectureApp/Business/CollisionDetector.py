@@ -1,7 +1,18 @@
 #optional in aceasta etapa2
 
+import math
 from typing import List
 from .ArchitecturalObjects import Wall, Door, Window, Furniture, ArchitecturalObject
+from .Tracing import traced
+
+
+# straturile cu care se pot ciocni obiectele fiecarui strat; adnotarile nu ocupa spatiu
+COLLISION_LAYERS = {
+    "structure": ("structure", "doors_windows", "furniture"),
+    "doors_windows": ("structure", "doors_windows", "furniture"),
+    "furniture": ("structure", "doors_windows", "furniture"),
+    "annotations": (),
+}
 
 
 class CollisionDetector:
@@ -29,8 +40,23 @@ class CollisionDetector:
 
     @staticmethod
     def _bbox(obj):
-
-        return obj.x, obj.y, obj.width, obj.height
+        #bbox aliniat la axe al dreptunghiului rotit
+        if not obj.rotation:
+            return obj.x, obj.y, obj.width, obj.height
+        rot = obj.rotation % 180
+        if rot == 0:
+            return obj.x, obj.y, obj.width, obj.height
+
+        cx = obj.x + obj.width / 2
+        cy = obj.y + obj.height / 2
+        if rot == 90:
+            w, h = obj.height, obj.width
+        else:
+            a = math.radians(rot)
+            c, s = abs(math.cos(a)), abs(math.sin(a))
+            w = obj.width * c + obj.height * s
+            h = obj.width * s + obj.height * c
+        return cx - w / 2, cy - h / 2, w, h
 
     @staticmethod
     def _rects_overlap(a, b) -> bool:
@@ -55,6 +81,11 @@ class CollisionDetector:
         C = (w2.x1, w2.y1)
         D = (w2.x2, w2.y2)
 
+        # doi pereti care doar se ating intr-un capat comun (colt) nu se intersecteaza;
+        # testul ccw de mai jos da altfel un rezultat care depinde de sensul peretilor
+        if A in (C, D) or B in (C, D):
+            return False
+
         return ccw(A, C, D) != ccw(B, C, D) and ccw(A, B, C) != ccw(A, B, D)
 
     @staticmethod
@@ -67,6 +98,7 @@ class CollisionDetector:
 
 
     @classmethod
+    @traced("CollisionDetector.can_add_wall", "collision")
     def can_add_wall(cls, new_wall: Wall, walls: List[Wall]) -> bool:
         for w in walls:
 
@@ -92,6 +124,7 @@ class CollisionDetector:
 
 
     @classmethod
+    @traced("CollisionDetector.can_add_opening", "collision")
     def can_add_opening(cls, obj, walls: List[Wall], others: List[ArchitecturalObject]) -> bool:
         """Ușă sau fereastră trebuie să fie pe un perete."""
 
@@ -112,6 +145,17 @@ class CollisionDetector:
 
 
     @classmethod
+    @traced("CollisionDetector.can_add_hosted_opening", "collision")
+    def can_add_hosted_opening(cls, index, start: float, end: float,
+                               wall_length: float, ignore=None) -> bool:
+        """Deschidere pe un perete gazda: in limitele peretelui si fara suprapuneri, O(log k)."""
+        if start < -1e-6 or end > wall_length + 1e-6:
+            return False
+        return not index.overlaps(start, end, ignore)
+
+
+    @classmethod
+    @traced("CollisionDetector.can_add_furniture", "collision")
     def can_add_furniture(cls, furn: Furniture,
                           walls: List[Wall],
                           openings: List[ArchitecturalObject]) -> bool:
@@ -129,14 +173,18 @@ class CollisionDetector:
 
 
     @classmethod
+    @traced("CollisionDetector.can_move_object", "collision")
     def can_move_object(cls, obj: ArchitecturalObject,
-                        others: List[ArchitecturalObject]) -> bool:
+                        others: List[ArchitecturalObject], ignore=()) -> bool:
 
+        box = cls._bbox(obj)
+        bbox = cls._bbox
+        overlap = cls._rects_overlap
         for o in others:
-            if o is obj:
+            if o is obj or o in ignore:
                 continue
 
-            if cls._rects_overlap(cls._bbox(obj), cls._bbox(o)):
+            if overlap(box, bbox(o)):
                 return False
 
         return True
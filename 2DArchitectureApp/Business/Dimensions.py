@@ -0,0 +1,123 @@
+"""Cote automate: lungimea peretilor, latimea deschiderilor cu distantele
+pana la capetele peretelui si gabaritul cladirii.
+
+Geometria si textul sunt calculate o data per perete si pastrate pana cand
+peretele sau o deschidere de pe el se schimba."""
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall, plan_bounds
+from .HostedOpenings import wall_frame
+
+EPS = 1e-6
+# distanta dintre fata peretelui si linia de cota
+DIM_GAP = 25
+# distanta dintre gabaritul cladirii si cotele de gabarit
+EXTENT_GAP = 60
+
+
+class Dimension(NamedTuple):
+    # punctele masurate
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    # deplasarea liniei de cota fata de punctele masurate
+    nx: float
+    ny: float
+    length: float
+    text: str
+    kind: str
+
+
+def wall_dimensions(wall: Wall, openings: List[ArchitecturalObject],
+                    fmt: Callable[[float], str]) -> List[Dimension]:
+    """Cota peretelui pe o parte; pe cealalta, lantul capat - deschideri - capat.
+
+    `openings` sunt deschiderile gazduite, sortate dupa pozitia pe perete.
+    Prima cota din lista e mereu lungimea peretelui.
+    """
+    ux, uy, length, _ = wall_frame(wall)
+    if length < EPS:
+        return []
+
+    off = wall.thickness / 2 + DIM_GAP
+    nx, ny = -uy * off, ux * off
+    dims = [Dimension(wall.x1, wall.y1, wall.x2, wall.y2, nx, ny, length, fmt(length), "wall")]
+    if not openings:
+        return dims
+
+    stops = [(0.0, "offset")]
+    for o in openings:
+        half = o.width / 2
+        stops.append((o.offset - half, "opening"))
+        stops.append((o.offset + half, "offset"))
+    stops.append((length, None))
+
+    for (a, kind), (b, _) in zip(stops, stops[1:]):
+        if b - a < EPS:
+            continue
+        dims.append(Dimension(
+            wall.x1 + ux * a, wall.y1 + uy * a, wall.x1 + ux * b, wall.y1 + uy * b,
+            -nx, -ny, b - a, fmt(b - a), kind
+        ))
+    return dims
+
+
+def extent_dimensions(walls: Iterable[Wall], fmt: Callable[[float], str]) -> List[Dimension]:
+    """Latimea (deasupra) si inaltimea (in stanga) gabaritului peretilor."""
+    walls = list(walls)
+    if not walls:
+        return []
+    x, y, w, h = plan_bounds(walls, ())
+    return [
+        Dimension(x, y, x + w, y, 0.0, -EXTENT_GAP, w, fmt(w), "extent"),
+        Dimension(x, y, x, y + h, -EXTENT_GAP, 0.0, h, fmt(h), "extent"),
+    ]
+
+
+class DimensionCache:
+    """Cotele calculate, per perete; invalidarea atinge doar peretele schimbat."""
+
+    def __init__(self):
+        self._walls: Dict[str, List[Dimension]] = {}
+        self._extents: Optional[List[Dimension]] = None
+        self._longest: Optional[float] = None
+        self._units = None
+
+    def set_units(self, units: Tuple):
+        # textul depinde de conversia px -> cm; la schimbarea ei se refac toate
+        if units != self._units:
+            self._units = units
+            self.invalidate_all()
+
+    def invalidate(self, wall: Optional[Wall]):
+        if wall is not None:
+            self._walls.pop(wall.id, None)
+        self._extents = None
+        self._longest = None
+
+    def invalidate_all(self):
+        self._walls = {}
+        self._extents = None
+        self._longest = None
+
+    def for_wall(self, wall: Wall, hosted: Callable[[Wall], List[ArchitecturalObject]],
+                 fmt: Callable[[float], str]) -> List[Dimension]:
+        dims = self._walls.get(wall.id)
+        if dims is None:
+            dims = self._walls[wall.id] = wall_dimensions(wall, hosted(wall), fmt)
+        return dims
+
+    def extents(self, walls: Iterable[Wall], fmt: Callable[[float], str]) -> List[Dimension]:
+        if self._extents is None:
+            self._extents = extent_dimensions(walls, fmt)
+        return self._extents
+
+    def longest(self, walls: Iterable[Wall]) -> float:
+        """Lungimea celui mai lung perete: sub ea nicio cota nu e vizibila."""
+        if self._longest is None:
+            self._longest = max((w.get_length() for w in walls), default=0.0)
+        return self._longest
+
+    def __len__(self):
+        return len(self._walls)
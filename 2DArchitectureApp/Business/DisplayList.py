@@ -0,0 +1,159 @@
+from bisect import bisect_left, bisect_right
+from itertools import chain, count
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall, Door, Window, Furniture
+
+# in cadrul aceluiasi strat: peretii dedesubt, mobilierul deasupra
+TYPE_RANK = {Wall: 0, Door: 1, Window: 2, Furniture: 3}
+
+
+class ObjectsView:
+    """Vedere fara copiere peste mai multe liste (iterare, len, reversed)."""
+
+    __slots__ = ("_lists",)
+
+    def __init__(self, *lists: List[ArchitecturalObject]):
+        self._lists = lists
+
+    def __iter__(self) -> Iterator[ArchitecturalObject]:
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[ArchitecturalObject]:
+        return chain.from_iterable(reversed(l) for l in reversed(self._lists))
+
+    def __len__(self) -> int:
+        return sum(len(l) for l in self._lists)
+
+    def __bool__(self) -> bool:
+        return any(self._lists)
+
+
+class DisplayList:
+    """Lista obiectelor in ordinea de desenare, intretinuta incremental.
+
+    Ordinea e data de (rangul stratului, tipul obiectului, ordinea adaugarii).
+    Randarea parcurge lista de la inceput, iar selectia cu mouse-ul de la
+    sfarsit, asa ca obiectul vazut deasupra e mereu cel ales la click.
+    """
+
+    def __init__(self, layer_order: Iterable[str] = ()):
+        self._items: List[ArchitecturalObject] = []
+        self._keys: List[Tuple[int, int, int]] = []
+        self._key_of: Dict[int, Tuple[int, int, int]] = {}
+        self._seq = count()
+        self._layer_rank: Dict[str, int] = {}
+        self.revision = 0
+        self.set_layer_order(layer_order)
+
+    def _key(self, obj: ArchitecturalObject) -> Tuple[int, int, int]:
+        layer = self._layer_rank.get(obj.layer, len(self._layer_rank))
+        return layer, TYPE_RANK.get(type(obj), len(TYPE_RANK)), next(self._seq)
+
+    # ----------------------------- MODIFICARI ----------------------------
+
+    def add(self, obj: ArchitecturalObject):
+        key = self._key(obj)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._items.insert(i, obj)
+        self._key_of[id(obj)] = key
+        self.revision += 1
+
+    def remove(self, obj: ArchitecturalObject) -> bool:
+        key = self._key_of.pop(id(obj), None)
+        if key is None:
+            return False
+        i = bisect_left(self._keys, key)
+        del self._keys[i]
+        del self._items[i]
+        self.revision += 1
+        return True
+
+    def extend(self, objects: Iterable[ArchitecturalObject]):
+        """Adauga un grup de obiecte; fiecare grup (strat, tip) e inserat dintr-o bucata."""
+        groups: Dict[Tuple[int, int], List[Tuple[Tuple[int, int, int], ArchitecturalObject]]] = {}
+        for o in objects:
+            key = self._key(o)
+            groups.setdefault(key[:2], []).append((key, o))
+            self._key_of[id(o)] = key
+
+        # cheile noi sunt cele mai mari din grupul lor, deci ajung la sfarsitul lui;
+        # inseram de la coada ca indicii grupurilor anterioare sa ramana valabili
+        for prefix in sorted(groups, reverse=True):
+            keyed = groups[prefix]
+            i = bisect_left(self._keys, (prefix[0], prefix[1] + 1))
+            self._keys[i:i] = [k for k, _ in keyed]
+            self._items[i:i] = [o for _, o in keyed]
+        if groups:
+            self.revision += 1
+
+    def discard(self, objects: Iterable[ArchitecturalObject]):
+        """Scoate un grup de obiecte dintr-o singura trecere prin lista."""
+        gone = {id(o) for o in objects if self._key_of.pop(id(o), None) is not None}
+        if not gone:
+            return
+        kept = [(k, o) for k, o in zip(self._keys, self._items) if id(o) not in gone]
+        self._keys = [k for k, _ in kept]
+        self._items = [o for _, o in kept]
+        self.revision += 1
+
+    def restack(self, obj: ArchitecturalObject):
+        """Repozitioneaza un obiect dupa ce i s-a schimbat stratul."""
+        if self.remove(obj):
+            self.add(obj)
+
+    def rebuild(self, objects: Iterable[ArchitecturalObject]):
+        keyed = sorted(((self._key(o), o) for o in objects), key=lambda ko: ko[0])
+        self._keys = [k for k, _ in keyed]
+        self._items = [o for _, o in keyed]
+        self._key_of = {id(o): k for k, o in keyed}
+        self.revision += 1
+
+    def clear(self):
+        self._items = []
+        self._keys = []
+        self._key_of = {}
+        self.revision += 1
+
+    def set_layer_order(self, layer_order: Iterable[str]):
+        self._layer_rank = {name: i for i, name in enumerate(layer_order)}
+        if self._items:
+            self.rebuild(list(self._items))
+
+    # ------------------------------- ACCES -------------------------------
+
+    def __iter__(self) -> Iterator[ArchitecturalObject]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[ArchitecturalObject]:
+        return reversed(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, obj) -> bool:
+        return id(obj) in self._key_of
+
+    def order(self, obj: ArchitecturalObject) -> Tuple[int, int, int]:
+        """Cheia de desenare a obiectului: cea mai mare e desenata deasupra."""
+        return self._key_of[id(obj)]
+
+    def layer(self, name: Optional[str]) -> List[ArchitecturalObject]:
+        """Obiectele unui strat, in ordinea de desenare (None = straturi necunoscute).
+
+        Straturile sunt contigue in lista, deci capetele se gasesc prin bisectie.
+        """
+        rank = self._layer_rank.get(name, len(self._layer_rank))
+        i = bisect_left(self._keys, (rank,))
+        j = bisect_left(self._keys, (rank + 1,))
+        return self._items[i:j]
+
+    def sorted_in_layer(self, name: Optional[str],
+                        objects: Iterable[ArchitecturalObject]) -> List[ArchitecturalObject]:
+        """Obiectele date care apartin stratului, in ordinea de desenare."""
+        rank = self._layer_rank.get(name, len(self._layer_rank))
+        key_of = self._key_of
+        keyed = [(key_of[id(o)], o) for o in objects if id(o) in key_of]
+        keyed.sort(key=lambda ko: ko[0])
+        return [o for k, o in keyed if k[0] == rank]
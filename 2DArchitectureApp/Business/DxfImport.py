@@ -0,0 +1,336 @@
+"""Import DXF: pereti din linii si polilinii, usi/ferestre/mobilier din blocuri.
+
+Fisierul e citit pereche cu pereche (cod de grup, valoare), fara sa fie tinut
+in memorie: din sectiunea BLOCKS se retine doar dreptunghiul fiecarui bloc,
+iar entitatile sunt transformate pe masura ce sunt citite. Peretii intra in
+plan pe loturi prin ProjectManager.add_objects; deschiderile si mobilierul
+sunt adaugate la sfarsit, cand toti peretii (gazdele lor) sunt deja in plan.
+Tot importul e un singur pas de undo.
+"""
+import math
+import os
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .ArchitecturalObjects import Wall, Door, Window, Furniture
+from .SymbolLibrary import SYMBOLS
+
+# peretii sunt validati si inserati in loturi de aceasta marime
+BATCH_SIZE = 5000
+# progresul e raportat cam o data la atatia octeti cititi
+PROGRESS_STEP = 1 << 20
+
+# $INSUNITS -> centimetri per unitate de desen
+UNITS_CM = {1: 2.54, 2: 30.48, 4: 0.1, 5: 1.0, 6: 100.0, 14: 10.0}
+DEFAULT_UNIT_CM = 0.1  # fara $INSUNITS desenul e considerat in milimetri
+
+
+class DxfMapping:
+    """Ce devine fiecare entitate; tiparele sunt de tip fnmatch si nu tin cont de litere mari/mici."""
+
+    def __init__(self, wall_layers=("*WALL*", "*ZID*", "*PERETE*"),
+                 door_blocks=("*DOOR*", "*USA*", "*USI*"),
+                 window_blocks=("*WIN*", "*FEREASTR*"),
+                 furniture_blocks=("*",),
+                 wall_thickness: float = 20.0,
+                 unit_cm: Optional[float] = None):
+        self.wall_layers = wall_layers
+        self.door_blocks = door_blocks
+        self.window_blocks = window_blocks
+        self.furniture_blocks = furniture_blocks
+        self.wall_thickness = wall_thickness
+        # None = unitatea din antetul fisierului ($INSUNITS)
+        self.unit_cm = unit_cm
+
+    @staticmethod
+    def _matches(name: str, patterns) -> bool:
+        name = name.upper()
+        return any(fnmatchcase(name, p.upper()) for p in patterns)
+
+    def is_wall_layer(self, layer: str) -> bool:
+        return self._matches(layer, self.wall_layers)
+
+    def block_kind(self, name: str):
+        # ordinea conteaza: un bloc "USA_FEREASTRA" e usa
+        if self._matches(name, self.door_blocks):
+            return Door
+        if self._matches(name, self.window_blocks):
+            return Window
+        if self._matches(name, self.furniture_blocks):
+            return Furniture
+        return None
+
+
+class ImportReport:
+    def __init__(self):
+        self.added = 0
+        self.skipped = 0  # entitati fara corespondent in plan
+        self.rejected: List[Dict] = []  # entitati respinse de verificarile de coliziune
+
+    def to_dict(self) -> Dict:
+        return {"added": self.added, "skipped": self.skipped,
+                "rejected_count": len(self.rejected), "rejected": self.rejected}
+
+
+# ------------------------------- CITIRE --------------------------------
+
+def read_pairs(stream, total: int = 0,
+               progress: Optional[Callable[[float], None]] = None) -> Iterator[Tuple[int, str]]:
+    """Perechile (cod, valoare) dintr-un fisier DXF ASCII deschis binar."""
+    mark = PROGRESS_STEP
+    for n, code in enumerate(stream):
+        value = next(stream, b"")
+        try:
+            code = int(code)
+        except ValueError:
+            raise ValueError(f"cod de grup invalid: {code.strip()[:20]!r}")
+        yield code, value.strip().decode("utf-8", "replace")
+        if progress and total and not n & 0x3FF and stream.tell() >= mark:
+            mark = stream.tell() + PROGRESS_STEP
+            progress(min(stream.tell() / total, 1.0))
+
+
+def read_entities(pairs: Iterator[Tuple[int, str]],
+                  keep: Callable[[str, str], bool] = lambda section, kind: True
+                  ) -> Iterator[Tuple[str, str, Dict]]:
+    """(sectiune, tip, coduri) pentru fiecare entitate; punctele repetate (10/20) sunt in 'points'.
+
+    Codurile entitatilor pentru care keep(sectiune, tip) e fals nu sunt citite (data ramane goala).
+    """
+    section = None
+    kind = None
+    data: Dict = {}
+    wanted = False
+    for code, value in pairs:
+        if code == 0:
+            if kind is not None:
+                yield section, kind, data
+            kind, data = value, {"points": []}
+            if value == "ENDSEC":
+                section, kind = None, None
+            elif value == "EOF":
+                return
+            wanted = kind == "SECTION" or keep(section, kind)
+            continue
+        if not wanted:
+            continue
+        if kind == "SECTION" and code == 2:
+            section, kind = value, None
+            continue
+        if code == 9:
+            # variabila din HEADER: valorile ei urmeaza pana la urmatorul cod 9
+            if kind is not None:
+                yield section, kind, data
+            kind, data = "$", {"points": [], 9: value}
+            continue
+        if kind is None:
+            continue
+        if code == 10:
+            data["points"].append([float(value), 0.0])
+        elif code == 20 and data["points"]:
+            data["points"][-1][1] = float(value)
+        else:
+            data[code] = value
+    if kind is not None:
+        yield section, kind, data
+
+
+def _float(data: Dict, code: int, default: float = 0.0) -> float:
+    try:
+        return float(data.get(code, default))
+    except ValueError:
+        return default
+
+
+def _valid(data: Dict) -> bool:
+    # un desen gol are extinderea +/-1e20
+    return bool(data["points"]) and all(abs(v) < 1e19 for v in data["points"][0])
+
+
+# ------------------------------- IMPORT --------------------------------
+
+class DxfImporter:
+    def __init__(self, pm, mapping: Optional[DxfMapping] = None):
+        self.pm = pm
+        self.mapping = mapping or DxfMapping()
+        self.report = ImportReport()
+        # dreptunghiul fiecarui bloc, relativ la punctul lui de baza
+        self.blocks: Dict[str, Tuple[float, float, float, float]] = {}
+        self.unit_cm = self.mapping.unit_cm
+        self.origin = (0.0, 0.0)
+        self.scale = 1.0
+        self._walls: List = []
+        self._deferred: List = []
+        self._source: Dict[int, Dict] = {}
+
+    def run(self, path: str, progress: Optional[Callable[[float], None]] = None) -> ImportReport:
+        total = os.path.getsize(path)
+        with open(path, "rb") as f, self.pm.transaction():
+            header = True
+            block = None
+            pairs = read_pairs(f, total, progress)
+            for section, kind, data in read_entities(pairs, self._keep):
+                if section == "HEADER":
+                    self._header(data)
+                    continue
+                if header:
+                    header = False
+                    self._setup()
+                if section == "BLOCKS":
+                    block = self._block(kind, data, block)
+                elif section == "ENTITIES":
+                    self._entity(kind, data)
+            self._flush_walls()
+            self._flush(self._deferred)
+        if progress:
+            progress(1.0)
+        return self.report
+
+    @staticmethod
+    def _keep(section: str, kind: str) -> bool:
+        return section != "ENTITIES" or kind in ("LINE", "LWPOLYLINE", "INSERT")
+
+    # ------------------------------ ANTET ------------------------------
+
+    def _header(self, data: Dict):
+        name = data.get(9)
+        if name == "$INSUNITS" and self.unit_cm is None:
+            self.unit_cm = UNITS_CM.get(int(_float(data, 70)), DEFAULT_UNIT_CM)
+        elif name == "$EXTMIN" and _valid(data):
+            self.origin = (data["points"][0][0], self.origin[1])
+        elif name == "$EXTMAX" and _valid(data):
+            self.origin = (self.origin[0], data["points"][0][1])
+
+    def _setup(self):
+        unit = self.unit_cm if self.unit_cm is not None else DEFAULT_UNIT_CM
+        self.scale = self.pm.coordinate_system.real_units_to_pixels(unit)
+
+    def _point(self, x: float, y: float) -> Tuple[float, float]:
+        # DXF are axa Y in sus; coltul stanga-sus al desenului ajunge in origine
+        return (x - self.origin[0]) * self.scale, (self.origin[1] - y) * self.scale
+
+    # ------------------------------ BLOCURI ----------------------------
+
+    def _block(self, kind: str, data: Dict, block):
+        if kind == "BLOCK":
+            base = data["points"][0] if data["points"] else (0.0, 0.0)
+            return [data.get(2, ""), base[0], base[1], math.inf, math.inf, -math.inf, -math.inf]
+        if kind == "ENDBLK":
+            if block is not None and block[3] < math.inf:
+                name, bx, by, x0, y0, x1, y1 = block
+                self.blocks[name] = (x0 - bx, y0 - by, x1 - bx, y1 - by)
+            return None
+        if block is None:
+            return None
+        r = _float(data, 40) if kind in ("CIRCLE", "ARC") else 0.0
+        for x, y in data["points"]:
+            block[3] = min(block[3], x - r)
+            block[4] = min(block[4], y - r)
+            block[5] = max(block[5], x + r)
+            block[6] = max(block[6], y + r)
+        if 11 in data and 21 in data:
+            x, y = _float(data, 11), _float(data, 21)
+            block[3], block[4] = min(block[3], x), min(block[4], y)
+            block[5], block[6] = max(block[5], x), max(block[6], y)
+        return block
+
+    # ----------------------------- ENTITATI ----------------------------
+
+    def _entity(self, kind: str, data: Dict):
+        if kind == "LINE" and self.mapping.is_wall_layer(data.get(8, "")):
+            if data["points"] and 11 in data:
+                x, y = data["points"][0]
+                self._add_wall(kind, data, (x, y), (_float(data, 11), _float(data, 21)), 0.0)
+                return
+        elif kind == "LWPOLYLINE" and self.mapping.is_wall_layer(data.get(8, "")):
+            pts = data["points"]
+            if len(pts) >= 2:
+                width = _float(data, 43)
+                segments = list(zip(pts, pts[1:]))
+                if int(_float(data, 70)) & 1:
+                    segments.append((pts[-1], pts[0]))
+                for a, b in segments:
+                    self._add_wall(kind, data, a, b, width)
+                return
+        elif kind == "INSERT":
+            if self._add_insert(data):
+                return
+        self.report.skipped += 1
+
+    def _add_wall(self, kind: str, data: Dict, a, b, width: float):
+        x1, y1 = self._point(*a)
+        x2, y2 = self._point(*b)
+        if x1 == x2 and y1 == y2:
+            self.report.skipped += 1
+            return
+        thickness = width * self.scale if width > 0 else self.mapping.wall_thickness
+        wall = Wall(x1, y1, x2, y2, thickness)
+        self._remember(wall, data, kind)
+        self._walls.append(wall)
+        if len(self._walls) >= BATCH_SIZE:
+            self._flush_walls()
+
+    def _add_insert(self, data: Dict) -> bool:
+        name = data.get(2, "")
+        box = self.blocks.get(name)
+        cls = self.mapping.block_kind(name)
+        if box is None or cls is None or not data["points"]:
+            return False
+
+        sx, sy = _float(data, 41, 1.0), _float(data, 42, 1.0)
+        angle = _float(data, 50)
+        x0, y0, x1, y1 = box
+        # centrul blocului, scalat si rotit in jurul punctului de insertie
+        cx, cy = (x0 + x1) / 2 * sx, (y0 + y1) / 2 * sy
+        a = math.radians(angle)
+        ix, iy = data["points"][0]
+        px, py = self._point(ix + cx * math.cos(a) - cy * math.sin(a),
+                             iy + cx * math.sin(a) + cy * math.cos(a))
+        w = abs(x1 - x0) * abs(sx) * self.scale
+        h = abs(y1 - y0) * abs(sy) * self.scale
+        if w <= 0 or h <= 0:
+            return False
+
+        if cls is Furniture:
+            obj = Furniture(px - w / 2, py - h / 2, w, h, self._furniture_type(name))
+        else:
+            obj = cls(px - w / 2, py - h / 2, w, h)
+        # cu axa Y inversata, sensul unghiurilor se inverseaza si el
+        obj.set_rotation(-angle % 360)
+        self._remember(obj, data, "INSERT")
+        self._deferred.append(obj)
+        return True
+
+    @staticmethod
+    def _furniture_type(block: str) -> str:
+        name = block.lower()
+        for symbol in SYMBOLS:
+            if symbol in name:
+                return symbol
+        return "mobilier"
+
+    # ------------------------------ INSERARE ---------------------------
+
+    def _remember(self, obj, data: Dict, entity: str):
+        self._source[id(obj)] = {"entity": entity, "handle": data.get(5), "layer": data.get(8)}
+
+    def _flush_walls(self):
+        self._flush(self._walls)
+        self._walls = []
+
+    def _flush(self, objects: List):
+        if not objects:
+            return
+        accepted = {id(o) for o in self.pm.add_objects(objects)}
+        self.report.added += len(accepted)
+        for o in objects:
+            source = self._source.pop(id(o))
+            if id(o) not in accepted:
+                source["type"] = type(o).__name__
+                self.report.rejected.append(source)
+
+
+def import_dxf(pm, path: str, mapping: Optional[DxfMapping] = None,
+               progress: Optional[Callable[[float], None]] = None) -> ImportReport:
+    """Adauga in documentul pm obiectele din fisierul DXF de la path."""
+    return DxfImporter(pm, mapping).run(path, progress)
@@ -0,0 +1,158 @@
+"""Cereri de spatiu liber peste SpatialHash: regiuni libere, dreptunghiuri
+goale maximale si cea mai apropiata pozitie valida pentru o amprenta data."""
+import math
+from typing import List, Optional, Tuple
+
+from .SpatialIndex import SpatialHash, Rect
+
+EPS = 1e-6
+# distanta minima lasata fata de obstacole, ca rotunjirile sa nu produca atingeri
+GAP = 1e-3
+
+
+def footprint(width: float, height: float, rotation: float = 0.0) -> Tuple[float, float]:
+    """Dimensiunile bbox-ului aliniat la axe al unui dreptunghi rotit."""
+    rot = rotation % 180
+    if rot == 0:
+        return width, height
+    if rot == 90:
+        return height, width
+    a = math.radians(rot)
+    c, s = abs(math.cos(a)), abs(math.sin(a))
+    return width * c + height * s, width * s + height * c
+
+
+def _obstacles(index: SpatialHash, area: Rect, ignore) -> List[Rect]:
+    return [(x - GAP, y - GAP, w + 2 * GAP, h + 2 * GAP)
+            for obj, (x, y, w, h) in index.query(*area) if obj not in ignore]
+
+
+def _contains(a: Rect, b: Rect) -> bool:
+    return (a[0] <= b[0] + EPS and a[1] <= b[1] + EPS
+            and a[0] + a[2] + EPS >= b[0] + b[2] and a[1] + a[3] + EPS >= b[1] + b[3])
+
+
+def maximal_empty_rectangles(index: SpatialHash, area: Rect, ignore=()) -> List[Rect]:
+    """Toate dreptunghiurile goale maximale din zona (algoritmul MaxRects).
+
+    Fiecare obstacol taie dreptunghiurile libere pe care le atinge in cel mult
+    patru bucati maximale; bucatile continute in altele sunt eliminate.
+    """
+    free = [area]
+    for ox, oy, ow, oh in _obstacles(index, area, ignore):
+        ox1, oy1 = ox + ow, oy + oh
+        result = []
+        for fx, fy, fw, fh in free:
+            fx1, fy1 = fx + fw, fy + fh
+            if ox >= fx1 or ox1 <= fx or oy >= fy1 or oy1 <= fy:
+                result.append((fx, fy, fw, fh))
+                continue
+            if ox > fx:
+                result.append((fx, fy, ox - fx, fh))
+            if ox1 < fx1:
+                result.append((ox1, fy, fx1 - ox1, fh))
+            if oy > fy:
+                result.append((fx, fy, fw, oy - fy))
+            if oy1 < fy1:
+                result.append((fx, oy1, fw, fy1 - oy1))
+
+        # eliminam dreptunghiurile incluse in altele (si dublurile)
+        result.sort(key=lambda r: r[2] * r[3], reverse=True)
+        free = []
+        for r in result:
+            if r[2] > EPS and r[3] > EPS and not any(_contains(k, r) for k in free):
+                free.append(r)
+    return free
+
+
+def free_regions(index: SpatialHash, area: Rect, ignore=()) -> List[Rect]:
+    """Zona libera ca dreptunghiuri disjuncte (taiere ghilotina)."""
+    free = [area]
+    for ox, oy, ow, oh in _obstacles(index, area, ignore):
+        ox1, oy1 = ox + ow, oy + oh
+        result = []
+        for fx, fy, fw, fh in free:
+            fx1, fy1 = fx + fw, fy + fh
+            if ox >= fx1 or ox1 <= fx or oy >= fy1 or oy1 <= fy:
+                result.append((fx, fy, fw, fh))
+                continue
+            # stanga si dreapta pe toata inaltimea, sus si jos doar intre ele
+            mx0, mx1 = max(fx, ox), min(fx1, ox1)
+            if ox > fx:
+                result.append((fx, fy, ox - fx, fh))
+            if ox1 < fx1:
+                result.append((ox1, fy, fx1 - ox1, fh))
+            if oy > fy:
+                result.append((mx0, fy, mx1 - mx0, oy - fy))
+            if oy1 < fy1:
+                result.append((mx0, oy1, mx1 - mx0, fy1 - oy1))
+        free = [r for r in result if r[2] > EPS and r[3] > EPS]
+    return free
+
+
+def _is_free(index: SpatialHash, cx: float, cy: float, fw: float, fh: float, ignore) -> bool:
+    x0, y0 = cx - fw / 2, cy - fh / 2
+    for obj, (bx, by, bw, bh) in index.query(x0, y0, fw, fh):
+        if obj not in ignore:
+            return False
+    return True
+
+
+def _nearest_on_line(x: float, py: float, rects) -> float:
+    """Cel mai apropiat y liber de py pe verticala x (intervalele blocate sunt deschise)."""
+    blocked = sorted((y0, y1) for x0, x1, y0, y1 in rects if x0 < x < x1)
+    # intervalele blocate, unite; un capat comun ramane liber
+    merged = []
+    for y0, y1 in blocked:
+        if merged and y0 < merged[-1][1]:
+            if y1 > merged[-1][1]:
+                merged[-1][1] = y1
+        else:
+            merged.append([y0, y1])
+
+    for y0, y1 in merged:
+        if y0 < py < y1:
+            return y0 if py - y0 <= y1 - py else y1
+    return py
+
+
+def nearest_free_position(index: SpatialHash, width: float, height: float,
+                          px: float, py: float, rotation: float = 0.0, ignore=(),
+                          max_radius: float = 4000) -> Optional[Tuple[float, float]]:
+    """Centrul valid cel mai apropiat de (px, py) pentru amprenta data, sau None.
+
+    In spatiul centrelor fiecare obstacol devine dreptunghiul lui marit cu
+    jumatate din amprenta. Cel mai apropiat punct liber are x-ul egal cu px
+    sau cu o latura verticala a unui astfel de dreptunghi; pe fiecare verticala
+    candidata cel mai apropiat y liber se afla din intervalele blocate.
+    Fereastra de obstacole porneste mica si se dubleaza pana se gaseste ceva.
+    """
+    fw, fh = footprint(width, height, rotation)
+    hw, hh = fw / 2, fh / 2
+    radius = max(fw, fh)
+
+    while radius <= max_radius:
+        area = (px - radius - fw, py - radius - fh, 2 * (radius + fw), 2 * (radius + fh))
+        rects = [(ox - hw, ox + ow + hw, oy - hh, oy + oh + hh)
+                 for ox, oy, ow, oh in _obstacles(index, area, ignore)]
+
+        xs = {px}
+        for x0, x1, _, _ in rects:
+            xs.add(x0)
+            xs.add(x1)
+
+        best = None
+        for x in sorted(xs, key=lambda v: abs(v - px)):
+            dx = abs(x - px)
+            if best is not None and dx >= best[0]:
+                break
+            y = _nearest_on_line(x, py, rects)
+            d = math.hypot(dx, y - py)
+            if best is None or d < best[0]:
+                best = (d, x, y)
+
+        if best is not None and best[0] <= radius and _is_free(index, best[1], best[2], fw, fh, ignore):
+            return best[1], best[2]
+        radius *= 2
+    return None
+
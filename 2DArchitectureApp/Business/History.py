@@ -0,0 +1,67 @@
+"""Istoric pe tranzactii: fiecare pas de undo retine doar ce s-a schimbat.
+
+O tranzactie strange toate modificarile unui gest (o tragere cu mouse-ul, o
+rotire) sau ale unei comenzi compuse: obiectele adaugate, cele sterse si,
+pentru cele modificate, starea de dinainte si de dupa. Costul unui pas e
+proportional cu obiectele atinse, nu cu marimea planului.
+"""
+from typing import Dict, Optional
+
+from .ArchitecturalObjects import ArchitecturalObject
+
+# atribute care nu fac parte din starea salvata in istoric
+TRANSIENT = frozenset({"selected"})
+
+
+def state_of(obj: ArchitecturalObject) -> Dict:
+    # atributele obiectelor sunt scalare, o copie superficiala ajunge
+    return {k: v for k, v in obj.__dict__.items() if k not in TRANSIENT}
+
+
+class Transaction:
+    def __init__(self, label: str = "", selected: Optional[ArchitecturalObject] = None):
+        self.label = label
+        self.depth = 1
+        self.added: Dict[ArchitecturalObject, None] = {}
+        self.removed: Dict[ArchitecturalObject, None] = {}
+        self.before: Dict[ArchitecturalObject, Dict] = {}
+        self.after: Dict[ArchitecturalObject, Dict] = {}
+        self.selected_before = selected
+        self.selected_after: Optional[ArchitecturalObject] = None
+
+    # ----------------------------- INREGISTRARE ---------------------------
+
+    def touch(self, obj: ArchitecturalObject):
+        """Apelat inainte de modificarea obiectului; prima stare vazuta e cea retinuta."""
+        if obj not in self.before and obj not in self.added:
+            self.before[obj] = state_of(obj)
+
+    def add(self, obj: ArchitecturalObject):
+        self.added[obj] = None
+
+    def remove(self, obj: ArchitecturalObject):
+        if obj in self.added:
+            # adaugat si sters in aceeasi tranzactie: nu ramane nimic de refacut
+            del self.added[obj]
+            return
+        self.touch(obj)
+        self.removed[obj] = None
+
+    def finish(self, selected: Optional[ArchitecturalObject]):
+        """Retine starile finale; obiectele neschimbate dispar din tranzactie."""
+        self.selected_after = selected
+        for obj, before in list(self.before.items()):
+            if obj in self.removed:
+                continue
+            after = state_of(obj)
+            if after == before:
+                del self.before[obj]
+            else:
+                self.after[obj] = after
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.after)
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.after)
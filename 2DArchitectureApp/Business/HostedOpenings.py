@@ -0,0 +1,262 @@
+import math
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall
+
+EPS = 1e-6
+# celula pentru gruparea peretilor cand se cauta gazde pentru multe deschideri
+HOST_BUCKET = 256
+
+
+# ============================== GEOMETRIE ==============================
+
+def wall_frame(wall: Wall) -> Tuple[float, float, float, float]:
+    """(ux, uy, lungime, unghi in grade) pentru directia x1,y1 -> x2,y2."""
+    dx = wall.x2 - wall.x1
+    dy = wall.y2 - wall.y1
+    length = math.hypot(dx, dy)
+    if length < EPS:
+        return 1.0, 0.0, 0.0, 0.0
+    return dx / length, dy / length, length, math.degrees(math.atan2(dy, dx))
+
+
+def project_on_wall(wall: Wall, px: float, py: float) -> Tuple[float, float]:
+    """(distanta de-a lungul peretelui, distanta fata de axa peretelui)."""
+    ux, uy, _, _ = wall_frame(wall)
+    rx = px - wall.x1
+    ry = py - wall.y1
+    return rx * ux + ry * uy, -rx * uy + ry * ux
+
+
+def extent_along(obj: ArchitecturalObject, angle: float) -> Tuple[float, float]:
+    """Lungimea dreptunghiului rotit al obiectului de-a lungul si perpendicular pe o directie."""
+    rel = math.radians(obj.rotation - angle)
+    c, s = abs(math.cos(rel)), abs(math.sin(rel))
+    return obj.width * c + obj.height * s, obj.width * s + obj.height * c
+
+
+def place_on_wall(opening: ArchitecturalObject, wall: Wall):
+    """Aseaza deschiderea pe axa peretelui, la opening.offset, cu unghiul peretelui."""
+    ux, uy, _, angle = wall_frame(wall)
+    cx = wall.x1 + ux * opening.offset
+    cy = wall.y1 + uy * opening.offset
+    opening.height = wall.thickness
+    opening.rotation = angle % 360
+    opening.x = cx - opening.width / 2
+    opening.y = cy - opening.height / 2
+
+
+def host_candidate(wall: Wall, opening: ArchitecturalObject):
+    """(offset, lungime, distanta) daca deschiderea poate sta pe perete, altfel None."""
+    _, _, length, angle = wall_frame(wall)
+    if length < EPS:
+        return None
+
+    cx, cy = opening.get_center()
+    along, across = project_on_wall(wall, cx, cy)
+    size, depth = extent_along(opening, angle)
+    if abs(across) > (wall.thickness + depth) / 2 or not 0 <= along <= length:
+        return None
+    return along, size, abs(across)
+
+
+def find_host(walls: Iterable[Wall], opening: ArchitecturalObject):
+    """Peretele cel mai apropiat pe care se poate aseza deschiderea: (wall, offset, lungime)."""
+    best = None
+    for wall in walls:
+        cand = host_candidate(wall, opening)
+        if cand and (best is None or cand[2] < best[3]):
+            best = (wall, cand[0], cand[1], cand[2])
+    return best[:3] if best else None
+
+
+# ============================ INDEX INTERVALE ==========================
+
+class IntervalIndex:
+    """Intervalele ocupate de deschideri pe un perete, sortate dupa inceput.
+
+    Intervalele nu se suprapun, deci si capetele lor sunt sortate: o
+    suprapunere se verifica doar cu vecinul din stanga, in O(log k).
+    """
+
+    def __init__(self):
+        self._starts: List[float] = []
+        self._items: List[Tuple[float, float, int, ArchitecturalObject]] = []
+        self._start_of: Dict[int, float] = {}
+
+    def add(self, start: float, end: float, obj: ArchitecturalObject):
+        insort(self._items, (start, end, id(obj), obj))
+        insort(self._starts, start)
+        self._start_of[id(obj)] = start
+
+    def remove(self, obj: ArchitecturalObject) -> bool:
+        start = self._start_of.pop(id(obj), None)
+        if start is None:
+            return False
+        i = bisect_left(self._starts, start)
+        while self._items[i][3] is not obj:
+            i += 1
+        del self._items[i]
+        del self._starts[i]
+        return True
+
+    def overlaps(self, start: float, end: float, ignore=None) -> bool:
+        j = bisect_left(self._starts, end - EPS) - 1
+        while j >= 0:
+            s, e, _, obj = self._items[j]
+            if obj is ignore:
+                j -= 1
+                continue
+            return e > start + EPS
+        return False
+
+    def __iter__(self) -> Iterator[ArchitecturalObject]:
+        return (item[3] for item in self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class OpeningHosts:
+    """Legatura deschidere -> perete gazda, cu cate un IntervalIndex per perete."""
+
+    def __init__(self):
+        self._walls: Dict[str, Wall] = {}
+        self._index: Dict[str, IntervalIndex] = {}
+
+    def index_for(self, wall: Wall) -> IntervalIndex:
+        index = self._index.get(wall.id)
+        if index is None:
+            index = self._index[wall.id] = IntervalIndex()
+        return index
+
+    def wall_of(self, opening) -> Optional[Wall]:
+        host = getattr(opening, "host_wall_id", None)
+        return self._walls.get(host) if host else None
+
+    def hosted(self, wall: Wall) -> List[ArchitecturalObject]:
+        index = self._index.get(wall.id)
+        return list(index) if index else []
+
+    # ----------------------------- MODIFICARI ----------------------------
+
+    def add_wall(self, wall: Wall):
+        self._walls[wall.id] = wall
+
+    def remove_wall(self, wall: Wall) -> List[ArchitecturalObject]:
+        """Scoate peretele; returneaza deschiderile care erau pe el."""
+        self._walls.pop(wall.id, None)
+        index = self._index.pop(wall.id, None)
+        hosted = list(index) if index else []
+        for o in hosted:
+            o.host_wall_id = None
+        return hosted
+
+    def attach(self, opening, wall: Wall, offset: float):
+        self.detach(opening)
+        opening.host_wall_id = wall.id
+        opening.offset = offset
+        place_on_wall(opening, wall)
+        half = opening.width / 2
+        self.index_for(wall).add(offset - half, offset + half, opening)
+
+    def detach(self, opening):
+        self.release(opening)
+        opening.host_wall_id = None
+
+    def release(self, opening):
+        """Scoate deschiderea din indexul peretelui, dar pastreaza legatura (pentru undo)."""
+        wall = self.wall_of(opening)
+        index = self._index.get(wall.id) if wall is not None else None
+        if index is not None:
+            index.remove(opening)
+
+    def reattach(self, opening):
+        """Pune deschiderea inapoi in indexul peretelui ei, la offset-ul pe care il are."""
+        wall = self.wall_of(opening)
+        if wall is not None:
+            half = opening.width / 2
+            self.index_for(wall).add(opening.offset - half, opening.offset + half, opening)
+
+    def slide(self, opening, offset: float):
+        wall = self.wall_of(opening)
+        index = self._index[wall.id]
+        index.remove(opening)
+        opening.offset = offset
+        place_on_wall(opening, wall)
+        half = opening.width / 2
+        index.add(offset - half, offset + half, opening)
+
+    def follow_wall(self, wall: Wall):
+        """Repozitioneaza deschiderile dupa mutarea sau rotirea peretelui."""
+        index = self._index.get(wall.id)
+        if index:
+            for o in index:
+                place_on_wall(o, wall)
+
+    def rebuild(self, walls: Iterable[Wall], openings: Iterable[ArchitecturalObject]):
+        self._walls = {}
+        self._index = {}
+        self.extend(walls, openings)
+
+    def extend(self, walls: Iterable[Wall], openings: Iterable[ArchitecturalObject]):
+        """Adauga un grup de pereti si deschideri (gazdele orfanilor sunt cautate doar in grup)."""
+        walls = list(walls)
+        for w in walls:
+            self._walls[w.id] = w
+
+        orphans = []
+        for o in openings:
+            wall = self._walls.get(getattr(o, "host_wall_id", None))
+            if wall is None:
+                orphans.append(o)
+                continue
+            if not self._fits(wall, o.offset, o.width):
+                # gazda din fisier nu e valida (iese din perete sau se suprapune):
+                # indexul presupune intervale disjuncte, deci deschiderea ramane negazduita
+                o.host_wall_id = None
+                continue
+            half = o.width / 2
+            self.index_for(wall).add(o.offset - half, o.offset + half, o)
+
+        if orphans:
+            self._host_orphans(orphans, walls)
+
+    def forget(self, walls: Iterable[Wall]):
+        """Scoate peretii si indexurile lor fara sa atinga deschiderile (descarcare din memorie)."""
+        for w in walls:
+            self._walls.pop(w.id, None)
+            self._index.pop(w.id, None)
+
+    def _fits(self, wall: Wall, offset: float, size: float) -> bool:
+        """Intervalul incape pe perete si nu se suprapune cu deschiderile deja gazduite."""
+        half = size / 2
+        if offset - half < -EPS or offset + half > wall_frame(wall)[2] + EPS:
+            return False
+        index = self._index.get(wall.id)
+        return index is None or not index.overlaps(offset - half, offset + half)
+
+    def _host_orphans(self, orphans, walls):
+        # proiecte vechi: deschiderile nu au gazda; le cautam peretele prin celule
+        buckets = defaultdict(list)
+        for w in walls:
+            half = w.thickness / 2
+            for bx in range(int((min(w.x1, w.x2) - half) // HOST_BUCKET),
+                            int((max(w.x1, w.x2) + half) // HOST_BUCKET) + 1):
+                for by in range(int((min(w.y1, w.y2) - half) // HOST_BUCKET),
+                                int((max(w.y1, w.y2) + half) // HOST_BUCKET) + 1):
+                    buckets[bx, by].append(w)
+
+        for o in orphans:
+            o.host_wall_id = None
+            cx, cy = o.get_center()
+            host = find_host(buckets.get((int(cx // HOST_BUCKET), int(cy // HOST_BUCKET)), ()), o)
+            if host is None:
+                continue
+            wall, offset, size = host
+            if not self._fits(wall, offset, size):
+                continue
+            o.width = size
+            self.attach(o, wall, offset)
@@ -0,0 +1,101 @@
+"""Copii ale obiectelor: duplicare, multiplicare rectangulara si polara.
+
+Functiile produc obiecte noi (cu id-uri noi) care nu sunt inca in plan;
+ProjectManager.add_objects le valideaza si le adauga dintr-o singura trecere.
+"""
+import math
+import uuid
+from typing import Iterable, List, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall, Transform
+from .SpatialIndex import obstacle_box
+
+
+def clone(obj: ArchitecturalObject, dx: float = 0.0, dy: float = 0.0) -> ArchitecturalObject:
+    """Copie independenta a obiectului, mutata cu (dx, dy)."""
+    copy = type(obj).from_dict(obj.to_dict())
+    copy.id = str(uuid.uuid4())
+    if hasattr(copy, "host_wall_id"):
+        # gazda copiei se cauta din nou la adaugare
+        copy.host_wall_id = None
+    if dx or dy:
+        Transform.translate(copy, dx, dy)
+    return copy
+
+
+def group_bounds(objects: Iterable[ArchitecturalObject]) -> Tuple[float, float, float, float]:
+    """Dreptunghiul (x0, y0, x1, y1) care cuprinde toate obiectele."""
+    x0 = y0 = math.inf
+    x1 = y1 = -math.inf
+    for o in objects:
+        x, y, w, h = obstacle_box(o)
+        x0, y0 = min(x0, x), min(y0, y)
+        x1, y1 = max(x1, x + w), max(y1, y + h)
+    if x0 == math.inf:
+        return 0.0, 0.0, 0.0, 0.0
+    return x0, y0, x1, y1
+
+
+def group_center(objects: Iterable[ArchitecturalObject]) -> Tuple[float, float]:
+    """Centrul dreptunghiului care cuprinde toate obiectele."""
+    x0, y0, x1, y1 = group_bounds(objects)
+    return (x0 + x1) / 2, (y0 + y1) / 2
+
+
+def polar_center(objects: Iterable[ArchitecturalObject]) -> Tuple[float, float]:
+    """Centrul implicit al multiplicarii polare: in dreapta grupului, in afara lui.
+
+    Raza e diagonala grupului, deci pana la 6 exemplare pe un cerc complet nu se
+    suprapun (coarda dintre doua exemplare vecine e cel putin diagonala).
+    """
+    x0, y0, x1, y1 = group_bounds(objects)
+    radius = math.hypot(x1 - x0, y1 - y0)
+    return (x0 + x1) / 2 + radius, (y0 + y1) / 2
+
+
+def rotate_about(obj: ArchitecturalObject, angle: float, cx: float, cy: float):
+    """Roteste obiectul cu `angle` grade in jurul punctului (cx, cy)."""
+    a = math.radians(angle)
+    c, s = math.cos(a), math.sin(a)
+
+    def rot(px, py):
+        dx, dy = px - cx, py - cy
+        return cx + dx * c - dy * s, cy + dx * s + dy * c
+
+    if isinstance(obj, Wall):
+        obj.set_endpoints(*rot(obj.x1, obj.y1), *rot(obj.x2, obj.y2))
+        return
+    ox, oy = rot(*obj.get_center())
+    obj.x = ox - obj.width / 2
+    obj.y = oy - obj.height / 2
+    obj.set_rotation(obj.rotation + angle)
+
+
+def rectangular_array(objects: List[ArchitecturalObject], rows: int, cols: int,
+                      dx: float, dy: float) -> List[ArchitecturalObject]:
+    """Copiile pe o grila rows x cols cu pasul (dx, dy); originalul e celula (0, 0)."""
+    copies = []
+    for r in range(rows):
+        for c in range(cols):
+            if r or c:
+                copies += [clone(o, c * dx, r * dy) for o in objects]
+    return copies
+
+
+def polar_array(objects: List[ArchitecturalObject], count: int, cx: float, cy: float,
+                angle: float = 360.0) -> List[ArchitecturalObject]:
+    """`count` exemplare (cu originalul) rotite in jurul lui (cx, cy) pe un arc de `angle` grade.
+
+    Pe un cerc complet exemplarele sunt egal distantate; pe un arc, primul si
+    ultimul stau la capetele arcului.
+    """
+    if count < 2:
+        return []
+    step = angle / count if abs(angle) >= 360 else angle / (count - 1)
+    copies = []
+    for i in range(1, count):
+        for o in objects:
+            copy = clone(o)
+            rotate_about(copy, i * step, cx, cy)
+            copies.append(copy)
+    return copies
@@ -1,7 +1,8 @@
 import json
 import os
+from collections import ChainMap
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterator, Mapping
 
 
 class Project:
@@ -38,6 +39,12 @@ class Project:
             'annotations': {'visible': True, 'locked': False}
         }
 
+        # Fundal pentru trasare (imagine scanata), vezi Underlay
+        self.underlay: Optional[Dict] = None
+
+        # Inaltimi pentru antemasuratoare, in cm (vezi Takeoff)
+        self.heights = {'wall': 250.0, 'door': 210.0, 'window': 120.0}
+
     def save(self, filepath: str = None) -> bool:
         #salvare json
         try:
@@ -65,7 +72,9 @@ class Project:
                 'zoom_level': self.zoom_level,
                 'pan_x': self.pan_x,
                 'pan_y': self.pan_y,
-                'layers': self.layers
+                'layers': self.layers,
+                'underlay': self.underlay,
+                'heights': self.heights
             }
 
             with open(self.filepath, 'w', encoding='utf-8') as f:
@@ -111,6 +120,8 @@ class Project:
             project.pan_y = data.get('pan_y', 0)
 
             project.layers = data.get('layers', project.layers)
+            project.underlay = data.get('underlay')
+            project.heights.update(data.get('heights') or {})
 
             return project
 
@@ -167,24 +178,10 @@ class Project:
         self.furniture.clear()
         self.modified_date = datetime.now().isoformat()
 
-    def get_all_objects(self) -> List[Dict]:
-        """Returnează toate obiectele din proiect"""
-        all_objects = []
-
-        for wall in self.walls:
-            wall['type'] = 'wall'
-            all_objects.append(wall)
-
-        for door in self.doors:
-            door['type'] = 'door'
-            all_objects.append(door)
-
-        for window in self.windows:
-            window['type'] = 'window'
-            all_objects.append(window)
-
-        for item in self.furniture:
-            item['type'] = 'furniture'
-            all_objects.append(item)
-
-        return all_objects
\ No newline at end of file
+    def get_all_objects(self) -> Iterator[Mapping]:
+        """Toate obiectele din proiect, ca vederi cu cheia 'type' (dict-urile nu sunt modificate)"""
+        for obj_type, items in (('wall', self.walls), ('door', self.doors),
+                                ('window', self.windows), ('furniture', self.furniture)):
+            tag = {'type': obj_type}
+            for item in items:
+                yield ChainMap(tag, item)
@@ -1,5 +1,11 @@
-from typing import Optional, List, Dict
-import copy
+from typing import Optional, List, Dict, Iterable
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, count
+import math
+import os
+import shutil
+import time
 
 from .Project import Project
 from .ArchitecturalObjects import (
@@ -7,23 +13,27 @@ from .ArchitecturalObjects import (
 )
 from .CoordinateSystem import CoordinateSystem
 
-from .CollisionDetector import CollisionDetector
+from .ChunkedProject import ChunkedFile, TileResidency, KINDS, DEFAULT_BUDGET, is_chunked
+from .CollisionDetector import CollisionDetector, COLLISION_LAYERS
+from .DisplayList import DisplayList, ObjectsView
+from .Dimensions import DimensionCache
+from .History import Transaction
+from .HostedOpenings import OpeningHosts, IntervalIndex, find_host, wall_frame, place_on_wall
+from .SpatialIndex import SpatialHash, DEFAULT_CELL, obstacle_box
+from .Takeoff import QuantityTakeoff, write_csv, write_json
+from . import FreeSpace, Placement, Proximity
+from .Tracing import traced
+from .WallOutlines import WallOutlines
 
+# reviziile straturilor sunt unice intre documente, ca un cache de raster
+# pastrat pentru un document inchis sa nu poata fi confundat cu altul
+_revisions = count(1)
 
-class ProjectManager:
-    _instance = None
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ProjectManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+class ProjectManager:
+    """Modelul unui document deschis (vezi Workspace pentru mai multe documente)."""
 
     def __init__(self):
-        if getattr(self, "_initialized", False):
-            return
-
-        self._initialized = True
         self.current_project: Optional[Project] = None
 
 
@@ -35,75 +45,158 @@ class ProjectManager:
         self._doors: List[Door] = []
         self._windows: List[Window] = []
         self._furniture: List[Furniture] = []
+        # ordinea de desenare si de selectie, comuna pentru canvas si find_object_at
+        self.display_list = DisplayList()
+        # usile si ferestrele sunt gazduite de pereti, cu un index de intervale per perete
+        self.hosts = OpeningHosts()
+        # grila cu ocuparea planului, pentru cererile de spatiu liber
+        self.spatial = SpatialHash()
+        # cotele automate, calculate la cerere si pastrate per perete
+        self.dimensions = DimensionCache()
+        # conturul peretilor cu imbinari, recalculat doar pentru peretii atinsi
+        self.wall_outlines = WallOutlines()
+        # antemasuratoarea: contributiile per obiect si sumele lor, aduse la zi la cerere
+        self.takeoff = QuantityTakeoff()
+        # revizia fiecarui strat: creste la orice schimbare vizibila a unui obiect din el
+        self.layer_revision: Dict[str, int] = {}
+        # proiect fragmentat pe tile-uri: doar tile-urile din jurul vederii sunt in memorie
+        self.tiles: Optional[TileResidency] = None
 
         self.selected_object: Optional[ArchitecturalObject] = None
 
 
-        self._history: List[Dict] = []
+        # pasii de undo; _history_index e ultimul pas aplicat
+        self._history: List[Transaction] = []
         self._history_index = -1
+        self._tx: Optional[Transaction] = None
 
         self.collision_detector = CollisionDetector()
 
 
-    def _get_snapshot(self) -> Dict:
-
-        return {
-            "project": copy.deepcopy(self.current_project),
-            "walls": copy.deepcopy(self._walls),
-            "doors": copy.deepcopy(self._doors),
-            "windows": copy.deepcopy(self._windows),
-            "furniture": copy.deepcopy(self._furniture),
-            "selected": self.selected_object.id if self.selected_object else None
-        }
+    # ------------------------------- ISTORIC -------------------------------
 
-    def _push_history(self):
+    def begin(self):
+        """Deschide o tranzactie; cele deschise in interiorul ei se contopesc in ea."""
+        if self._tx is not None:
+            self._tx.depth += 1
+        else:
+            self._tx = Transaction(selected=self.selected_object)
 
-        if not self.current_project:
-            return
-
-
-        if self._history_index < len(self._history) - 1:
-            self._history = self._history[:self._history_index + 1]
+    @traced("ProjectManager.commit", "project")
+    def commit(self) -> bool:
+        """Inchide tranzactia; cea exterioara devine un pas de undo daca a schimbat ceva."""
+        tx = self._tx
+        if tx is None:
+            return False
+        tx.depth -= 1
+        if tx.depth:
+            return True
+        self._tx = None
+        tx.finish(self.selected_object)
+        if tx.empty:
+            return False
 
-        self._history.append(self._get_snapshot())
+        # sincronizarea cu Project e amanata pana la sfarsitul gestului
+        self._sync_to_project()
+        del self._history[self._history_index + 1:]
+        self._history.append(tx)
         self._history_index += 1
+        return True
 
-    def _restore(self, snapshot: Dict):
-
-        self.current_project = snapshot["project"]
-        self._walls = snapshot["walls"]
-        self._doors = snapshot["doors"]
-        self._windows = snapshot["windows"]
-        self._furniture = snapshot["furniture"]
+    def rollback(self):
+        """Anuleaza tot ce s-a modificat de la begin, inclusiv in tranzactiile interioare."""
+        tx = self._tx
+        if tx is None:
+            return
+        self._tx = None
+        tx.finish(self.selected_object)
+        self._revert(tx)
+
+    @contextmanager
+    def transaction(self):
+        self.begin()
+        try:
+            yield
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._tx is not None
+
+    def _record(self, *objs):
+        # apelat inainte de modificare, ca tranzactia sa retina starea veche
+        if self._tx is not None:
+            for o in objs:
+                self._tx.touch(o)
+
+    def _reset_history(self):
+        self._tx = None
+        self._history = []
+        self._history_index = -1
 
-        sel = snapshot["selected"]
-
-        self.selected_object = None
-        for obj in self.get_all_objects():
-            obj.selected = False
-            if sel and obj.id == sel:
-                obj.selected = True
-                self.selected_object = obj
+    def _finish_gesture(self):
+        # undo in timpul unui gest: gestul inceput devine intai un pas de undo
+        if self._tx is not None:
+            self._tx.depth = 1
+            self.commit()
 
+    @traced("ProjectManager.undo", "project")
     def undo(self) -> bool:
-        if self._history_index <= 0:
+        self._finish_gesture()
+        if self._history_index < 0:
             return False
 
+        self._revert(self._history[self._history_index])
         self._history_index -= 1
-        snap = self._history[self._history_index]
-        self._restore(snap)
         return True
 
+    @traced("ProjectManager.redo", "project")
     def redo(self) -> bool:
+        self._finish_gesture()
         if self._history_index >= len(self._history) - 1:
             return False
 
         self._history_index += 1
-        snap = self._history[self._history_index]
-        self._restore(snap)
+        self._reapply(self._history[self._history_index])
         return True
 
+    def _revert(self, tx: Transaction):
+        self._discard(reversed(list(tx.added)))
+        for o in tx.removed:
+            o.__dict__.update(tx.before[o])
+        # peretii inaintea deschiderilor gazduite de ei
+        self._insert(sorted(tx.removed, key=lambda o: not isinstance(o, Wall)))
+        for o, state in tx.before.items():
+            if o not in tx.removed:
+                self._set_state(o, state)
+        self._history_step_done(tx.selected_before)
+
+    def _reapply(self, tx: Transaction):
+        self._discard(tx.removed)
+        self._insert(tx.added)
+        for o, state in tx.after.items():
+            self._set_state(o, state)
+        self._history_step_done(tx.selected_after)
+
+    def _set_state(self, obj, state):
+        opening = isinstance(obj, (Door, Window))
+        if opening:
+            self.hosts.release(obj)
+        obj.__dict__.update(state)
+        if opening:
+            self.hosts.reattach(obj)
+        self.spatial.update(obj)
+        if isinstance(obj, Wall):
+            self._touch(*self.wall_outlines.update(obj))
+        self._changed(obj)
 
+    def _history_step_done(self, selected):
+        self.dimensions.invalidate_all()
+        self._sync_to_project()
+        self.select_object(selected if selected is not None and selected in self.display_list else None)
 
     def set_view_scale(self, value: float):
         self.view_scale = max(0.1, min(10.0, value))
@@ -118,35 +211,45 @@ class ProjectManager:
 
 
         self._clear_cache()
-
-
-        self._history = []
-        self._history_index = -1
+        self.display_list.set_layer_order(self.current_project.layers)
 
 
         self.view_scale = 1.0
         self.coordinate_system = CoordinateSystem(grid_size=10, scale=1.0)
 
-
-        self._push_history()
-
         return self.current_project
 
+    @traced("ProjectManager.save_project", "project")
     def save_project(self, filepath=None):
         if not self.current_project:
             return False
+        if self.tiles:
+            return self._save_chunked(filepath)
 
         self._sync_to_project()
         return self.current_project.save(filepath)
 
+    def export_svg(self, filepath):
+        if not self.current_project:
+            return False
+
+        # import lenes: svgwrite nu e necesar la pornire
+        from .SvgExporter import SvgExporter
+        return SvgExporter().export(
+            filepath, self._walls, self._doors, self._windows, self._furniture, self.wall_outlines
+        )
+
+    @traced("ProjectManager.load_project", "project")
     def load_project(self, filepath):
+        if is_chunked(filepath):
+            return self.open_chunked(filepath)
+
         project = Project.load(filepath)
         if not project:
             return False
 
         self.current_project = project
         self._rebuild_cache()
-        self._push_history()
         return True
 
 
@@ -156,8 +259,18 @@ class ProjectManager:
         self._doors = []
         self._windows = []
         self._furniture = []
+        self.display_list.clear()
+        self.hosts.rebuild((), ())
+        self.spatial.rebuild(())
+        self.wall_outlines.rebuild(())
+        self.takeoff.invalidate_all()
+        self.dimensions.invalidate_all()
+        self._touch_all()
         self.selected_object = None
+        self.tiles = None
+        self._reset_history()
 
+    @traced("ProjectManager._rebuild_cache", "project")
     def _rebuild_cache(self):
         self._clear_cache()
 
@@ -169,8 +282,34 @@ class ProjectManager:
             self._windows.append(Window.from_dict(w))
         for f in self.current_project.furniture:
             self._furniture.append(Furniture.from_dict(f))
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        if self.current_project:
+            self.display_list.set_layer_order(self.current_project.layers)
+        self.display_list.rebuild(self.get_all_objects())
+        self.hosts.rebuild(self._walls, chain(self._doors, self._windows))
+        self.spatial.rebuild(self.display_list)
+        self.wall_outlines.rebuild(self._walls)
+        self.takeoff.invalidate_all()
+        self.dimensions.invalidate_all()
+        self._touch_all()
+
+    def set_objects(self, walls, doors, windows, furniture):
+        """Inlocuieste tot continutul documentului (fara istoric)."""
+        self._walls = list(walls)
+        self._doors = list(doors)
+        self._windows = list(windows)
+        self._furniture = list(furniture)
+        self.selected_object = None
+        self._reset_history()
+        self._rebuild_indexes()
+        self._sync_to_project()
 
     def _sync_to_project(self):
+        if self.tiles:
+            # tile-urile modificate sunt scrise la salvare sau cand sunt descarcate
+            return
         self.current_project.walls = [w.to_dict() for w in self._walls]
         self.current_project.doors = [d.to_dict() for d in self._doors]
         self.current_project.windows = [w.to_dict() for w in self._windows]
@@ -178,84 +317,251 @@ class ProjectManager:
 
 
 
+    @traced("ProjectManager.add_wall", "project")
     def add_wall(self, x1, y1, x2, y2, t=20):
         wall = Wall(x1, y1, x2, y2, t)
 
 
-        if not self.collision_detector.can_add_wall(wall, self._walls):
+        if not self.collision_detector.can_add_wall(wall, self._nearby(wall, Wall)):
             return None
-        self._walls.append(wall)
-        self._sync_to_project()
-        self._push_history()
+        with self.transaction():
+            self._insert([wall])
 
         return wall
 
-    def add_door(self, x, y, w, h):
-        d = Door(x, y, w, h)
-
-        walls = self._walls
-        others = self._doors + self._windows
-
-        if not self.collision_detector.can_add_opening(d, walls, others):
+    def _add_opening(self, opening):
+        if not self._host_opening(opening):
             return None
+        with self.transaction():
+            self._insert([opening])
 
-        self._doors.append(d)
-        self._sync_to_project()
-        self._push_history()
+        return opening
 
-        return d
+    def _host_opening(self, opening, pending=None, intervals=None) -> bool:
+        """Aseaza deschiderea pe cel mai apropiat perete, la unghiul lui; False daca nu are loc.
 
-    def add_window(self, x, y, w, h):
-        win = Window(x, y, w, h)
+        `pending` si `intervals` sunt peretii si intervalele unui grup inca neadaugat (add_objects).
+        """
+        walls = self._nearby(opening, Wall)
+        if pending is not None:
+            walls += self._nearby(opening, Wall, pending)
+        host = find_host(walls, opening)
+        if host is None:
+            return False
 
-        walls = self._walls
-        others = self._doors + self._windows
+        wall, offset, size = host
+        length = wall_frame(wall)[2]
+        offset = min(max(offset, size / 2), length - size / 2)
+        start, end = offset - size / 2, offset + size / 2
 
-        if not self.collision_detector.can_add_opening(win, walls, others):
-            return None
+        if not self.collision_detector.can_add_hosted_opening(
+                self.hosts.index_for(wall), start, end, length):
+            return False
+        if intervals is not None:
+            group = intervals.get(wall.id)
+            if group is None:
+                group = intervals[wall.id] = IntervalIndex()
+            if group.overlaps(start, end):
+                return False
+            group.add(start, end, opening)
+
+        opening.width = size
+        opening.host_wall_id = wall.id
+        opening.offset = offset
+        place_on_wall(opening, wall)
+        return True
 
-        self._windows.append(win)
-        self._sync_to_project()
-        self._push_history()
+    @traced("ProjectManager.add_door", "project")
+    def add_door(self, x, y, w, h):
+        return self._add_opening(Door(x, y, w, h))
 
-        return win
+    @traced("ProjectManager.add_window", "project")
+    def add_window(self, x, y, w, h):
+        return self._add_opening(Window(x, y, w, h))
 
+    @traced("ProjectManager.add_furniture", "project")
     def add_furniture(self, x, y, w, h, t="generic"):
         f = Furniture(x, y, w, h, t)
 
-        walls = self._walls
-        openings = self._doors + self._windows
+        walls = self._nearby(f, Wall)
+        openings = self._nearby(f, (Door, Window))
 
         if not self.collision_detector.can_add_furniture(f, walls, openings):
             return None
-
-        self._furniture.append(f)
-        self._sync_to_project()
-        self._push_history()
+        with self.transaction():
+            self._insert([f])
 
         return f
 
+    @traced("ProjectManager.add_objects", "project")
+    def add_objects(self, objects: Iterable[ArchitecturalObject]) -> List[ArchitecturalObject]:
+        """Adauga un grup de obiecte noi ca un singur pas de undo; returneaza cele acceptate.
+
+        Fiecare obiect trece prin aceleasi verificari ca la add_wall/add_door/add_furniture,
+        fata de plan si fata de obiectele deja acceptate din grup; cele care nu au loc sunt sarite.
+        """
+        accepted = self.check_objects(objects)
+        if accepted:
+            with self.transaction():
+                # peretii intra primii, ca deschiderile sa-si gaseasca gazda
+                self._insert(accepted)
+        return accepted
+
+    def check_objects(self, objects: Iterable[ArchitecturalObject]) -> List[ArchitecturalObject]:
+        """Obiectele din grup care ar fi acceptate de add_objects, fara sa fie adaugate.
+
+        Ordinea e cea de adaugare: peretii, apoi deschiderile, apoi mobilierul.
+        Deschiderile acceptate sunt asezate pe peretele gazda.
+        """
+        walls, openings, furniture = [], [], []
+        for o in objects:
+            if isinstance(o, Wall):
+                walls.append(o)
+            elif isinstance(o, (Door, Window)):
+                openings.append(o)
+            else:
+                furniture.append(o)
+
+        # obiectele acceptate din grup, inca neadaugate in plan; grila e mai rara
+        # decat cea a planului, fiindca tine doar pereti si deschideri
+        pending = SpatialHash(cell=4 * DEFAULT_CELL)
+        accepted = []
+        detector = self.collision_detector
+
+        for w in walls:
+            if detector.can_add_wall(w, self._nearby(w, Wall) + self._nearby(w, Wall, pending)):
+                pending.insert(w)
+                accepted.append(w)
+
+        intervals: Dict[str, IntervalIndex] = {}
+        for o in openings:
+            if self._host_opening(o, pending, intervals):
+                pending.insert(o)
+                accepted.append(o)
+
+        for f in furniture:
+            near = self._nearby(f, (Wall, Door, Window)) + self._nearby(f, (Wall, Door, Window), pending)
+            if detector.can_add_furniture(f, [o for o in near if isinstance(o, Wall)],
+                                          [o for o in near if not isinstance(o, Wall)]):
+                accepted.append(f)
+        return accepted
+
+    def _selection_group(self) -> List[ArchitecturalObject]:
+        # un perete e copiat impreuna cu usile si ferestrele de pe el
+        obj = self.selected_object
+        if obj is None:
+            return []
+        return [obj] + (self.hosts.hosted(obj) if isinstance(obj, Wall) else [])
+
+    def copy_selection(self) -> List[ArchitecturalObject]:
+        """Copii independente ale selectiei, pentru clipboard."""
+        return [Placement.clone(o) for o in self._selection_group()]
+
+    @traced("ProjectManager.paste", "project")
+    def paste(self, objects: Iterable[ArchitecturalObject], dx=0.0, dy=0.0) -> List[ArchitecturalObject]:
+        """Adauga copii ale obiectelor, mutate cu (dx, dy); clipboard-ul ramane neschimbat."""
+        return self.add_objects([Placement.clone(o, dx, dy) for o in objects])
+
+    @traced("ProjectManager.array_rectangular", "project")
+    def array_rectangular(self, rows, cols, dx, dy) -> List[ArchitecturalObject]:
+        """Multiplica selectia pe o grila rows x cols; selectia ramane in prima celula."""
+        group = self._selection_group()
+        if not group:
+            return []
+        return self.add_objects(Placement.rectangular_array(group, rows, cols, dx, dy))
+
+    @traced("ProjectManager.array_polar", "project")
+    def array_polar(self, count, cx, cy, angle=360.0) -> List[ArchitecturalObject]:
+        """Multiplica selectia de `count` ori in jurul punctului (cx, cy), pe un arc de `angle` grade."""
+        group = self._selection_group()
+        if not group:
+            return []
+        return self.add_objects(Placement.polar_array(group, count, cx, cy, angle))
+
+    @traced("ProjectManager.remove_object", "project")
     def remove_object(self, obj):
-
+        with self.transaction():
+            # deschiderile gazduite dispar odata cu peretele
+            hosted = self.hosts.hosted(obj) if isinstance(obj, Wall) else []
+            self._discard(hosted + [obj])
+            self.select_object(None)
+
+    @traced("ProjectManager.clear_objects", "project")
+    def clear_objects(self):
+        """Sterge toate obiectele, ca un singur pas de undo."""
+        with self.transaction():
+            self._discard(list(self.display_list))
+
+    def _items_of(self, obj) -> List:
         if isinstance(obj, Wall):
-            self._walls.remove(obj)
-        elif isinstance(obj, Door):
-            self._doors.remove(obj)
-        elif isinstance(obj, Window):
-            self._windows.remove(obj)
-        elif isinstance(obj, Furniture):
-            self._furniture.remove(obj)
-
-        self.selected_object = None
-
-        self._sync_to_project()
-        self._push_history()
-
-
-    def get_all_objects(self):
-        return self._walls + self._doors + self._windows + self._furniture
+            return self._walls
+        if isinstance(obj, Door):
+            return self._doors
+        if isinstance(obj, Window):
+            return self._windows
+        return self._furniture
+
+    def _insert(self, objects: Iterable[ArchitecturalObject]):
+        """Adauga obiecte in liste si in toate indexurile (peretii inaintea deschiderilor lor)."""
+        objects = list(objects)
+        if not objects:
+            return
+        for o in objects:
+            self._items_of(o).append(o)
+        self.display_list.extend(objects)
+        for o in objects:
+            if isinstance(o, Wall):
+                self.hosts.add_wall(o)
+                self.dimensions.invalidate(o)
+                self._touch(*self.wall_outlines.add(o))
+            elif isinstance(o, (Door, Window)):
+                self.hosts.reattach(o)
+                self.dimensions.invalidate(self.hosts.wall_of(o))
+            self.spatial.insert(o)
+            self._track_added(o, self.hosts.wall_of(o))
+            self._touch(o)
+            if self._tx is not None:
+                self._tx.add(o)
+
+    def _discard(self, objects: Iterable[ArchitecturalObject]):
+        """Scoate obiecte din liste si din indexuri, fara sa le modifice starea."""
+        objects = list(objects)
+        if not objects:
+            return
+        ids = {id(o) for o in objects}
+        if self.selected_object is not None and id(self.selected_object) in ids:
+            self.select_object(None)
+
+        for o in objects:
+            if self._tx is not None:
+                self._tx.remove(o)
+            if isinstance(o, Wall):
+                self.dimensions.invalidate(o)
+                self._touch(*self.wall_outlines.remove(o))
+            elif isinstance(o, (Door, Window)):
+                self.dimensions.invalidate(self.hosts.wall_of(o))
+                self.hosts.release(o)
+            self.spatial.remove(o)
+            self._track_removed(o)
+            self._touch(o)
+        self.hosts.forget(o for o in objects if isinstance(o, Wall))
+
+        if len(objects) == 1:
+            # cazul obisnuit, un singur obiect: fara trecere prin toate listele
+            self.display_list.remove(objects[0])
+            self._items_of(objects[0]).remove(objects[0])
+        else:
+            self.display_list.discard(objects)
+            for items in (self._walls, self._doors, self._windows, self._furniture):
+                items[:] = [o for o in items if id(o) not in ids]
+
+    def get_all_objects(self) -> ObjectsView:
+        """Vedere peste toate obiectele, pe tipuri (nu copiaza listele)."""
+        return ObjectsView(self._walls, self._doors, self._windows, self._furniture)
 
     def select_object(self, obj):
+        # culoarea de selectie schimba desenul ambelor obiecte
+        self._touch(self.selected_object, obj)
         if self.selected_object:
             self.selected_object.selected = False
         self.selected_object = obj
@@ -263,30 +569,430 @@ class ProjectManager:
             obj.selected = True
 
     def find_object_at(self, x, y):
-        for obj in reversed(self.get_all_objects()):
-            if obj.contains_point(x, y):
-                return obj
-        return None
-
+        # candidatii vin din grila; castiga cel desenat deasupra, iar straturile
+        # ascunse sau blocate nu pot fi selectate
+        best = None
+        order = self.display_list.order
+        for obj, _ in self.spatial.query(x - 1e-6, y - 1e-6, 2e-6, 2e-6):
+            if not obj.contains_point(x, y) or not self.is_layer_selectable(obj.layer):
+                continue
+            if best is None or order(obj) > order(best):
+                best = obj
+        return best
+
+    @traced("ProjectManager.translate_selected", "project")
     def translate_selected(self, dx, dy):
         if not self.selected_object:
             return
 
-        old_state = copy.deepcopy(self.selected_object)
+        with self.transaction():
+            self._translate(self.selected_object, dx, dy)
+
+    def _translate(self, obj, dx, dy):
+        if self.hosts.wall_of(obj) is not None:
+            self._slide_opening(obj, dx, dy)
+            return
+
+        # atributele sunt scalare, o copie superficiala ajunge pentru rollback
+        old_state = dict(obj.__dict__)
 
-        Transform.translate(self.selected_object, dx, dy)
+        self._record(obj)
+        Transform.translate(obj, dx, dy)
 
-        if not self.collision_detector.can_move_object(
-                self.selected_object,
-                self.get_all_objects()
-        ):
+        hosted = self.hosts.hosted(obj) if isinstance(obj, Wall) else ()
+        if not self.collision_detector.can_move_object(obj, self._nearby(obj), hosted):
             # rollback
-            self.selected_object.__dict__.update(old_state.__dict__)
+            obj.__dict__.update(old_state)
             return
 
-        self._sync_to_project()
+        self.spatial.update(obj)
+        self._changed(obj)
+        if isinstance(obj, Wall):
+            self.dimensions.invalidate(obj)
+            self._touch(*self.wall_outlines.update(obj))
+        if hosted:
+            self._follow_wall(obj)
+
+    def _follow_wall(self, wall):
+        self._record(*self.hosts.hosted(wall))
+        self.hosts.follow_wall(wall)
+        for o in self.hosts.hosted(wall):
+            self.spatial.update(o)
+            self._changed(o)
+
+    def _slide_opening(self, opening, dx, dy):
+        # o deschidere gazduita se muta doar de-a lungul peretelui
+        wall = self.hosts.wall_of(opening)
+        ux, uy, length, _ = wall_frame(wall)
+        offset = opening.offset + dx * ux + dy * uy
+        half = opening.width / 2
+
+        if not self.collision_detector.can_add_hosted_opening(
+                self.hosts.index_for(wall), offset - half, offset + half, length, ignore=opening):
+            return
 
+        self._record(opening)
+        self.hosts.slide(opening, offset)
+        self.spatial.update(opening)
+        self.dimensions.invalidate(wall)
+        self._changed(opening)
+
+    @traced("ProjectManager.rotate_selected", "project")
+    def rotate_selected(self, angle):
+        """Roteste obiectul selectat cu `angle` grade (incremental)."""
+        obj = self.selected_object
+        if not obj or not angle or self.hosts.wall_of(obj) is not None:
+            # unghiul unei deschideri e dat de peretele ei
+            return
+
+        with self.transaction():
+            self._record(obj)
+            if isinstance(obj, Wall):
+                obj.rotate_about_center(angle)
+                self._follow_wall(obj)
+                self.dimensions.invalidate(obj)
+                self._touch(*self.wall_outlines.update(obj))
+            else:
+                obj.set_rotation(obj.rotation + angle)
+
+            self.spatial.update(obj)
+            self._changed(obj)
+
+    # ------------------------------- STRATURI ------------------------------
+
+    def layer_names(self) -> List[Optional[str]]:
+        """Straturile in ordinea de desenare; None = obiectele din straturi necunoscute."""
+        return list(self.current_project.layers if self.current_project else ()) + [None]
+
+    def layer_objects(self, name, view=None) -> List[ArchitecturalObject]:
+        """Obiectele stratului in ordinea de desenare; cu `view` (x, y, w, h) doar cele din zona."""
+        if view is None:
+            return self.display_list.layer(name)
+        found = self.spatial.query(*view)
+        return self.display_list.sorted_in_layer(name, (o for o, _ in found))
+
+    def _touch(self, *objs):
+        # orice schimbare vizibila a unui obiect ii poate schimba si cantitatile
+        self.takeoff.invalidate(*objs)
+        for o in objs:
+            if o is not None:
+                self.layer_revision[o.layer] = next(_revisions)
+
+    def _changed(self, *objs):
+        # un obiect mutat sau rotit: stratul lui se redeseneaza, iar tile-ul lui se rescrie
+        self._touch(*objs)
+        if self.tiles:
+            for o in objs:
+                self.tiles.changed(o)
+
+    def _touch_all(self):
+        rev = next(_revisions)
+        for name in list(self.layer_revision) + self.layer_names()[:-1]:
+            self.layer_revision[name] = rev
+
+    def _layer_flag(self, name, flag, default):
+        if not self.current_project:
+            return default
+        return self.current_project.layers.get(name, {}).get(flag, default)
 
+    def is_layer_visible(self, name) -> bool:
+        return self._layer_flag(name, "visible", True)
+
+    def is_layer_locked(self, name) -> bool:
+        return self._layer_flag(name, "locked", False)
+
+    def is_layer_selectable(self, name) -> bool:
+        return self.is_layer_visible(name) and not self.is_layer_locked(name)
+
+    def set_layer_visible(self, name, visible: bool):
+        self._set_layer_flag(name, "visible", visible)
+
+    def set_layer_locked(self, name, locked: bool):
+        self._set_layer_flag(name, "locked", locked)
+
+    def _set_layer_flag(self, name, flag, value):
+        if not self.current_project or name not in self.current_project.layers:
+            return
+        self.current_project.layers[name][flag] = value
+        # un obiect ascuns sau blocat nu mai poate ramane selectat
+        sel = self.selected_object
+        if sel is not None and sel.layer == name and not self.is_layer_selectable(name):
+            self.select_object(None)
+
+    def _nearby(self, obj, types=ArchitecturalObject, index=None):
+        """Obiectele care pot intra in coliziune cu obj: vecinii din grila, din straturile relevante."""
+        x, y, w, h = obstacle_box(obj)
+        layers = COLLISION_LAYERS.get(obj.layer)
+        index = self.spatial if index is None else index
+        # marginea prinde si peretii de grosime zero (dreptunghi degenerat)
+        return [o for o, _ in index.query(x - 1, y - 1, w + 2, h + 2)
+                if isinstance(o, types) and (layers is None or o.layer in layers)]
+
+    # ---------------------------- SPATIU LIBER ----------------------------
+
+    def _ignored(self, ignore):
+        if ignore is None:
+            return ()
+        return {ignore} if isinstance(ignore, ArchitecturalObject) else set(ignore)
+
+    def free_regions(self, x, y, w, h, ignore=None):
+        """Zona libera din dreptunghiul dat, ca dreptunghiuri disjuncte."""
+        return FreeSpace.free_regions(self.spatial, (x, y, w, h), self._ignored(ignore))
+
+    def maximal_empty_rectangles(self, x, y, w, h, ignore=None):
+        return FreeSpace.maximal_empty_rectangles(self.spatial, (x, y, w, h), self._ignored(ignore))
+
+    @traced("ProjectManager.nearest_free_position", "query")
+    def nearest_free_position(self, w, h, px, py, rotation=0.0, ignore=None):
+        """Coltul (x, y) cel mai apropiat de (px, py) unde incape un obiect w x h rotit.
+
+        (px, py) e pozitia dorita pentru coltul obiectului, ca la add_furniture.
+        """
+        center = FreeSpace.nearest_free_position(
+            self.spatial, w, h, px + w / 2, py + h / 2, rotation, self._ignored(ignore)
+        )
+        if center is None:
+            return None
+        return center[0] - w / 2, center[1] - h / 2
+
+    # ----------------------------- PROXIMITATE ----------------------------
+
+    def nearest_objects(self, px, py, k=1, ignore=None, max_radius=math.inf):
+        """Cei mai apropiati k vecini ai punctului: [(distanta, obiect, (qx, qy))]."""
+        return Proximity.nearest_objects(self.spatial, px, py, k, self._ignored(ignore), max_radius)
+
+    def distance_to_nearest(self, px, py, ignore=None):
+        """(distanta, obiect, (qx, qy)) pana la cea mai apropiata geometrie, sau None."""
+        found = self.nearest_objects(px, py, 1, ignore)
+        return found[0] if found else None
+
+    def snap_point(self, px, py, radius, ignore=None):
+        return Proximity.snap_point(self.spatial, px, py, radius, self._ignored(ignore))
+
+    def clearances(self, obj=None, k=4, radius=300):
+        """Distantele libere dintre obiect (implicit cel selectat) si vecinii lui."""
+        obj = obj or self.selected_object
+        if obj is None:
+            return []
+        return Proximity.clearances(self.spatial, obj, k, radius)
+
+    # -------------------------------- COTE --------------------------------
+
+    def visible_dimensions(self, view=None, min_length=0.0, margin=80):
+        """Cotele peretilor din zona (x, y, w, h), lista per perete, plus gabaritul.
+
+        Fara `view` sunt returnate cotele tuturor peretilor; peretii mai scurti
+        de `min_length` sunt sariti. Doar peretii fara cote in cache (noi sau
+        modificati) sunt recalculati.
+        """
+        cs = self.coordinate_system
+        cache = self.dimensions
+        cache.set_units((cs.grid_size, cs.scale))
+        extents = cache.extents(self._walls, self.format_length)
+        if cache.longest(self._walls) < min_length:
+            return [extents]
+
+        if view is None:
+            walls = self._walls
+        else:
+            x0, y0 = view[0] - margin, view[1] - margin
+            x1, y1 = x0 + view[2] + 2 * margin, y0 + view[3] + 2 * margin
+            if (x1 - x0) * (y1 - y0) > len(self._walls) * self.spatial.cell ** 2:
+                # zona mare: mai ieftin decat celulele grilei e sa filtram peretii direct
+                box = self.spatial.box_of
+                walls = [w for w in self._walls
+                         for bx, by, bw, bh in (box(w),) if bx < x1 and x0 < bx + bw and by < y1 and y0 < by + bh]
+            else:
+                walls = [o for o, _ in self.spatial.query(x0, y0, x1 - x0, y1 - y0) if isinstance(o, Wall)]
+
+        result = [cache.for_wall(w, self.hosts.hosted, self.format_length)
+                  for w in walls if w.get_length() >= min_length]
+        result.append(extents)
+        return result
+
+    def format_length(self, pixels):
+        return self.coordinate_system.format_distance(
+            self.coordinate_system.pixels_to_real_units(pixels)
+        )
+
+
+
+    # -------------------------------- FUNDAL -------------------------------
+
+    @property
+    def underlay(self) -> Optional[Dict]:
+        return self.current_project.underlay if self.current_project else None
+
+    def set_underlay(self, path, cm_per_pixel, x=0.0, y=0.0, opacity=0.5):
+        """Pune o imagine sub plan; cm_per_pixel e rezolutia ei (cm reali per pixel de imagine)."""
+        if not self.current_project:
+            return
+        self.current_project.underlay = {
+            "path": os.path.abspath(path),
+            "cm_per_pixel": cm_per_pixel,
+            "x": x,
+            "y": y,
+            "opacity": opacity,
+            "visible": True,
+        }
+
+    def clear_underlay(self):
+        if self.current_project:
+            self.current_project.underlay = None
+
+    def set_underlay_visible(self, visible: bool):
+        if self.underlay:
+            self.underlay["visible"] = visible
+
+    def underlay_scale(self) -> float:
+        """Pixeli de plan per pixel de imagine, prin sistemul de coordonate."""
+        u = self.underlay
+        return self.coordinate_system.real_units_to_pixels(u["cm_per_pixel"]) if u else 0.0
+
+    # ------------------------------- TILE-URI ------------------------------
+
+    @traced("ProjectManager.open_chunked", "project")
+    def open_chunked(self, filepath, budget=DEFAULT_BUDGET):
+        """Deschide un proiect fragmentat; obiectele sunt incarcate de ensure_view."""
+        try:
+            chunked = ChunkedFile(filepath)
+            project = chunked.project()
+        except Exception as e:
+            print(f"Eroare la încărcarea proiectului: {e}")
+            return False
+
+        self.current_project = project
+        self._clear_cache()
+        self.display_list.set_layer_order(project.layers)
+        self.tiles = TileResidency(chunked, budget)
+        return True
+
+    @traced("ProjectManager.ensure_view", "project")
+    def ensure_view(self, view, time_budget=0.05) -> bool:
+        """Aduce in memorie tile-urile din zona (x, y, w, h), cele din centru primele.
+
+        Tile-urile vechi din afara vederii sunt descarcate cand rezidenta ar
+        depasi bugetul. Returneaza True daca s-a oprit din cauza timpului si
+        mai sunt tile-uri de incarcat (vederea trebuie redesenata din nou).
+        """
+        tiles = self.tiles
+        if tiles is None:
+            return False
+
+        wanted = tiles.tiles_in(*view)
+        keep = set(wanted)
+        if self.selected_object is not None:
+            keep.add(tiles.tile_of(self.selected_object))
+        missing = []
+        for key in wanted:
+            if key in tiles.resident:
+                tiles.touch(key)
+            else:
+                missing.append(key)
+        if not missing:
+            return False
+
+        # loc pentru tot ce lipseste, eliberat dintr-o singura trecere
+        incoming = sum(tiles.count_of(k) for k in missing)
+        if self._tx is None:
+            # in timpul unui gest obiectele atinse trebuie sa ramana in memorie
+            self._unload_tiles(tiles.victims(keep, incoming))
+
+        start = time.perf_counter()
+        loaded = False
+        pending = False
+        for key in missing:
+            if tiles.count + tiles.count_of(key) > tiles.budget:
+                # vederea cere mai mult decat bugetul: restul ramane nedesenat
+                break
+            if loaded and time.perf_counter() - start > time_budget:
+                pending = True
+                break
+            self._load_tile(key)
+            loaded = True
+
+        if loaded:
+            self.dimensions.invalidate(None)
+            self._touch_all()
+        return pending
+
+    def _load_tile(self, key):
+        data = self.tiles.file.read_tile(key)
+        walls, doors, windows, furniture = (
+            [cls.from_dict(d) for d in data.get(kind, ())] for kind, cls in KINDS
+        )
+        objects = walls + doors + windows + furniture
+
+        self._walls += walls
+        self._doors += doors
+        self._windows += windows
+        self._furniture += furniture
+        self.display_list.extend(objects)
+        self.hosts.extend(walls, doors + windows)
+        for o in objects:
+            self.spatial.insert(o)
+        for w in walls:
+            self.wall_outlines.add(w)
+        self.takeoff.invalidate(*objects)
+        self.tiles.loaded(key, objects)
+
+    def _unload_tiles(self, keys):
+        if not keys:
+            return
+        # tile-urile modificate sunt scrise inainte sa dispara din memorie
+        self.tiles.flush(keys)
+        gone = []
+        for key in keys:
+            gone += self.tiles.unloaded(key)
+        ids = {id(o) for o in gone}
+        # pasii de undo pot referi obiecte descarcate; istoricul porneste de la zero
+        self._reset_history()
+
+        for items in (self._walls, self._doors, self._windows, self._furniture):
+            items[:] = [o for o in items if id(o) not in ids]
+        walls = [o for o in gone if isinstance(o, Wall)]
+        self.display_list.discard(gone)
+        self.hosts.forget(walls)
+        for o in gone:
+            self.spatial.remove(o)
+        for w in walls:
+            self.dimensions.invalidate(w)
+            self.wall_outlines.remove(w)
+        self.takeoff.invalidate(*gone)
+        self._touch_all()
+
+    def _track_added(self, obj, host=None):
+        tiles = self.tiles
+        if tiles is None:
+            return
+        key = tiles.target(obj, host)
+        if key not in tiles.resident and tiles.count_of(key):
+            # tile-ul e rescris la salvare, deci continutul lui trebuie sa fie in memorie
+            self._load_tile(key)
+        tiles.add(obj, key)
+
+    def _track_removed(self, obj):
+        if self.tiles:
+            self.tiles.remove(obj)
+
+    def flush_tiles(self) -> int:
+        """Scrie tile-urile modificate in fisier; returneaza cate au fost scrise."""
+        return self.tiles.flush() if self.tiles else 0
+
+    def _save_chunked(self, filepath=None):
+        tiles = self.tiles
+        try:
+            if filepath and os.path.abspath(filepath) != os.path.abspath(tiles.path):
+                # "salveaza ca": copia primeste modificarile, originalul ramane neatins
+                shutil.copyfile(tiles.path, filepath)
+                tiles.file = ChunkedFile(filepath)
+                self.current_project.filepath = filepath
+            self.current_project.modified_date = datetime.now().isoformat()
+            tiles.flush(project=self.current_project)
+            return True
+        except Exception as e:
+            print(f"Eroare la salvarea proiectului: {e}")
+            return False
 
     def get_statistics(self):
         if not self.current_project:
@@ -297,7 +1003,7 @@ class ProjectManager:
 
         return {
             "project_name": self.current_project.name,
-            "total_objects": len(self.get_all_objects()),
+            "total_objects": self.tiles.total() if self.tiles else len(self.display_list),
             "walls_count": len(self._walls),
             "doors_count": len(self._doors),
             "windows_count": len(self._windows),
@@ -309,3 +1015,31 @@ class ProjectManager:
             "snap_to_grid": self.current_project.snap_to_grid,
             "grid_visible": self.current_project.grid_visible
         }
+
+    # ---------------------------- ANTEMASURATOARE ---------------------------
+
+    @traced("ProjectManager.quantity_takeoff", "project")
+    def quantity_takeoff(self) -> Dict:
+        """Cantitatile planului (vezi Takeoff); doar obiectele modificate sunt recalculate."""
+        if not self.current_project:
+            return {}
+        self.takeoff.refresh(self.get_all_objects(), self.display_list,
+                             self.hosts.wall_of, self.hosts.hosted)
+        return self.takeoff.report(
+            self.coordinate_system.pixels_to_real_units(1.0), self.current_project.heights
+        )
+
+    def export_takeoff(self, filepath) -> bool:
+        """Scrie tabelele de cantitati ca JSON sau CSV, dupa extensia fisierului."""
+        report = self.quantity_takeoff()
+        if not report:
+            return False
+        try:
+            if filepath.lower().endswith(".json"):
+                write_json(report, filepath)
+            else:
+                write_csv(report, filepath)
+            return True
+        except Exception as e:
+            print(f"Eroare la exportul cantitatilor: {e}")
+            return False
@@ -0,0 +1,222 @@
+"""Cereri de proximitate peste SpatialHash: cei mai apropiati k vecini,
+distanta pana la geometrie, snap pe muchii/capete si distantele libere
+dintre un obiect si vecinii lui."""
+import math
+from typing import List, Optional, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall
+from .SpatialIndex import SpatialHash
+
+EPS = 1e-6
+Point = Tuple[float, float]
+
+
+# ============================== GEOMETRIE ==============================
+
+def point_segment(px: float, py: float, ax: float, ay: float,
+                  bx: float, by: float) -> Tuple[float, float, float]:
+    """(distanta, qx, qy): cel mai apropiat punct q de pe segmentul ab."""
+    dx, dy = bx - ax, by - ay
+    ll = dx * dx + dy * dy
+    t = 0.0 if ll < EPS else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / ll))
+    qx, qy = ax + t * dx, ay + t * dy
+    return math.hypot(px - qx, py - qy), qx, qy
+
+
+def point_wall(px: float, py: float, wall: Wall) -> Tuple[float, float, float]:
+    """Distanta pana la fata peretelui (axa minus jumatate din grosime)."""
+    d, qx, qy = point_segment(px, py, wall.x1, wall.y1, wall.x2, wall.y2)
+    half = wall.thickness / 2
+    if d <= half:
+        return 0.0, px, py
+    # punctul de pe fata peretelui, pe directia spre p
+    k = half / d
+    return d - half, qx + (px - qx) * k, qy + (py - qy) * k
+
+
+def point_box(px: float, py: float, obj: ArchitecturalObject) -> Tuple[float, float, float]:
+    """Distanta pana la dreptunghiul rotit al obiectului (0 in interior)."""
+    cx, cy = obj.get_center()
+    hw, hh = obj.width / 2, obj.height / 2
+    rx, ry = px - cx, py - cy
+    if not obj.rotation:
+        lx, ly = max(-hw, min(hw, rx)), max(-hh, min(hh, ry))
+        return math.hypot(rx - lx, ry - ly), cx + lx, cy + ly
+
+    a = math.radians(obj.rotation)
+    c, s = math.cos(a), math.sin(a)
+    # in sistemul local al obiectului dreptunghiul e aliniat la axe
+    ux, uy = rx * c + ry * s, -rx * s + ry * c
+    lx, ly = max(-hw, min(hw, ux)), max(-hh, min(hh, uy))
+    return math.hypot(ux - lx, uy - ly), cx + lx * c - ly * s, cy + lx * s + ly * c
+
+
+def distance_to(obj: ArchitecturalObject, px: float, py: float) -> Tuple[float, float, float]:
+    if isinstance(obj, Wall):
+        return point_wall(px, py, obj)
+    return point_box(px, py, obj)
+
+
+def outline(obj: ArchitecturalObject) -> List[Point]:
+    """Colturile conturului real, in ordine (peretii: dreptunghiul gros al axei)."""
+    if isinstance(obj, Wall):
+        dx, dy = obj.x2 - obj.x1, obj.y2 - obj.y1
+        length = math.hypot(dx, dy)
+        half = obj.thickness / 2
+        if length < EPS:
+            nx, ny, ex, ey = 0.0, half, half, 0.0
+        else:
+            nx, ny = -dy / length * half, dx / length * half
+            ex = ey = 0.0
+        return [(obj.x1 - ex + nx, obj.y1 - ey + ny), (obj.x2 + ex + nx, obj.y2 + ey + ny),
+                (obj.x2 + ex - nx, obj.y2 + ey - ny), (obj.x1 - ex - nx, obj.y1 - ey - ny)]
+
+    cx, cy = obj.get_center()
+    hw, hh = obj.width / 2, obj.height / 2
+    a = math.radians(obj.rotation)
+    c, s = math.cos(a), math.sin(a)
+    return [(cx + lx * c - ly * s, cy + lx * s + ly * c)
+            for lx, ly in ((-hw, -hh), (hw, -hh), (hw, hh), (-hw, hh))]
+
+
+def _edges(poly: List[Point]):
+    return zip(poly, poly[1:] + poly[:1])
+
+
+def _inside(px: float, py: float, poly: List[Point]) -> bool:
+    # poligon convex: punctul e de aceeasi parte a tuturor laturilor
+    sign = 0
+    for (ax, ay), (bx, by) in _edges(poly):
+        cross = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+        if abs(cross) < EPS:
+            continue
+        if sign == 0:
+            sign = 1 if cross > 0 else -1
+        elif (cross > 0) != (sign > 0):
+            return False
+    return True
+
+
+def _segments_cross(a: Point, b: Point, c: Point, d: Point) -> bool:
+    def orient(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    d1, d2 = orient(c, d, a), orient(c, d, b)
+    d3, d4 = orient(a, b, c), orient(a, b, d)
+    return d1 * d2 < 0 and d3 * d4 < 0
+
+
+def object_distance(a: ArchitecturalObject, b: ArchitecturalObject) -> Tuple[float, Point, Point]:
+    """(distanta, punct pe a, punct pe b) intre contururile a doua obiecte; 0 daca se ating."""
+    pa, pb = outline(a), outline(b)
+
+    best = (math.inf, pa[0], pb[0])
+    for poly, other, swap in ((pa, pb, False), (pb, pa, True)):
+        for vx, vy in poly:
+            for (ax, ay), (bx, by) in _edges(other):
+                d, qx, qy = point_segment(vx, vy, ax, ay, bx, by)
+                if d < best[0]:
+                    best = (d, (qx, qy), (vx, vy)) if swap else (d, (vx, vy), (qx, qy))
+
+    if best[0] > EPS:
+        # suprapunere fara varfuri pe contur: un varf in interior sau laturi care se taie
+        if _inside(*pb[0], pa) or _inside(*pa[0], pb) or any(
+                _segments_cross(p, q, r, s) for p, q in _edges(pa) for r, s in _edges(pb)):
+            return 0.0, best[1], best[1]
+    return best
+
+
+# =============================== CERERI ================================
+
+def nearest_objects(index: SpatialHash, px: float, py: float, k: int = 1, ignore=(),
+                    max_radius: float = math.inf):
+    """Cei mai apropiati k vecini: [(distanta, obiect, (qx, qy))], crescator.
+
+    Fereastra patrata din jurul punctului se dubleaza pana contine k obiecte
+    la distanta cel mult egala cu raza ei; orice obiect mai apropiat atinge
+    cercul de raza r, deci dreptunghiul lui apare sigur in fereastra.
+    """
+    total = len(index)
+    r = index.cell / 2
+    while True:
+        found = index.query(px - r, py - r, 2 * r, 2 * r)
+        hits = []
+        for obj, _ in found:
+            if obj in ignore:
+                continue
+            d, qx, qy = distance_to(obj, px, py)
+            hits.append((d, obj, (qx, qy)))
+
+        hits.sort(key=lambda h: h[0])
+        inside = [h for h in hits if h[0] <= r]
+        if len(inside) >= k or r >= max_radius:
+            return [h for h in inside if h[0] <= max_radius][:k]
+        if len(found) >= total:
+            # fereastra contine deja tot planul
+            return [h for h in hits if h[0] <= max_radius][:k]
+        r *= 2
+
+
+def snap_point(index: SpatialHash, px: float, py: float, radius: float,
+               ignore=()) -> Optional[Tuple[float, float, str]]:
+    """Punctul de snap din raza data: (x, y, "endpoint" | "edge") sau None.
+
+    Capetele (colturile conturului si capetele axei peretilor) au prioritate
+    fata de cel mai apropiat punct de pe o muchie.
+    """
+    best_end = best_edge = None
+    for obj, _ in index.query(px - radius, py - radius, 2 * radius, 2 * radius):
+        if obj in ignore:
+            continue
+        poly = outline(obj)
+        ends = list(poly)
+        if isinstance(obj, Wall):
+            ends += [(obj.x1, obj.y1), (obj.x2, obj.y2)]
+
+        for ex, ey in ends:
+            d = math.hypot(ex - px, ey - py)
+            if d <= radius and (best_end is None or d < best_end[0]):
+                best_end = (d, ex, ey)
+        for (ax, ay), (bx, by) in _edges(poly):
+            d, qx, qy = point_segment(px, py, ax, ay, bx, by)
+            if d <= radius and (best_edge is None or d < best_edge[0]):
+                best_edge = (d, qx, qy)
+
+    if best_end:
+        return best_end[1], best_end[2], "endpoint"
+    if best_edge:
+        return best_edge[1], best_edge[2], "edge"
+    return None
+
+
+def clearances(index: SpatialHash, obj: ArchitecturalObject, k: int = 4,
+               radius: float = 300, ignore=()):
+    """Distantele libere pana la cei mai apropiati k vecini din raza data.
+
+    Returneaza [(distanta, vecin, punct pe obj, punct pe vecin)]; vecinii
+    care ating obiectul (de exemplu usa pe peretele ei) nu sunt inclusi.
+    Candidatii sunt parcursi dupa distanta dintre dreptunghiuri, asa ca
+    geometria exacta se calculeaza doar pentru cei care mai pot conta.
+    """
+    x, y, w, h = index.box_of(obj) if obj in index else (obj.x, obj.y, obj.width, obj.height)
+    candidates = []
+    for other, (bx, by, bw, bh) in index.query(x - radius, y - radius, w + 2 * radius, h + 2 * radius):
+        if other is obj or other in ignore:
+            continue
+        # distanta dintre dreptunghiuri e o margine inferioara pentru cea reala
+        gx = max(bx - (x + w), x - (bx + bw), 0.0)
+        gy = max(by - (y + h), y - (by + bh), 0.0)
+        candidates.append((math.hypot(gx, gy), id(other), other))
+    candidates.sort()
+
+    result = []
+    for bound, _, other in candidates:
+        if bound > radius or (len(result) >= k and bound >= result[-1][0]):
+            break
+        d, pa, pb = object_distance(obj, other)
+        # o fereastra din perete da aceeasi cota ca peretele; o pastram o data
+        if EPS < d <= radius and not any(
+                abs(d - c[0]) < EPS and math.dist(pb, c[3]) < EPS for c in result):
+            result.append((d, other, pa, pb))
+            result.sort(key=lambda c: c[0])
+            del result[k:]
+    return result
@@ -0,0 +1,284 @@
+"""Trasarea peretilor dintr-un plan scanat (PNG/JPG).
+
+Imaginea e binarizata (prag Otsu), apoi peretii sunt cautati ca benzi de
+segmente negre lungi: pe fiecare rand segmentele orizontale, pe fiecare
+coloana cele verticale. Segmentele aproape identice de pe randuri vecine
+formeaza o banda; inaltimea benzii e grosimea peretelui. Extragerea
+segmentelor e vectorizata cu NumPy si, pentru scanari mari, impartita pe
+fasii intr-un pool de procese; gruparea in benzi lucreaza doar pe segmente.
+"""
+import multiprocessing
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# scanarile mai mici de atat sunt procesate in procesul curent
+POOL_MIN_PIXELS = 4_000_000
+# inaltimea unei fasii trimise unui proces (multiplu de 8, vezi packbits)
+STRIP = 1024
+# limita anti-"decompression bomb" pentru scanari (Pillow refuza peste dublul ei)
+MAX_SCAN_PIXELS = 1_000_000_000
+
+_pillow_limit = threading.Lock()
+
+Segment = Tuple[float, float, float, float, float]  # x1, y1, x2, y2, grosime
+
+
+class TraceSettings:
+    """Parametrii trasarii, in pixeli de imagine (in afara de scale)."""
+
+    def __init__(self, min_length: int = 40, min_thickness: int = 2, max_thickness: int = 60,
+                 threshold: Optional[int] = None, tolerance: int = 2, scale: float = 1.0):
+        self.min_length = min_length
+        self.min_thickness = min_thickness
+        self.max_thickness = max_thickness
+        # None = prag Otsu calculat din histograma
+        self.threshold = threshold
+        # cat pot varia capetele segmentelor de la un rand la altul in aceeasi banda
+        self.tolerance = tolerance
+        # pixeli de plan per pixel de imagine
+        self.scale = scale
+
+
+# ----------------------------- BINARIZARE ------------------------------
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    w0 = np.cumsum(hist)
+    w1 = w0[-1] - w0
+    m0 = np.cumsum(hist * levels)
+    mean0 = m0 / np.maximum(w0, 1)
+    mean1 = (m0[-1] - m0) / np.maximum(w1, 1)
+    between = w0 * w1 * (mean0 - mean1) ** 2
+    return int(np.argmax(between))
+
+
+@contextmanager
+def open_scan(path: str):
+    """Image.open cu limita de pixeli ridicata la MAX_SCAN_PIXELS doar pentru acest fisier.
+
+    Limita e globala in Pillow; e verificata la deschidere, deci e restaurata
+    imediat dupa, sub lacat, ca alte fire sa nu o vada schimbata.
+    """
+    from PIL import Image
+
+    with _pillow_limit:
+        old = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = MAX_SCAN_PIXELS
+        try:
+            img = Image.open(path)
+        finally:
+            Image.MAX_IMAGE_PIXELS = old
+    with img:
+        yield img
+
+
+def load_mask(path: str, threshold: Optional[int] = None) -> np.ndarray:
+    """Imaginea ca matrice booleana: True = pixel inchis (perete)."""
+    # scanarile mari depasesc limita implicita a Pillow
+    with open_scan(path) as img:
+        gray = np.asarray(img.convert("L"))
+    if threshold is None:
+        threshold = otsu_threshold(gray)
+    return gray <= threshold
+
+
+# ------------------------------ SEGMENTE -------------------------------
+
+def row_runs(mask: np.ndarray, min_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Segmentele de pixeli True de pe fiecare rand: (rand, inceput, sfarsit exclusiv)."""
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    d = np.diff(padded, axis=1)
+    # inceputurile si sfarsiturile apar in aceeasi ordine (rand, coloana), deci se imperecheaza
+    starts = np.flatnonzero(d == 1)
+    ends = np.flatnonzero(d == -1)
+    keep = ends - starts >= min_length
+    starts, ends = starts[keep], ends[keep]
+    return starts // (w + 1), starts % (w + 1), ends % (w + 1)
+
+
+def _strip_task(task):
+    # in procesele din pool: fasia e citita din masca impachetata, mapata din fisier
+    path, axis, start, stop, width, min_length = task
+    packed = np.load(path, mmap_mode="r")
+    if axis == 0:
+        mask = np.unpackbits(packed[start:stop], axis=1, count=width).astype(bool)
+    else:
+        mask = np.unpackbits(packed[:, start // 8:(stop + 7) // 8], axis=1)[:, :stop - start].T.astype(bool)
+    r, a, b = row_runs(mask, min_length)
+    return r + start, a, b
+
+
+def all_runs(mask: np.ndarray, axis: int, min_length: int, jobs: int = 1, packed_path=None,
+             progress: Optional[Callable[[float], None]] = None):
+    """Segmentele pe randuri (axis=0) sau pe coloane (axis=1), fasie cu fasie."""
+    h, w = mask.shape if axis == 0 else mask.shape[::-1]
+    bounds = [(s, min(s + STRIP, h)) for s in range(0, h, STRIP)]
+    parts = []
+    if packed_path is None:
+        for i, (s, e) in enumerate(bounds):
+            strip = mask[s:e] if axis == 0 else mask[:, s:e].T
+            r, a, b = row_runs(strip, min_length)
+            parts.append((r + s, a, b))
+            if progress:
+                progress((i + 1) / len(bounds))
+    else:
+        tasks = [(packed_path, axis, s, e, w, min_length) for s, e in bounds]
+        # spawn, nu fork: procesul apelant poate fi aplicatia Qt, cu fire deja pornite
+        # (AssetCache, UnderlayCache); copiii primesc doar calea matricei impachetate
+        with multiprocessing.get_context("spawn").Pool(processes=jobs) as pool:
+            for i, part in enumerate(pool.imap_unordered(_strip_task, tasks)):
+                parts.append(part)
+                if progress:
+                    progress((i + 1) / len(bounds))
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    r, a, b = (np.concatenate(p) for p in zip(*parts))
+    order = np.lexsort((a, r))
+    return r[order], a[order], b[order]
+
+
+# ------------------------------- BENZI ---------------------------------
+
+def bands(r: np.ndarray, a: np.ndarray, b: np.ndarray, width: int, settings: TraceSettings):
+    """Grupeaza segmentele in benzi; intoarce (rand_min, rand_max, inceput, sfarsit) per banda."""
+    if not len(r):
+        return np.zeros((0, 4))
+    tol = settings.tolerance
+    stride = width + 2 * tol + 1
+    key = r * stride + a
+    # predecesorul unui segment: pe randul anterior, cu capete apropiate
+    j = np.searchsorted(key, (r - 1) * stride + a - tol)
+    j = np.minimum(j, len(r) - 1)
+    linked = (r[j] == r - 1) & (np.abs(a[j] - a) <= tol) & (np.abs(b[j] - b) <= tol)
+    label = np.where(linked, j, np.arange(len(r)))
+    # salt de pointeri: fiecare segment ajunge la primul segment din banda lui
+    while True:
+        nxt = label[label]
+        if np.array_equal(nxt, label):
+            break
+        label = nxt
+
+    order = np.argsort(label, kind="stable")
+    label, r, a, b = label[order], r[order], a[order], b[order]
+    first = np.flatnonzero(np.r_[True, label[1:] != label[:-1]])
+    counts = np.diff(np.r_[first, len(label)])
+    r0 = np.minimum.reduceat(r, first)
+    r1 = np.maximum.reduceat(r, first)
+    x0 = np.add.reduceat(a, first) / counts
+    x1 = np.add.reduceat(b, first) / counts
+
+    thickness = r1 - r0 + 1
+    keep = ((thickness >= settings.min_thickness) & (thickness <= settings.max_thickness)
+            & (x1 - x0 >= np.maximum(settings.min_length, 2 * thickness)))
+    return np.column_stack([r0, r1, x0, x1])[keep]
+
+
+def band_segments(found: np.ndarray, vertical: bool) -> List[Segment]:
+    """Axa fiecarei benzi, pe toata lungimea ei (capetele sunt ajustate la intersectii)."""
+    segments = []
+    for r0, r1, x0, x1 in found.tolist():
+        c = (r0 + r1 + 1) / 2
+        t = r1 - r0 + 1
+        segments.append((c, x0, c, x1, t) if vertical else (x0, c, x1, c, t))
+    return segments
+
+
+# ----------------------------- INTERSECTII -----------------------------
+
+def split_at_crossings(horizontal: List[Segment], vertical: List[Segment],
+                       tol: float) -> List[Segment]:
+    """Imparte peretii la intersectii si jonctiuni in T, ca peretii sa se atinga doar la capete.
+
+    Un capat aflat la cel mult tol de axa unui perete perpendicular e adus exact pe ea:
+    la colturi, banda unui perete acopera si grosimea celuilalt, iar axele trebuie sa
+    se intalneasca intr-un punct.
+    """
+    def cut(walls, others, along):
+        # along = 0: pereti orizontali (variaza x), taiati de cei verticali
+        if not others:
+            return walls
+        pos = np.array([o[0] if along == 0 else o[1] for o in others])
+        lo = np.array([min(o[1], o[3]) if along == 0 else min(o[0], o[2]) for o in others])
+        hi = np.array([max(o[1], o[3]) if along == 0 else max(o[0], o[2]) for o in others])
+        order = np.argsort(pos)
+        pos, lo, hi = pos[order], lo[order], hi[order]
+        result = []
+        for x1, y1, x2, y2, t in walls:
+            c = y1 if along == 0 else x1
+            s, e = sorted((x1, x2) if along == 0 else (y1, y2))
+            i, k = np.searchsorted(pos, [s - tol, e + tol])
+            hit = (lo[i:k] - tol <= c) & (hi[i:k] + tol >= c)
+            points = pos[i:k][hit]
+            # capetele apropiate de o axa perpendiculara sunt lipite de ea
+            if len(points):
+                near = points[np.argmin(np.abs(points - s))]
+                s = float(near) if abs(near - s) <= tol else s
+                near = points[np.argmin(np.abs(points - e))]
+                e = float(near) if abs(near - e) <= tol else e
+            stops = [s] + sorted(p for p in points.tolist() if s + tol < p < e - tol) + [e]
+            for p, q in zip(stops, stops[1:]):
+                if q - p > tol:
+                    result.append((p, c, q, c, t) if along == 0 else (c, p, c, q, t))
+        return result
+
+    return cut(horizontal, vertical, 0) + cut(vertical, horizontal, 1)
+
+
+# -------------------------------- API ----------------------------------
+
+def trace_walls(path: str, settings: Optional[TraceSettings] = None, jobs: int = 1,
+                progress: Optional[Callable[[float], None]] = None) -> List[Segment]:
+    """Peretii din imagine, in pixeli de imagine."""
+    settings = settings or TraceSettings()
+    mask = load_mask(path, settings.threshold)
+    h, w = mask.shape
+
+    packed_path = None
+    if jobs > 1 and mask.size >= POOL_MIN_PIXELS:
+        fd, packed_path = tempfile.mkstemp(suffix=".npy")
+        os.close(fd)
+        np.save(packed_path, np.packbits(mask, axis=1))
+
+    def stage(offset):
+        return (lambda f: progress(offset + f / 2)) if progress else None
+
+    try:
+        runs_h = all_runs(mask, 0, settings.min_length, jobs, packed_path, stage(0.0))
+        runs_v = all_runs(mask, 1, settings.min_length, jobs, packed_path, stage(0.5))
+    finally:
+        if packed_path:
+            os.remove(packed_path)
+
+    horizontal = band_segments(bands(*runs_h, w, settings), vertical=False)
+    vertical = band_segments(bands(*runs_v, h, settings), vertical=True)
+    return split_at_crossings(horizontal, vertical, settings.max_thickness / 2)
+
+
+def import_raster(pm, path: str, settings: Optional[TraceSettings] = None,
+                  jobs: Optional[int] = None,
+                  progress: Optional[Callable[[float], None]] = None):
+    """Adauga in documentul pm peretii trasati din imagine; intoarce (acceptati, respinsi)."""
+    from .ArchitecturalObjects import Wall
+
+    settings = settings or TraceSettings()
+    segments = trace_walls(path, settings, jobs or os.cpu_count() or 1, progress)
+    k = settings.scale
+    snap = pm.coordinate_system.snap_to_grid
+    walls = []
+    for x1, y1, x2, y2, t in segments:
+        x1, y1 = snap(x1 * k, y1 * k)
+        x2, y2 = snap(x2 * k, y2 * k)
+        if (x1, y1) != (x2, y2):
+            walls.append(Wall(x1, y1, x2, y2, t * k))
+    accepted = pm.add_objects(walls)
+    kept = set(map(id, accepted))
+    return accepted, [w for w in walls if id(w) not in kept]
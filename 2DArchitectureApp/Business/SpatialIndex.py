@@ -0,0 +1,115 @@
+import math
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall
+from .CollisionDetector import CollisionDetector
+
+Rect = Tuple[float, float, float, float]
+
+DEFAULT_CELL = 128
+
+
+def obstacle_box(obj: ArchitecturalObject) -> Rect:
+    """Dreptunghiul ocupat de un obiect, aliniat la axe.
+
+    Pentru pereti e reuniunea dintre grosimea reala (centrata pe axa) si
+    bbox-ul folosit de CollisionDetector, ca o pozitie libera aici sa fie
+    acceptata si de verificarile de coliziune.
+    """
+    x, y, w, h = CollisionDetector._bbox(obj)
+    if not isinstance(obj, Wall):
+        return x, y, w, h
+
+    half = obj.thickness / 2
+    x0 = min(x, obj.x1 - half, obj.x2 - half)
+    y0 = min(y, obj.y1 - half, obj.y2 - half)
+    x1 = max(x + w, obj.x1 + half, obj.x2 + half)
+    y1 = max(y + h, obj.y1 + half, obj.y2 + half)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+class SpatialHash:
+    """Grila uniforma: celula -> obiectele al caror dreptunghi o atinge.
+
+    Actualizarea unui obiect atinge doar celulele lui, deci indexul poate fi
+    tinut la zi la fiecare adaugare, stergere sau mutare.
+    """
+
+    def __init__(self, cell: float = DEFAULT_CELL):
+        self.cell = cell
+        self._cells: Dict[Tuple[int, int], Set[ArchitecturalObject]] = {}
+        self._boxes: Dict[ArchitecturalObject, Rect] = {}
+
+    def _cell_range(self, box: Rect):
+        x, y, w, h = box
+        c = self.cell
+        return (int(math.floor(x / c)), int(math.floor((x + w) / c)),
+                int(math.floor(y / c)), int(math.floor((y + h) / c)))
+
+    # ----------------------------- MODIFICARI ----------------------------
+
+    def insert(self, obj: ArchitecturalObject):
+        box = obstacle_box(obj)
+        self._boxes[obj] = box
+        cx0, cx1, cy0, cy1 = self._cell_range(box)
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[cx, cy] = set()
+                bucket.add(obj)
+
+    def remove(self, obj: ArchitecturalObject) -> bool:
+        box = self._boxes.pop(obj, None)
+        if box is None:
+            return False
+        cx0, cx1, cy0, cy1 = self._cell_range(box)
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(obj)
+                    if not bucket:
+                        del cells[cx, cy]
+        return True
+
+    def update(self, obj: ArchitecturalObject):
+        self.remove(obj)
+        self.insert(obj)
+
+    def rebuild(self, objects: Iterable[ArchitecturalObject]):
+        self._cells = {}
+        self._boxes = {}
+        for o in objects:
+            self.insert(o)
+
+    # ------------------------------- CERERI -------------------------------
+
+    def box_of(self, obj: ArchitecturalObject) -> Rect:
+        return self._boxes[obj]
+
+    def query(self, x: float, y: float, w: float, h: float) -> List[Tuple[ArchitecturalObject, Rect]]:
+        """Obiectele (cu dreptunghiul lor) care se suprapun cu zona data."""
+        cx0, cx1, cy0, cy1 = self._cell_range((x, y, w, h))
+        seen = set()
+        found = []
+        cells = self._cells
+        boxes = self._boxes
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for o in cells.get((cx, cy), ()):
+                    if o in seen:
+                        continue
+                    seen.add(o)
+                    bx, by, bw, bh = box = boxes[o]
+                    if bx < x + w and x < bx + bw and by < y + h and y < by + bh:
+                        found.append((o, box))
+        return found
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, obj):
+        return obj in self._boxes
@@ -0,0 +1,140 @@
+import importlib.abc
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class _TimedLoader(importlib.abc.Loader):
+    #invelis peste loader-ul real care masoara create_module si exec_module
+
+    def __init__(self, loader, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        # pentru extensiile C (ex. PyQt5.QtWidgets) costul e la incarcarea bibliotecii
+        with self._profiler._timed_import(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._timed_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Defalcare timp de pornire: importuri (self/total) si faze de constructie."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.marks: List[Tuple[str, float]] = []
+        self.imports: Dict[str, List[float]] = {}  # modul -> [total, self]
+        self._stack: List[List[float]] = []
+        self._finder: Optional[_TimingFinder] = None
+
+    # ----------------------------- IMPORTS ----------------------------
+
+    def install_import_hook(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def remove_import_hook(self):
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    @contextmanager
+    def _timed_import(self, name: str):
+        frame = [0.0]  # timpul copiilor
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += total
+            entry = self.imports.setdefault(name, [0.0, 0.0])
+            entry[0] += total
+            entry[1] += total - frame[0]
+
+    # ----------------------------- PHASES -----------------------------
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter() - self.t0))
+
+    # ----------------------------- REPORT -----------------------------
+
+    def report(self, top: int = 15) -> Dict:
+        by_self = sorted(self.imports.items(), key=lambda kv: kv[1][1], reverse=True)
+        packages: Dict[str, float] = {}
+        for name, (_, self_time) in self.imports.items():
+            root = name.split(".")[0]
+            packages[root] = packages.get(root, 0.0) + self_time
+
+        return {
+            "phases_ms": {name: round(t * 1000, 2) for name, t in self.phases},
+            "marks_ms": {name: round(t * 1000, 2) for name, t in self.marks},
+            "imports_by_package_ms": {
+                k: round(v * 1000, 2)
+                for k, v in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)
+            },
+            "slowest_imports_ms": {
+                name: {"self": round(s * 1000, 2), "total": round(t * 1000, 2)}
+                for name, (t, s) in by_self[:top]
+            },
+        }
+
+    def print_report(self, stream=None):
+        stream = stream or sys.stderr
+        rep = self.report()
+
+        print("=== Profil pornire ===", file=stream)
+        print("Faze:", file=stream)
+        for name, ms in rep["phases_ms"].items():
+            print(f"  {name:<32} {ms:>9.2f} ms", file=stream)
+        print("Repere (de la start):", file=stream)
+        for name, ms in rep["marks_ms"].items():
+            print(f"  {name:<32} {ms:>9.2f} ms", file=stream)
+        print("Importuri pe pachet (self):", file=stream)
+        for name, ms in rep["imports_by_package_ms"].items():
+            print(f"  {name:<32} {ms:>9.2f} ms", file=stream)
+        print("Cele mai lente module (self / total):", file=stream)
+        for name, t in rep["slowest_imports_ms"].items():
+            print(f"  {name:<32} {t['self']:>9.2f} / {t['total']:.2f} ms", file=stream)
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=4)
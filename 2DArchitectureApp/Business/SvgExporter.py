@@ -0,0 +1,134 @@
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import svgwrite
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall, Door, Window, Furniture, plan_bounds
+from .WallOutlines import WallOutlines
+
+
+def _num(v: float) -> str:
+    #numar compact pentru atribute svg
+    s = f"{v:.2f}".rstrip('0').rstrip('.')
+    return s if s not in ("", "-0") else "0"
+
+
+class SvgExporter:
+    """Export plan ca SVG, scris incremental pe disc.
+
+    Formele repetate (mobilier, usi, ferestre) sunt emise o singura data ca
+    <symbol> si referite cu <use> + transform. Peretii sunt scrisi ca
+    poligoanele de contur (cu imbinari), intr-un singur <path> per culoare.
+    """
+
+    def __init__(self, margin: float = 20):
+        self.margin = margin
+        self._dwg = svgwrite.Drawing(debug=False)
+        self._symbols: Dict[Tuple, str] = {}
+
+    # ----------------------------- PUBLIC -----------------------------
+
+    def export(self, filepath: str, walls: List[Wall], doors: List[Door],
+               windows: List[Window], furniture: List[Furniture],
+               outlines: Optional[WallOutlines] = None) -> bool:
+        """Scrie planul; `outlines` e conturul peretilor din document (altfel e calculat aici)."""
+        try:
+            if outlines is None:
+                outlines = WallOutlines()
+                outlines.rebuild(walls)
+            self._symbols = {}
+            x, y, w, h = plan_bounds(walls, chain(doors, windows, furniture), self.margin)
+
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+                f.write(
+                    f'<svg xmlns="http://www.w3.org/2000/svg" '
+                    f'xmlns:xlink="http://www.w3.org/1999/xlink" version="1.1" '
+                    f'width="{_num(w)}" height="{_num(h)}" '
+                    f'viewBox="{_num(x)} {_num(y)} {_num(w)} {_num(h)}">\n'
+                )
+
+                for el in self._wall_paths(walls, outlines):
+                    f.write(el)
+                    f.write('\n')
+
+                for group in (doors, windows, furniture):
+                    for obj in group:
+                        f.write(self._use(obj))
+                        f.write('\n')
+
+                f.write('</svg>\n')
+
+            return True
+
+        except Exception as e:
+            print(f"Eroare la exportul SVG: {e}")
+            return False
+
+    # ----------------------------- WALLS ------------------------------
+
+    def _wall_paths(self, walls: List[Wall], outlines: WallOutlines) -> Iterable[str]:
+        """Un singur <path> umplut per culoare, cu conturul fiecarui perete ca subcale.
+
+        Subcaile aceleiasi cai sunt umplute ca reuniune, deci imbinarile nu au rosturi.
+        """
+        by_color: Dict[str, List[str]] = {}
+        for wl in walls:
+            points = outlines.outline(wl)
+            if not points:
+                continue
+            (x0, y0), rest = points[0], points[1:]
+            by_color.setdefault(wl.color, []).append(
+                f"M{_num(x0)} {_num(y0)}" + "".join(f"L{_num(x)} {_num(y)}" for x, y in rest) + "Z"
+            )
+        for color, subpaths in by_color.items():
+            yield self._dwg.path(d="".join(subpaths), fill=color, stroke='none').tostring()
+
+    # ---------------------------- SYMBOLS -----------------------------
+
+    @staticmethod
+    def _symbol_key(obj: ArchitecturalObject) -> Tuple:
+        if isinstance(obj, Door):
+            extra = (obj.opening_direction, obj.opening_angle)
+        elif isinstance(obj, Furniture):
+            extra = (obj.furniture_type,)
+        else:
+            extra = ()
+        return (type(obj).__name__, round(obj.width, 2), round(obj.height, 2), obj.color) + extra
+
+    def _symbol(self, obj: ArchitecturalObject, sid: str) -> str:
+        dwg = self._dwg
+        w, h = obj.width, obj.height
+
+        sym = dwg.symbol(id=sid)
+        sym.viewbox(0, 0, _num(w), _num(h))
+        sym['overflow'] = 'visible'
+
+        if isinstance(obj, Window):
+            sym.add(dwg.rect((0, 0), (_num(w), _num(h)), fill='#ADD8E6',
+                             fill_opacity='0.59', stroke=obj.color, stroke_width=2))
+        else:
+            sym.add(dwg.rect((0, 0), (_num(w), _num(h)), fill=obj.color,
+                             stroke=obj.color, stroke_width=2))
+
+        return f"<defs>{sym.tostring()}</defs>"
+
+    def _use(self, obj: ArchitecturalObject) -> str:
+        key = self._symbol_key(obj)
+        sid = self._symbols.get(key)
+        prefix = ""
+
+        if sid is None:
+            sid = f"s{len(self._symbols)}"
+            self._symbols[key] = sid
+            #definitia e scrisa inline la prima folosire, fara a doua trecere
+            prefix = self._symbol(obj, sid)
+
+        transform = f"translate({_num(obj.x)} {_num(obj.y)})"
+        if obj.rotation:
+            transform += f" rotate({_num(obj.rotation)} {_num(obj.width / 2)} {_num(obj.height / 2)})"
+
+        use = self._dwg.use(f"#{sid}", width=_num(obj.width), height=_num(obj.height),
+                            transform=transform)
+        return prefix + use.tostring()
+
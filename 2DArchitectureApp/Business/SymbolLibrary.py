@@ -0,0 +1,45 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+SVG_DIR = os.path.join(RESOURCES_DIR, "svgs")
+
+
+class SymbolInfo:
+    #simbol din biblioteca: o zona dintr-un SVG din resources/svgs
+
+    def __init__(self, name: str, label: str, asset: str, category: str,
+                 source_rect: Optional[Tuple[int, int, int, int]] = None):
+        self.name = name
+        self.label = label
+        self.asset = asset  # numele fisierului SVG
+        self.category = category
+        self.source_rect = source_rect  # (x, y, w, h) in pixelii imaginii, None = toata imaginea
+
+    def asset_path(self) -> str:
+        return os.path.join(SVG_DIR, self.asset)
+
+
+_FURNITURE_SHEET = "AdobeStock_372659050.svg"
+
+SYMBOLS: Dict[str, SymbolInfo] = {
+    s.name: s for s in [
+        SymbolInfo("pat_dublu", "Pat dublu", _FURNITURE_SHEET, "bedroom", (924, 110, 300, 386)),
+        SymbolInfo("pat_simplu", "Pat simplu", _FURNITURE_SHEET, "bedroom", (1300, 110, 210, 386)),
+        SymbolInfo("fotoliu", "Fotoliu", _FURNITURE_SHEET, "living", (2574, 90, 156, 154)),
+        SymbolInfo("canapea", "Canapea", _FURNITURE_SHEET, "living", (2776, 90, 394, 154)),
+        SymbolInfo("aragaz", "Aragaz", _FURNITURE_SHEET, "kitchen", (4040, 86, 116, 134)),
+        SymbolInfo("frigider", "Frigider", _FURNITURE_SHEET, "kitchen", (4044, 274, 124, 122)),
+        SymbolInfo("chiuveta", "Chiuvetă", _FURNITURE_SHEET, "kitchen", (4474, 266, 236, 124)),
+        SymbolInfo("masa", "Masă", _FURNITURE_SHEET, "kitchen", (4400, 594, 164, 226)),
+        SymbolInfo("scaun", "Scaun", _FURNITURE_SHEET, "office", (4044, 626, 70, 82)),
+    ]
+}
+
+
+def get_symbol(furniture_type: str) -> Optional[SymbolInfo]:
+    return SYMBOLS.get(furniture_type)
+
+
+def symbols_for_asset(asset: str) -> List[SymbolInfo]:
+    return [s for s in SYMBOLS.values() if s.asset == asset]
@@ -0,0 +1,434 @@
+"""Antemasuratoare: cantitatile planului (pereti, deschideri, mobilier, camere).
+
+Fiecare obiect are un rand cu contributia lui, pastrat in cache; totalurile
+sunt sume intretinute incremental, deci dupa o modificare se recalculeaza
+doar randurile obiectelor atinse. Randurile sunt in pixeli, iar ariile si
+unitatile reale sunt calculate abia la raport, asa ca schimbarea scarii sau
+a inaltimilor nu invalideaza nimic.
+
+Camerele sunt fetele inchise ale grafului de pereti (peretii trebuie sa se
+intalneasca in capete, ca la WallOutlines). Ele sunt recalculate doar cand
+se schimba geometria unui perete.
+"""
+import csv
+import json
+import math
+from bisect import insort
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .ArchitecturalObjects import ArchitecturalObject, Wall, Door, Window, Furniture
+from .WallOutlines import node_of
+
+EPS = 1e-9
+# inaltimile implicite, in cm (suprascrise de Project.heights)
+DEFAULT_HEIGHTS = {"wall": 250.0, "door": 210.0, "window": 120.0}
+# coltul interior al unei camere e acceptat pana la atatea grosimi de perete
+MITER_LIMIT = 4.0
+
+Node = Tuple[float, float]
+
+
+def _key(value: float) -> float:
+    return round(value, 3)
+
+
+def _row(obj: ArchitecturalObject, host: Optional[Wall]):
+    """Contributia unui obiect; randurile egale dau aceleasi cantitati."""
+    if isinstance(obj, Wall):
+        return ("wall", _key(obj.thickness), obj.get_length(),
+                node_of(obj.x1, obj.y1), node_of(obj.x2, obj.y2))
+    if isinstance(obj, (Door, Window)):
+        kind = "door" if isinstance(obj, Door) else "window"
+        # o deschidere gazduita are latimea de-a lungul peretelui; una libera, latura mare
+        width = obj.width if host is not None else max(obj.width, obj.height)
+        return (kind, _key(width), _key(host.thickness) if host is not None else None)
+    if isinstance(obj, Furniture):
+        return ("furniture", obj.category, obj.furniture_type)
+    return None
+
+
+def _bump(table: Dict, key, delta):
+    value = table.get(key, 0) + delta
+    if abs(value) < EPS:
+        table.pop(key, None)
+    else:
+        table[key] = value
+
+
+class QuantityTakeoff:
+    """Randurile per obiect si sumele lor, actualizate la cerere."""
+
+    def __init__(self):
+        self._rows: Dict[ArchitecturalObject, tuple] = {}
+        self._dirty = set()
+        self._stale = True
+        self._rooms = RoomGraph()
+        # grosime -> [numar, lungime]
+        self._walls: Dict[float, List[float]] = {}
+        # (grosime perete, tip) -> suma latimilor deschiderilor gazduite
+        self._cuts: Dict[Tuple[float, str], float] = {}
+        # (tip, latime) -> numar
+        self._openings: Dict[Tuple[str, float], int] = {}
+        # (categorie, tip) -> numar
+        self._furniture: Dict[Tuple[str, str], int] = {}
+        # ultimul raport, cu unitatile si inaltimile pentru care a fost facut
+        self._report: Optional[Tuple[tuple, Dict]] = None
+
+    # ----------------------------- INVALIDARE ----------------------------
+
+    def invalidate(self, *objs):
+        if self._stale:
+            return
+        for o in objs:
+            if o is not None:
+                self._dirty.add(o)
+
+    def invalidate_all(self):
+        self._stale = True
+        self._dirty = set()
+        self._report = None
+
+    # ----------------------------- ACTUALIZARE ---------------------------
+
+    def refresh(self, objects: Iterable[ArchitecturalObject], present, wall_of: Callable,
+                hosted: Callable):
+        """Aduce sumele la zi.
+
+        `present` raspunde la `obj in present` pentru obiectele din document,
+        `wall_of` da peretele gazda al unei deschideri, iar `hosted` deschiderile
+        unui perete.
+        """
+        if self._stale:
+            self._rows = {}
+            self._walls, self._cuts, self._openings, self._furniture = {}, {}, {}, {}
+            self._rooms = RoomGraph()
+            self._report = None
+            for o in objects:
+                self._apply(o, _row(o, wall_of(o)))
+            self._stale = False
+            return
+
+        pending = self._dirty
+        self._dirty = set()
+        while pending:
+            o = pending.pop()
+            row = _row(o, wall_of(o)) if o in present else None
+            old = self._rows.get(o)
+            if row == old:
+                continue
+            self._report = None
+            if old is not None:
+                self._apply(o, old, -1)
+            if row is not None:
+                self._apply(o, row)
+            if isinstance(o, Wall):
+                # deschiderile gazduite sunt socotite la grosimea peretelui lor
+                if old is None or row is None or old[1] != row[1]:
+                    pending.update(hosted(o))
+
+    def _apply(self, obj, row, sign=1):
+        if row is None:
+            return
+        if sign > 0:
+            self._rows[obj] = row
+        else:
+            del self._rows[obj]
+        kind = row[0]
+        if kind == "wall":
+            if sign > 0:
+                self._rooms.add(obj, row[3], row[4], obj.thickness)
+            else:
+                self._rooms.remove(obj, row[3], row[4])
+            totals = self._walls.setdefault(row[1], [0, 0.0])
+            totals[0] += sign
+            totals[1] += sign * row[2]
+            if totals[0] == 0:
+                del self._walls[row[1]]
+        elif kind == "furniture":
+            _bump(self._furniture, row[1:], sign)
+        else:
+            _bump(self._openings, row[:2], sign)
+            if row[2] is not None:
+                _bump(self._cuts, (row[2], kind), sign * row[1])
+
+    def rooms(self) -> List[Tuple[float, float, float, float]]:
+        """(aria utila, perimetrul interior, x, y centru) per camera, in pixeli."""
+        return self._rooms.rooms()
+
+    def __len__(self):
+        return len(self._rows)
+
+    # -------------------------------- RAPORT -------------------------------
+
+    def report(self, px_to_cm: float,
+               heights: Optional[Dict[str, float]] = None) -> Dict:
+        """Tabelele de cantitati in unitati reale (m, m2, cm)."""
+        h = dict(DEFAULT_HEIGHTS)
+        h.update(heights or {})
+        key = (px_to_cm, tuple(sorted(h.items())))
+        if self._report is not None and self._report[0] == key:
+            return self._report[1]
+        wall_h = h["wall"]
+        # o deschidere nu poate fi mai inalta decat peretele ei
+        cut_h = {"door": min(h["door"], wall_h), "window": min(h["window"], wall_h)}
+        m = px_to_cm / 100
+
+        wall_rows = []
+        for thickness in sorted(self._walls):
+            count, length = self._walls[thickness]
+            gross = length * m * wall_h / 100
+            cut = sum(self._cuts.get((thickness, kind), 0.0) * m * cut_h[kind] / 100
+                      for kind in cut_h)
+            wall_rows.append({
+                "thickness_cm": round(thickness * px_to_cm, 1),
+                "count": count,
+                "length_m": round(length * m, 2),
+                "gross_area_m2": round(gross, 2),
+                "openings_area_m2": round(cut, 2),
+                "net_area_m2": round(gross - cut, 2),
+            })
+
+        def openings(kind):
+            return [{"width_cm": round(width * px_to_cm, 1), "height_cm": h[kind], "count": count}
+                    for (k, width), count in sorted(self._openings.items()) if k == kind]
+
+        furniture = [{"category": category, "type": ftype, "count": count}
+                     for (category, ftype), count in sorted(self._furniture.items())]
+
+        rooms = [{"room": i, "area_m2": round(area * m * m, 2), "perimeter_m": round(perimeter * m, 2)}
+                 for i, (area, perimeter, _, _) in enumerate(self.rooms(), 1)]
+
+        doors, windows = openings("door"), openings("window")
+        report = {
+            "heights_cm": h,
+            "walls": wall_rows,
+            "doors": doors,
+            "windows": windows,
+            "furniture": furniture,
+            "rooms": rooms,
+            "totals": {
+                "walls": sum(r["count"] for r in wall_rows),
+                "wall_length_m": round(sum(r["length_m"] for r in wall_rows), 2),
+                "gross_area_m2": round(sum(r["gross_area_m2"] for r in wall_rows), 2),
+                "openings_area_m2": round(sum(r["openings_area_m2"] for r in wall_rows), 2),
+                "net_area_m2": round(sum(r["net_area_m2"] for r in wall_rows), 2),
+                "doors": sum(r["count"] for r in doors),
+                "windows": sum(r["count"] for r in windows),
+                "furniture": sum(r["count"] for r in furniture),
+                "rooms": len(rooms),
+                "floor_area_m2": round(sum(r["area_m2"] for r in rooms), 2),
+            },
+        }
+        self._report = (key, report)
+        return report
+
+
+# ------------------------------- CAMERE ------------------------------------
+
+class RoomGraph:
+    """Fetele inchise ale grafului de pereti, intretinute incremental.
+
+    Fiecare fata e parcursa tinand-o in stanga: la fiecare nod se continua pe
+    peretele urmator in sens orar fata de cel pe care s-a venit. Fata
+    exterioara a fiecarei componente iese cu orientarea opusa si e sarita.
+    Aria utila e a poligonului deplasat spre interior cu jumatate din grosimea
+    fiecarui perete.
+
+    Urmatorul pas dintr-un nod depinde doar de peretii din acel nod, deci la o
+    modificare se refac doar fetele care trec prin capetele peretelui.
+    """
+
+    def __init__(self):
+        # (a, b) cu a < b -> peretii dintre cele doua noduri si grosimea lor
+        self._edges: Dict[Tuple[Node, Node], Dict[Wall, float]] = {}
+        # nod -> [(unghi, vecin)] sortat, plus pozitia fiecarui vecin in lista
+        self._around: Dict[Node, List[Tuple[float, Node]]] = {}
+        self._position: Dict[Tuple[Node, Node], int] = {}
+        # semi-muchie -> fata ei; fata -> (semi-muchiile ei, camera sau None)
+        self._face_of: Dict[Tuple[Node, Node], int] = {}
+        self._faces: Dict[int, Tuple[List[Tuple[Node, Node]], Optional[tuple]]] = {}
+        self._ids = count()
+        # semi-muchii ramase fara fata, de parcurs la urmatoarea cerere
+        self._loose = set()
+        self._rooms: Optional[List[Tuple[float, float, float, float]]] = None
+
+    def add(self, wall: Wall, a: Node, b: Node, thickness: float):
+        if a == b:
+            return
+        key = (a, b) if a < b else (b, a)
+        walls = self._edges.get(key)
+        self._drop_at(a)
+        self._drop_at(b)
+        if walls is None:
+            walls = self._edges[key] = {}
+            self._link(a, b)
+            self._link(b, a)
+            self._loose.update(((a, b), (b, a)))
+        walls[wall] = thickness
+
+    def remove(self, wall: Wall, a: Node, b: Node):
+        if a == b:
+            return
+        key = (a, b) if a < b else (b, a)
+        walls = self._edges.get(key)
+        if walls is None or walls.pop(wall, None) is None:
+            return
+        self._drop_at(a)
+        self._drop_at(b)
+        if not walls:
+            del self._edges[key]
+            self._unlink(a, b)
+            self._unlink(b, a)
+
+    def _link(self, node: Node, other: Node):
+        out = self._around.setdefault(node, [])
+        insort(out, (math.atan2(other[1] - node[1], other[0] - node[0]), other))
+        self._reindex(node)
+
+    def _unlink(self, node: Node, other: Node):
+        out = self._around[node]
+        del out[self._position.pop((node, other))]
+        if out:
+            self._reindex(node)
+        else:
+            del self._around[node]
+
+    def _reindex(self, node: Node):
+        position = self._position
+        for i, (_, other) in enumerate(self._around[node]):
+            position[(node, other)] = i
+
+    def _drop_at(self, node: Node):
+        """Desface fetele care trec prin nod; semi-muchiile lor raman de reparcurs."""
+        face_of = self._face_of
+        for _, other in self._around.get(node, ()):
+            for he in ((node, other), (other, node)):
+                fid = face_of.get(he)
+                if fid is None:
+                    continue
+                edges, room = self._faces.pop(fid)
+                for e in edges:
+                    del face_of[e]
+                self._loose.update(edges)
+                if room is not None:
+                    self._rooms = None
+
+    def rooms(self) -> List[Tuple[float, float, float, float]]:
+        """(aria utila, perimetrul interior, x, y centru) per camera, de sus in jos si de la stanga."""
+        loose, self._loose = self._loose, set()
+        for he in loose:
+            if he in self._position and he not in self._face_of:
+                self._trace(he)
+        if self._rooms is None:
+            self._rooms = sorted((room for _, room in self._faces.values() if room is not None),
+                                 key=lambda r: (round(r[3], 3), round(r[2], 3)))
+        return self._rooms
+
+    def _trace(self, start: Tuple[Node, Node]):
+        around, position = self._around, self._position
+        fid = next(self._ids)
+        edges, face = [], []
+        u, v = start
+        while (u, v) not in self._face_of:
+            self._face_of[(u, v)] = fid
+            edges.append((u, v))
+            face.append(u)
+            out = around[v]
+            u, v = v, out[(position[(v, u)] - 1) % len(out)][1]
+        room = self._room(face)
+        self._faces[fid] = (edges, room)
+        if room is not None:
+            self._rooms = None
+
+    def _room(self, face: List[Node]) -> Optional[Tuple[float, float, float, float]]:
+        if _signed_area(face) <= EPS:
+            return None
+        thickness = {}
+        for a, b in zip(face, face[1:] + face[:1]):
+            key = (a, b) if a < b else (b, a)
+            thickness[key] = max(self._edges[key].values())
+        inner = _inset(face, thickness)
+        area = _signed_area(inner)
+        if area <= 0:
+            return None
+        cx = sum(p[0] for p in face) / len(face)
+        cy = sum(p[1] for p in face) / len(face)
+        return area, _perimeter(inner), cx, cy
+
+    def __len__(self):
+        return len(self.rooms())
+
+
+def _signed_area(points: List[Tuple[float, float]]) -> float:
+    s = 0.0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        s += x1 * y2 - x2 * y1
+    return s / 2
+
+
+def _perimeter(points: List[Tuple[float, float]]) -> float:
+    return sum(math.hypot(x2 - x1, y2 - y1)
+               for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+
+
+def _inset(face: List[Node], thickness: Dict[Tuple[Node, Node], float]) -> List[Tuple[float, float]]:
+    """Poligonul fetei deplasat spre interior (fata are arie pozitiva: interiorul e in stanga)."""
+    lines = []
+    n = len(face)
+    for i in range(n):
+        a, b = face[i], face[(i + 1) % n]
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length = math.hypot(dx, dy)
+        half = thickness[(a, b) if a < b else (b, a)] / 2
+        dx, dy = dx / length, dy / length
+        lines.append((a[0] - dy * half, a[1] + dx * half, dx, dy, half))
+
+    inner = []
+    for i in range(n):
+        px, py, dx1, dy1, h1 = lines[i - 1]
+        qx, qy, dx2, dy2, h2 = lines[i]
+        cross = dx1 * dy2 - dy1 * dx2
+        if abs(cross) > 1e-6:
+            t = ((qx - px) * dy2 - (qy - py) * dx2) / cross
+            x, y = px + t * dx1, py + t * dy1
+            vx, vy = face[i]
+            if math.hypot(x - vx, y - vy) <= MITER_LIMIT * max(h1, h2):
+                inner.append((x, y))
+                continue
+        # pereti in prelungire (sau colt prea ascutit): punctul deplasat al peretelui urmator
+        inner.append((qx, qy))
+    return inner
+
+
+# -------------------------------- EXPORT -----------------------------------
+
+SCHEDULES = (
+    ("walls", "Pereti"),
+    ("doors", "Usi"),
+    ("windows", "Ferestre"),
+    ("furniture", "Mobilier"),
+    ("rooms", "Camere"),
+)
+
+
+def write_json(report: Dict, filepath: str):
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+
+
+def write_csv(report: Dict, filepath: str):
+    """Tabelele unul sub altul, fiecare cu titlu si cap de tabel, apoi totalurile."""
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        out = csv.writer(f)
+        for key, title in SCHEDULES:
+            rows = report[key]
+            out.writerow([title])
+            if rows:
+                out.writerow(list(rows[0]))
+                for row in rows:
+                    out.writerow(list(row.values()))
+            out.writerow([])
+        out.writerow(["Total"])
+        for name, value in report["totals"].items():
+            out.writerow([name, value])
@@ -0,0 +1,144 @@
+"""Span-uri de trasare pentru operatiile importante, exportabile ca Chrome trace.
+
+Activare:
+    ARCH_TRACE=trace.json python main.py   (fisierul e scris la iesire)
+    sau butonul "Trace" din WorkPage / tracer.start() din cod.
+
+Fisierul rezultat se deschide in chrome://tracing sau https://ui.perfetto.dev.
+Cand trasarea e oprita, o functie @traced costa doar un apel in plus si
+verificarea unui flag (vezi cazul "tracing" din benchmarks).
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Optional
+
+ENV_VAR = "ARCH_TRACE"
+DEFAULT_CAPACITY = 200_000
+
+
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.enabled = False
+        # (nume, categorie, start_ns, durata_ns, tid, adancime); deque.append e atomic
+        self._events = deque(maxlen=capacity)
+        self._local = threading.local()
+        self._thread_names = {}
+        self._t0 = time.perf_counter_ns()
+
+    # ----------------------------- CONTROL -----------------------------
+
+    def start(self, clear: bool = True):
+        if clear:
+            self.clear()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def clear(self):
+        self._events.clear()
+        self._thread_names.clear()
+        self._t0 = time.perf_counter_ns()
+
+    def __len__(self):
+        return len(self._events)
+
+    # ----------------------------- RECORD ------------------------------
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def _record(self, name: str, cat: str, start: int, end: int, depth: int):
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        self._events.append((name, cat, start, end - start, tid, depth))
+
+    @contextmanager
+    def span(self, name: str, cat: str = "app"):
+        if not self.enabled:
+            yield
+            return
+
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        local.depth = depth + 1
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(name, cat, start, time.perf_counter_ns(), depth)
+            local.depth = depth
+
+    def traced(self, name: Optional[str] = None, cat: str = "app"):
+        """Decorator: fiecare apel devine un span cand trasarea e pornita."""
+        def decorate(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+
+                local = self._local
+                depth = getattr(local, "depth", 0)
+                local.depth = depth + 1
+                start = time.perf_counter_ns()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._record(label, cat, start, time.perf_counter_ns(), depth)
+                    local.depth = depth
+
+            return wrapper
+        return decorate
+
+    # ----------------------------- EXPORT ------------------------------
+
+    def chrome_events(self) -> List[dict]:
+        pid = os.getpid()
+        t0 = self._t0
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+             "args": {"name": tname}}
+            for tid, tname in list(self._thread_names.items())
+        ]
+        # evenimente "X" (complete): ts si dur in microsecunde
+        for name, cat, start, dur, tid, depth in list(self._events):
+            events.append({
+                "name": name, "cat": cat, "ph": "X",
+                "ts": (start - t0) / 1000, "dur": dur / 1000,
+                "pid": pid, "tid": tid, "args": {"depth": depth},
+            })
+        return events
+
+    def export_chrome(self, path: str) -> int:
+        """Scrie bufferul in formatul Chrome trace; returneaza numarul de span-uri."""
+        events = self.chrome_events()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(self._events)
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+
+
+def _enable_from_env():
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return
+    if path in ("1", "true", "yes"):
+        path = "trace.json"
+    tracer.start()
+    atexit.register(lambda: tracer.export_chrome(path))
+
+
+_enable_from_env()
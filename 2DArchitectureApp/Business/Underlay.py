@@ -0,0 +1,145 @@
+"""Fundal (underlay) pentru trasare: o scanare sau o fotografie sub grila.
+
+Imaginea originala nu e desenata niciodata direct. La prima folosire e
+transformata intr-o piramida de tile-uri (nivelul n are 1/2^n din rezolutie),
+salvata pe disc intr-un cache cheiat dupa fisier, dimensiune si data
+modificarii. Nivelurile sunt scrise de la cel mai mic la cel mai mare, iar
+cele gata pot fi desenate inainte ca toata piramida sa fie completa.
+
+Structura cache-ului:
+    <cache>/<cheie>/L<nivel>/<tx>_<ty>.png
+    <cache>/<cheie>/L<nivel>/done          nivel complet
+    <cache>/<cheie>/meta.json              piramida completa
+"""
+import hashlib
+import json
+import math
+import os
+from typing import Callable, List, Optional, Set, Tuple
+
+TILE = 512
+# nivelul cel mai mic are cel mult atatia pixeli pe latura
+MIN_LEVEL_SIZE = 256
+CACHE_DIR = os.environ.get(
+    "ARCH_UNDERLAY_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "2DArchitectureApp", "underlays"),
+)
+
+
+def cache_key(path: str) -> str:
+    st = os.stat(path)
+    ident = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{TILE}"
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()[:20]
+
+
+def level_sizes(width: int, height: int) -> List[Tuple[int, int]]:
+    sizes = [(width, height)]
+    while max(sizes[-1]) > MIN_LEVEL_SIZE:
+        w, h = sizes[-1]
+        sizes.append((max(1, (w + 1) // 2), max(1, (h + 1) // 2)))
+    return sizes
+
+
+class Pyramid:
+    """Piramida de tile-uri a unei imagini, pe disc."""
+
+    def __init__(self, source: str, directory: str, width: int, height: int):
+        self.source = source
+        self.dir = directory
+        self.width = width
+        self.height = height
+        self.levels = level_sizes(width, height)
+        # nivelurile complete; actualizat de build din alt thread
+        self.ready: Set[int] = set()
+
+    @classmethod
+    def for_source(cls, source: str, cache_dir: str = CACHE_DIR) -> "Pyramid":
+        """Piramida din cache pentru imagine (poate fi incompleta sau inca neconstruita)."""
+        directory = os.path.join(cache_dir, cache_key(source))
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            pyramid = cls(source, directory, meta["width"], meta["height"])
+        else:
+            from .RasterTrace import open_scan
+
+            # doar antetul imaginii, fara decodare
+            with open_scan(source) as img:
+                pyramid = cls(source, directory, img.width, img.height)
+        for level in range(len(pyramid.levels)):
+            if os.path.exists(os.path.join(directory, f"L{level}", "done")):
+                pyramid.ready.add(level)
+        return pyramid
+
+    @property
+    def complete(self) -> bool:
+        return len(self.ready) == len(self.levels)
+
+    def grid(self, level: int) -> Tuple[int, int]:
+        w, h = self.levels[level]
+        return math.ceil(w / TILE), math.ceil(h / TILE)
+
+    def tile_path(self, level: int, tx: int, ty: int) -> str:
+        return os.path.join(self.dir, f"L{level}", f"{tx}_{ty}.png")
+
+    def level_for(self, screen_per_pixel: float) -> int:
+        """Nivelul la care un pixel de tile ocupa cel putin un pixel de ecran."""
+        if screen_per_pixel <= 0:
+            return len(self.levels) - 1
+        level = int(math.floor(math.log2(1 / screen_per_pixel))) if screen_per_pixel < 1 else 0
+        return min(max(level, 0), len(self.levels) - 1)
+
+    def tiles_in(self, level: int, x: float, y: float, w: float, h: float):
+        """Tile-urile nivelului care acopera dreptunghiul (in pixeli ai imaginii originale)."""
+        span = TILE * (1 << level)
+        cols, rows = self.grid(level)
+        tx0, ty0 = max(0, int(x // span)), max(0, int(y // span))
+        tx1, ty1 = min(cols - 1, int((x + w) // span)), min(rows - 1, int((y + h) // span))
+        return [(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+
+    # ------------------------------ BUILD ------------------------------
+
+    def build(self, progress: Optional[Callable[[float], None]] = None,
+              on_level: Optional[Callable[[int], None]] = None):
+        """Scrie nivelurile lipsa, de la cel mai mic la cel mai mare."""
+        if self.complete:
+            return
+        from .RasterTrace import open_scan
+
+        with open_scan(self.source) as img:
+            img.load()
+            if img.mode not in ("L", "RGB"):
+                img = img.convert("RGB")
+            images = [img]
+            for _ in self.levels[1:]:
+                images.append(images[-1].reduce(2))
+
+        total = sum(c * r for c, r in map(self.grid, range(len(self.levels))))
+        done = 0
+        for level in reversed(range(len(self.levels))):
+            cols, rows = self.grid(level)
+            if level in self.ready:
+                done += cols * rows
+                continue
+            folder = os.path.join(self.dir, f"L{level}")
+            os.makedirs(folder, exist_ok=True)
+            image = images[level]
+            for ty in range(rows):
+                for tx in range(cols):
+                    box = (tx * TILE, ty * TILE,
+                           min((tx + 1) * TILE, image.width), min((ty + 1) * TILE, image.height))
+                    # compresie minima: tile-urile sunt citite des si scrise o singura data
+                    image.crop(box).save(self.tile_path(level, tx, ty), compress_level=1)
+                    done += 1
+                    if progress:
+                        progress(done / total)
+            open(os.path.join(folder, "done"), "w").close()
+            self.ready.add(level)
+            images[level] = None
+            if on_level:
+                on_level(level)
+
+        with open(os.path.join(self.dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.abspath(self.source), "width": self.width,
+                       "height": self.height, "tile": TILE, "levels": self.levels}, f)
@@ -0,0 +1,187 @@
+"""Conturul peretilor ca poligoane, cu imbinari la colturi si intersectii.
+
+Peretii care au un capat comun formeaza un nod in graful capetelor. La un
+nod, peretii sunt ordonati dupa unghi, iar fiecare pereche de pereti vecini
+isi imparte un colt: intersectia fetelor care se privesc (imbinare in
+unghi). Fetele aproape paralele sau colturile prea ascutite sunt taiate
+drept (bizou). Capetele libere sunt drepte, fara prelungire.
+
+Poligoanele sunt tinute in cache per perete; modificarea unui perete
+invalideaza doar peretele si vecinii lui din nodurile vechi si noi.
+"""
+import math
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .ArchitecturalObjects import Wall
+
+EPS = 1e-9
+# capetele mai apropiate de atat (pe fiecare axa) sunt acelasi nod
+NODE_DIGITS = 3
+# coltul unei imbinari e acceptat pana la atatea jumatati de grosime de nod
+MITER_LIMIT = 4.0
+
+Point = Tuple[float, float]
+Node = Tuple[float, float]
+
+
+def node_of(x: float, y: float) -> Node:
+    return round(x, NODE_DIGITS), round(y, NODE_DIGITS)
+
+
+def _direction(wall: Wall, node: Node) -> Optional[Tuple[float, float]]:
+    """Directia unitara a peretelui, dinspre nodul dat spre celalalt capat."""
+    dx, dy = wall.x2 - wall.x1, wall.y2 - wall.y1
+    length = math.hypot(dx, dy)
+    if length < EPS:
+        return None
+    if node_of(wall.x1, wall.y1) != node:
+        dx, dy = -dx, -dy
+    return dx / length, dy / length
+
+
+def _corner(px, py, d1, o1, d2, o2, limit) -> Optional[Point]:
+    """Intersectia dreptelor P + o1 + t*d1 si P + o2 + s*d2, daca nu e prea departe de P."""
+    cross = d1[0] * d2[1] - d1[1] * d2[0]
+    if abs(cross) < 1e-6:
+        return None
+    rx, ry = o2[0] - o1[0], o2[1] - o1[1]
+    t = (rx * d2[1] - ry * d2[0]) / cross
+    cx, cy = o1[0] + t * d1[0], o1[1] + t * d1[1]
+    if cx * cx + cy * cy > limit * limit:
+        return None
+    return px + cx, py + cy
+
+
+class WallOutlines:
+    """Graful capetelor peretilor si poligoanele de contur calculate din el."""
+
+    def __init__(self):
+        self._nodes: Dict[Node, Set[Wall]] = {}
+        # nodurile sub care e inregistrat fiecare perete (geometria de la inregistrare)
+        self._ends: Dict[Wall, Tuple[Node, Node]] = {}
+        self._outlines: Dict[Wall, Tuple[Point, ...]] = {}
+
+    # ----------------------------- MODIFICARI ----------------------------
+
+    # add/remove/update intorc vecinii al caror contur s-a schimbat odata cu peretele
+
+    def add(self, wall: Wall) -> Set[Wall]:
+        ends = (node_of(wall.x1, wall.y1), node_of(wall.x2, wall.y2))
+        self._ends[wall] = ends
+        self._outlines.pop(wall, None)
+        touched = set()
+        for node in set(ends):
+            walls = self._nodes.setdefault(node, set())
+            touched |= walls
+            walls.add(wall)
+        self._dirty(touched)
+        return touched
+
+    def remove(self, wall: Wall) -> Set[Wall]:
+        ends = self._ends.pop(wall, None)
+        if ends is None:
+            return set()
+        self._outlines.pop(wall, None)
+        touched = set()
+        for node in set(ends):
+            walls = self._nodes.get(node)
+            if walls is None:
+                continue
+            walls.discard(wall)
+            touched |= walls
+            if not walls:
+                del self._nodes[node]
+        self._dirty(touched)
+        return touched
+
+    def update(self, wall: Wall) -> Set[Wall]:
+        """Peretele s-a mutat, rotit sau ingrosat: el si vecinii vechi si noi se recalculeaza."""
+        return self.remove(wall) | self.add(wall)
+
+    def rebuild(self, walls: Iterable[Wall]):
+        self._nodes = {}
+        self._ends = {}
+        self._outlines = {}
+        for w in walls:
+            ends = (node_of(w.x1, w.y1), node_of(w.x2, w.y2))
+            self._ends[w] = ends
+            for node in set(ends):
+                self._nodes.setdefault(node, set()).add(w)
+
+    def _dirty(self, walls: Iterable[Wall]):
+        outlines = self._outlines
+        for w in walls:
+            outlines.pop(w, None)
+
+    # ------------------------------- CERERI -------------------------------
+
+    def outline(self, wall: Wall) -> Tuple[Point, ...]:
+        """Poligonul peretelui (gol pentru pereti de lungime zero)."""
+        points = self._outlines.get(wall)
+        if points is None:
+            points = self._compute(wall)
+            # peretii neinregistrati (previzualizari) nu sunt tinuti in cache
+            if wall in self._ends:
+                self._outlines[wall] = points
+        return points
+
+    def _compute(self, wall: Wall) -> Tuple[Point, ...]:
+        a = node_of(wall.x1, wall.y1)
+        b = node_of(wall.x2, wall.y2)
+        if a == b or _direction(wall, a) is None:
+            return ()
+        la, node_a, ra = self._end(wall, wall.x1, wall.y1, a)
+        lb, node_b, rb = self._end(wall, wall.x2, wall.y2, b)
+        # capatul A: fata stanga, (nodul), fata dreapta; la B fetele sunt inversate
+        return tuple([la] + node_a + [ra, lb] + node_b + [rb])
+
+    def _end(self, wall: Wall, px: float, py: float, node: Node):
+        """(colt stanga, [nod], colt dreapta) la capatul peretelui din nodul dat.
+
+        Stanga si dreapta sunt privite dinspre nod spre interiorul peretelui.
+        """
+        d = _direction(wall, node)
+        h = wall.thickness / 2
+        left_off, right_off = (-d[1] * h, d[0] * h), (d[1] * h, -d[0] * h)
+        left = (px + left_off[0], py + left_off[1])
+        right = (px + right_off[0], py + right_off[1])
+
+        angle = math.atan2(d[1], d[0])
+        ccw = cw = None
+        degree = 1
+        for other in self._nodes.get(node, ()):
+            if other is wall:
+                continue
+            od = _direction(other, node)
+            if od is None:
+                continue
+            gap = (math.atan2(od[1], od[0]) - angle) % (2 * math.pi)
+            if gap < EPS or 2 * math.pi - gap < EPS:
+                # perete suprapus peste acesta: nu delimiteaza nicio fata
+                continue
+            degree += 1
+            if ccw is None or gap < ccw[0]:
+                ccw = (gap, other, od)
+            if cw is None or gap > cw[0]:
+                cw = (gap, other, od)
+        if degree == 1:
+            return left, [], right
+
+        # fata stanga se intalneste cu fata dreapta a vecinului urmator in sens trigonometric
+        _, other, od = ccw
+        oh = other.thickness / 2
+        limit = MITER_LIMIT * max(h, oh)
+        left = _corner(px, py, d, left_off, od, (od[1] * oh, -od[0] * oh), limit) or left
+        # fata dreapta, cu fata stanga a vecinului anterior
+        _, other, od = cw
+        oh = other.thickness / 2
+        limit = MITER_LIMIT * max(h, oh)
+        right = _corner(px, py, d, right_off, od, (-od[1] * oh, od[0] * oh), limit) or right
+        # la trei sau mai multi pereti, colturile se unesc prin centrul nodului
+        return left, [(px, py)] if degree > 2 else [], right
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __contains__(self, wall):
+        return wall in self._ends
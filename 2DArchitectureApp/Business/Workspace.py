@@ -0,0 +1,89 @@
+import os
+from typing import List, Optional
+
+from .ArchitecturalObjects import ArchitecturalObject
+from .ProjectManager import ProjectManager
+
+
+class Workspace:
+    """Documentele deschise in aplicatie, fiecare cu propriul ProjectManager.
+
+    Fiecare document isi pastreaza modelul, istoricul si selectia in memorie,
+    asa ca trecerea de la unul la altul e doar schimbarea documentului activ.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> "Workspace":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.documents: List[ProjectManager] = []
+        self.active_index = -1
+        # copiile facute cu Copiaza, comune tuturor documentelor
+        self.clipboard: List[ArchitecturalObject] = []
+
+    @property
+    def active(self) -> Optional[ProjectManager]:
+        if 0 <= self.active_index < len(self.documents):
+            return self.documents[self.active_index]
+        return None
+
+    def __len__(self):
+        return len(self.documents)
+
+    # ----------------------------- DOCUMENTE -----------------------------
+
+    def new_document(self, name="Proiect Nou", width=1000, height=800) -> ProjectManager:
+        pm = ProjectManager()
+        pm.create_new_project(name, width, height)
+        self.documents.append(pm)
+        self.active_index = len(self.documents) - 1
+        return pm
+
+    def find_document(self, filepath: str) -> int:
+        target = os.path.abspath(filepath)
+        for i, pm in enumerate(self.documents):
+            path = pm.current_project.filepath if pm.current_project else None
+            if path and os.path.abspath(path) == target:
+                return i
+        return -1
+
+    def open_document(self, filepath: str) -> Optional[ProjectManager]:
+        """Deschide un fisier intr-un document nou; daca e deja deschis, il activeaza."""
+        index = self.find_document(filepath)
+        if index >= 0:
+            return self.activate(index)
+
+        pm = ProjectManager()
+        if not pm.load_project(filepath):
+            return None
+        self.documents.append(pm)
+        self.active_index = len(self.documents) - 1
+        return pm
+
+    def activate(self, index: int) -> Optional[ProjectManager]:
+        if not 0 <= index < len(self.documents):
+            return None
+        self.active_index = index
+        return self.documents[index]
+
+    def close_document(self, index: int) -> bool:
+        if not 0 <= index < len(self.documents):
+            return False
+
+        del self.documents[index]
+        if index < self.active_index or self.active_index >= len(self.documents):
+            self.active_index -= 1
+        return True
+
+    def title(self, index: int) -> str:
+        project = self.documents[index].current_project
+        if not project:
+            return "-"
+        if project.filepath:
+            return os.path.basename(project.filepath)
+        return project.name
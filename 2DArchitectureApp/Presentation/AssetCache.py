@@ -0,0 +1,195 @@
+import base64
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QTransform
+
+from Business.AssetPack import AssetPack
+from Business.SymbolLibrary import SymbolInfo, get_symbol, symbols_for_asset
+
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+SIZE_BUCKETS_PER_OCTAVE = 4
+ROTATION_STEP = 5  # grade
+
+
+def _size_bucket(px: float) -> int:
+    #dimensiuni cuantizate logaritmic: 4 trepte per dublare
+    bucket = 0
+    limit = 8.0
+    step = 2 ** (1 / SIZE_BUCKETS_PER_OCTAVE)
+    while limit < px:
+        limit *= step
+        bucket += 1
+    return bucket
+
+
+def _bucket_size(bucket: int) -> float:
+    return 8.0 * (2 ** (bucket / SIZE_BUCKETS_PER_OCTAVE))
+
+
+def decode_svg_image(path: str) -> Optional[QImage]:
+    """Extrage imaginea base64 dintr-un SVG din biblioteca."""
+    for _, el in ET.iterparse(path, events=("end",)):
+        if el.tag.endswith("image"):
+            href = el.get(XLINK_HREF) or el.get("href") or ""
+            if not href.startswith("data:"):
+                return None
+            payload = href.split(",", 1)[1]
+            image = QImage.fromData(base64.b64decode(payload))
+            return None if image.isNull() else image
+    return None
+
+
+class AssetCache(QObject):
+    """Simboluri de mobilier decodate lenes si rasterizate intr-un LRU.
+
+    Daca exista resources/assets.pack, sursele vin direct din pachetul mapat
+    in memorie (nivelul mip potrivit, fara decodare). Altfel, decodarea
+    SVG/base64 ruleaza pe un thread pool. Rasterizarea ruleaza mereu pe pool;
+    paint-ul doar citeste din cache si primeste None cat timp nu e gata.
+    """
+
+    asset_ready = pyqtSignal(str)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'AssetCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024, workers: int = 2):
+        super().__init__()
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.pack = AssetPack.open_default()
+
+        self._sources: Dict[str, QImage] = {}  # simbol -> imagine decodata
+        self._pending_assets: Set[str] = set()
+        self._pending_rasters: Set[Tuple] = set()
+
+        self._rasters: "OrderedDict[Tuple, QImage]" = OrderedDict()
+        self._raster_bytes = 0
+
+    # ----------------------------- BUDGET -----------------------------
+
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = max(0, budget_bytes)
+            self._evict()
+
+    def used_bytes(self) -> int:
+        return self._raster_bytes
+
+    def _evict(self):
+        while self._raster_bytes > self.budget_bytes and self._rasters:
+            _, img = self._rasters.popitem(last=False)
+            self._raster_bytes -= img.sizeInBytes()
+
+    # ----------------------------- LOOKUP -----------------------------
+
+    def get_source(self, symbol_name: str) -> Optional[QImage]:
+        symbol = get_symbol(symbol_name)
+        if symbol is None:
+            return None
+
+        with self._lock:
+            src = self._sources.get(symbol_name)
+            if src is None and symbol.asset not in self._pending_assets:
+                self._pending_assets.add(symbol.asset)
+                self._pool.submit(self._decode_asset, symbol.asset)
+        return src
+
+    def get(self, symbol_name: str, width_px: float, height_px: float,
+            rotation: float, dpr: float = 1.0) -> Tuple[Optional[QImage], float]:
+        """Returneaza (raster, rotatie_reziduala) sau (None, 0) daca nu e gata.
+
+        Raster-ul e deja rotit la treapta cea mai apropiata; apelantul aplica
+        doar rotatia reziduala.
+        """
+        if self.pack is not None and symbol_name in self.pack:
+            level = self.pack.choose_level(symbol_name, width_px * dpr, height_px * dpr)
+            src = self.pack.qimage(symbol_name, level)
+        else:
+            src = self.get_source(symbol_name)
+        if src is None:
+            return None, 0.0
+
+        steps = int(360 / ROTATION_STEP)
+        rot_bucket = int(round(rotation / ROTATION_STEP)) % steps
+        residual = rotation - rot_bucket * ROTATION_STEP
+        residual = (residual + 180) % 360 - 180
+
+        key = (
+            symbol_name,
+            _size_bucket(width_px * dpr),
+            _size_bucket(height_px * dpr),
+            rot_bucket,
+            round(dpr, 2),
+        )
+
+        with self._lock:
+            img = self._rasters.get(key)
+            if img is not None:
+                self._rasters.move_to_end(key)
+                return img, residual
+
+            if key not in self._pending_rasters:
+                self._pending_rasters.add(key)
+                self._pool.submit(self._rasterize, key, src)
+
+        return None, 0.0
+
+    # ----------------------------- WORKERS ----------------------------
+
+    def _decode_asset(self, asset: str):
+        symbols = symbols_for_asset(asset)
+        try:
+            sheet = decode_svg_image(symbols[0].asset_path()) if symbols else None
+        except Exception as e:
+            print(f"Eroare la decodarea asset-ului {asset}: {e}")
+            sheet = None
+
+        decoded = {}
+        if sheet is not None:
+            for s in symbols:
+                decoded[s.name] = self._crop(sheet, s)
+
+        with self._lock:
+            self._sources.update(decoded)
+            self._pending_assets.discard(asset)
+
+        for name in decoded:
+            self.asset_ready.emit(name)
+
+    @staticmethod
+    def _crop(sheet: QImage, symbol: SymbolInfo) -> QImage:
+        img = sheet.copy(*symbol.source_rect) if symbol.source_rect else sheet.copy()
+        return img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+    def _rasterize(self, key: Tuple, src: QImage):
+        name, wb, hb, rot_bucket, dpr = key
+        w = max(1, int(round(_bucket_size(wb))))
+        h = max(1, int(round(_bucket_size(hb))))
+
+        img = src.scaled(w, h, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        img = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        if rot_bucket:
+            img = img.transformed(QTransform().rotate(rot_bucket * ROTATION_STEP),
+                                  Qt.SmoothTransformation)
+        img.setDevicePixelRatio(dpr)
+
+        with self._lock:
+            self._pending_rasters.discard(key)
+            self._rasters[key] = img
+            self._raster_bytes += img.sizeInBytes()
+            self._evict()
+
+        self.asset_ready.emit(name)
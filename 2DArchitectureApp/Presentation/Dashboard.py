@@ -1,8 +1,13 @@
+import importlib
+
 from PyQt5.QtWidgets import (QMainWindow, QStackedWidget)
 
-from .HelpPage import HelpPage
-from .MainPage import MainPage
-from .WorkPage import WorkPage
+# paginile sunt importate si construite abia la prima navigare
+PAGE_CLASSES = {
+    'main': ('.MainPage', 'MainPage'),
+    'work': ('.WorkPage', 'WorkPage'),
+    'help': ('.HelpPage', 'HelpPage'),
+}
 
 
 class Dashboard(QMainWindow):
@@ -21,26 +26,25 @@ class Dashboard(QMainWindow):
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
 
-        # Creare pagini
-        self.pages['main'] = MainPage(self)
-        self.pages['work'] = WorkPage(self)
-        self.pages['help'] = HelpPage(self)
-
-        # Adaugare pagini la stack
-        for page in self.pages.values():
-            self.stacked_widget.addWidget(page)
-
         # Setare pagina initiala
         self.page = 'main'
-        self.stacked_widget.setCurrentWidget(self.pages['main'])
+        self.stacked_widget.setCurrentWidget(self.get_page('main'))
+
+    def get_page(self, page_name):
+        page = self.pages.get(page_name)
+        if page is None:
+            module_name, class_name = PAGE_CLASSES[page_name]
+            module = importlib.import_module(module_name, __package__)
+            page = getattr(module, class_name)(self)
+            self.pages[page_name] = page
+            self.stacked_widget.addWidget(page)
+        return page
 
     def update_page(self, page_name):
-        if page_name in self.pages:
+        if page_name in PAGE_CLASSES:
             self.previous_page = self.page
             self.page = page_name
-            self.stacked_widget.setCurrentWidget(self.pages[page_name])
+            self.stacked_widget.setCurrentWidget(self.get_page(page_name))
 
     def run(self):
         self.show()
-
-
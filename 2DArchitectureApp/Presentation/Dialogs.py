@@ -0,0 +1,69 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QWidget, QTabWidget, QSpinBox,
+    QDoubleSpinBox, QDialogButtonBox
+)
+
+
+def _spin(value, low, high):
+    box = QSpinBox()
+    box.setRange(low, high)
+    box.setValue(value)
+    return box
+
+
+def _length(value, low=-100000.0, high=100000.0):
+    box = QDoubleSpinBox()
+    box.setRange(low, high)
+    box.setDecimals(1)
+    box.setValue(value)
+    return box
+
+
+class ArrayDialog(QDialog):
+    """Parametrii multiplicarii selectiei: pe grila sau in jurul unui punct."""
+
+    def __init__(self, parent=None, size=(100.0, 100.0), center=(0.0, 0.0)):
+        super().__init__(parent)
+        self.setWindowTitle("Multiplicare")
+
+        self.tabs = QTabWidget()
+
+        grid = QWidget()
+        form = QFormLayout()
+        self.rows = _spin(1, 1, 1000)
+        self.cols = _spin(3, 1, 1000)
+        # pasul implicit: dimensiunea selectiei, copiile se ating fara sa se suprapuna
+        self.dx = _length(size[0])
+        self.dy = _length(size[1])
+        form.addRow("Rânduri", self.rows)
+        form.addRow("Coloane", self.cols)
+        form.addRow("Pas X (px)", self.dx)
+        form.addRow("Pas Y (px)", self.dy)
+        grid.setLayout(form)
+        self.tabs.addTab(grid, "Rectangular")
+
+        polar = QWidget()
+        form = QFormLayout()
+        self.count = _spin(4, 2, 1000)
+        self.angle = _length(360.0, -360.0, 360.0)
+        self.cx = _length(center[0])
+        self.cy = _length(center[1])
+        form.addRow("Exemplare", self.count)
+        form.addRow("Unghi total (°)", self.angle)
+        form.addRow("Centru X (px)", self.cx)
+        form.addRow("Centru Y (px)", self.cy)
+        polar.setLayout(form)
+        self.tabs.addTab(polar, "Polar")
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        v = QVBoxLayout()
+        v.addWidget(self.tabs)
+        v.addWidget(buttons)
+        self.setLayout(v)
+
+    @property
+    def polar(self) -> bool:
+        return self.tabs.currentIndex() == 1
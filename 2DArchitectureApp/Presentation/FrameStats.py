@@ -0,0 +1,103 @@
+import csv
+import time
+from typing import Dict, List, Optional
+
+PHASES = ("underlay", "grid", "load", "walls", "doors", "windows", "furniture", "annotations", "overlay")
+
+
+class FrameStats:
+    """Ring buffer cu timpii fiecarui paintEvent, defalcati pe faze.
+
+    Cand `enabled` e False, canvas-ul nu apeleaza nimic de aici, deci
+    instrumentarea nu costa nimic.
+    """
+
+    def __init__(self, capacity: int = 600):
+        self.capacity = capacity
+        self.enabled = False
+
+        # fiecare cadru: (timestamp, total_ms, desenate, total_obiecte, *faze_ms)
+        self._frames: List[Optional[tuple]] = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+        self._current: Dict[str, float] = {}
+
+    # ----------------------------- RECORD -----------------------------
+
+    def begin_frame(self):
+        self._current = {}
+
+    def phase(self, name: str, seconds: float):
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def end_frame(self, total_seconds: float, drawn: int, total_objects: int):
+        record = (
+            time.perf_counter(),
+            total_seconds * 1000,
+            drawn,
+            total_objects,
+        ) + tuple(self._current.get(p, 0.0) * 1000 for p in PHASES)
+
+        self._frames[self._next] = record
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self):
+        self._frames = [None] * self.capacity
+        self._next = 0
+        self._count = 0
+
+    # ----------------------------- QUERY ------------------------------
+
+    def frames(self) -> List[tuple]:
+        """Cadrele din buffer, de la cel mai vechi la cel mai nou."""
+        if self._count < self.capacity:
+            return self._frames[:self._count]
+        return self._frames[self._next:] + self._frames[:self._next]
+
+    def last(self) -> Optional[tuple]:
+        if not self._count:
+            return None
+        return self._frames[(self._next - 1) % self.capacity]
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], p: float) -> float:
+        if not sorted_values:
+            return 0.0
+        idx = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+        return sorted_values[idx]
+
+    def percentiles(self) -> Dict[str, float]:
+        totals = sorted(f[1] for f in self.frames())
+        return {
+            "p50": self._percentile(totals, 50),
+            "p95": self._percentile(totals, 95),
+            "p99": self._percentile(totals, 99),
+        }
+
+    def fps(self, window: float = 1.0) -> float:
+        #cadre in ultima secunda
+        now = time.perf_counter()
+        recent = [f[0] for f in self.frames() if now - f[0] <= window]
+        if len(recent) < 2:
+            return float(len(recent))
+        span = recent[-1] - recent[0]
+        return (len(recent) - 1) / span if span > 0 else 0.0
+
+    # ----------------------------- EXPORT -----------------------------
+
+    def to_csv(self, path: str) -> int:
+        frames = self.frames()
+        if not frames:
+            return 0
+        t0 = frames[0][0]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["t_ms", "total_ms", "drawn", "total_objects"]
+                            + [f"{p}_ms" for p in PHASES])
+            for fr in frames:
+                writer.writerow([f"{(fr[0] - t0) * 1000:.3f}"]
+                                + [f"{fr[1]:.3f}", fr[2], fr[3]]
+                                + [f"{v:.3f}" for v in fr[4:]])
+        return len(frames)
@@ -0,0 +1,495 @@
+import math
+import time
+from functools import lru_cache
+from itertools import chain, groupby
+from weakref import WeakKeyDictionary
+
+from PyQt5.QtGui import (
+    QPainter, QColor, QPen, QBrush, QImage, QPixmap, QFont, QStaticText, QTransform, QPolygonF
+)
+from PyQt5.QtCore import Qt, QRect, QRectF, QPointF, QLineF
+
+from Business.ArchitecturalObjects import Wall, Door, Window, Furniture, plan_bounds
+from Business.SymbolLibrary import get_symbol
+from Business.Tracing import traced
+
+SELECTED_COLOR = "#FF5722"
+WINDOW_FILL = (173, 216, 230, 150)
+GRID_TILE_CELLS = 10
+MAX_GRID_TILE = 2048
+DIM_COLOR = (60, 60, 140)
+# cotele mai scurte de atat pe ecran nu sunt desenate (planul e prea micsorat)
+MIN_DIM_PX = 48
+DIM_TICK = 4
+# inaltimea benzilor in care e redesenat un strat dupa zoom, in pixeli de ecran
+REFINE_BAND = 64
+
+
+# ======================== RESURSE PARTAJATE =========================
+# Pen-urile, brush-urile si tile-urile de grila nu depind de document, deci
+# sunt create o singura data pentru toate documentele deschise.
+
+@lru_cache(maxsize=512)
+def cached_pen(color, width: int = 2) -> QPen:
+    return QPen(QColor(*color) if isinstance(color, tuple) else QColor(color), width)
+
+
+@lru_cache(maxsize=256)
+def cached_brush(color) -> QBrush:
+    return QBrush(QColor(*color) if isinstance(color, tuple) else QColor(color))
+
+
+@lru_cache(maxsize=32)
+def grid_tile(step: int) -> QPixmap:
+    """Un tile de GRID_TILE_CELLS x GRID_TILE_CELLS celule, cu linia groasa la 0."""
+    size = step * GRID_TILE_CELLS
+    tile = QPixmap(size, size)
+    tile.fill(Qt.white)
+
+    painter = QPainter(tile)
+    for i in range(GRID_TILE_CELLS):
+        painter.setPen(cached_pen((180, 180, 180) if i == 0 else (220, 220, 220), 1))
+        painter.drawLine(i * step, 0, i * step, size)
+        painter.drawLine(0, i * step, size, i * step)
+    painter.end()
+    return tile
+
+
+@lru_cache(maxsize=1)
+def dim_font() -> QFont:
+    return QFont("Arial", 8)
+
+
+@lru_cache(maxsize=8192)
+def static_label(text: str) -> QStaticText:
+    """Textul unei cote cu layout-ul glifelor calculat o singura data."""
+    label = QStaticText(text)
+    label.setTextFormat(Qt.PlainText)
+    label.setPerformanceHint(QStaticText.AggressiveCaching)
+    label.prepare(QTransform(), dim_font())
+    return label
+
+
+class LayerCache:
+    """Cate un raster per strat, de dimensiunea vederii.
+
+    Un strat e redesenat doar cand i se schimba cheia (revizia stratului,
+    zoom, dimensiune); ascunderea sau afisarea unui strat schimba doar
+    compunerea rasterelor. La pan rasterul e deplasat pe loc si sunt
+    desenate doar fasiile descoperite.
+    """
+
+    def __init__(self):
+        # nume -> (cheie, pixmap, offset, zoom)
+        self._layers = {}
+        # rasterele in curs de redesenare pe benzi: nume -> [tinta, pixmap, y]
+        self._pending = {}
+
+    def get(self, name, key, width: int, height: int, dpr: float, render,
+            offset=(0, 0), scale: float = 1.0):
+        """(pixmap, redesenat): rasterul stratului, refacut cu render(painter, rect) daca e invalid.
+
+        `rect` e None la redesenarea completa, altfel fasia (in pixeli de ecran)
+        descoperita de pan; painter-ul e deja limitat la ea.
+        """
+        entry = self._layers.get(name)
+        size = (max(1, int(width * dpr)), max(1, int(height * dpr)))
+        self._pending.pop(name, None)
+        if entry is not None and entry[0] == key and entry[3] == scale:
+            pixmap, old = entry[1], entry[2]
+            if old == offset:
+                return pixmap, False
+            strips = self.exposed(offset[0] - old[0], offset[1] - old[1], width, height, dpr)
+            if strips is not None and (pixmap.width(), pixmap.height()) == size:
+                dx, dy = round((offset[0] - old[0]) * dpr), round((offset[1] - old[1]) * dpr)
+                pixmap.scroll(dx, dy, pixmap.rect())
+                painter = QPainter(pixmap)
+                painter.setRenderHint(QPainter.Antialiasing)
+                for rect in strips:
+                    painter.save()
+                    painter.setClipRect(rect)
+                    painter.setCompositionMode(QPainter.CompositionMode_Source)
+                    painter.fillRect(rect, Qt.transparent)
+                    painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+                    render(painter, rect)
+                    painter.restore()
+                painter.end()
+                self._layers[name] = (key, pixmap, offset, scale)
+                return pixmap, True
+
+        if entry is not None and (entry[1].width(), entry[1].height()) == size:
+            pixmap = entry[1]
+        else:
+            pixmap = QPixmap(*size)
+            pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        render(painter, None)
+        painter.end()
+
+        self._layers[name] = (key, pixmap, offset, scale)
+        return pixmap, True
+
+    def last(self, name):
+        """(pixmap, offset, zoom) ultimului raster al stratului, oricare ar fi vederea lui."""
+        entry = self._layers.get(name)
+        return None if entry is None else entry[1:]
+
+    def refine(self, name, key, width: int, height: int, dpr: float, render,
+               offset, scale: float, deadline: float) -> bool:
+        """Redeseneaza stratul in benzi orizontale, pana la `deadline` (time.perf_counter).
+
+        Rasterul nou e construit separat si inlocuieste ultimul raster abia cand
+        e complet; intoarce True atunci. Apelurile urmatoare continua de la banda
+        la care s-a ramas, cat timp vederea si continutul nu se schimba.
+        """
+        entry = self._layers.get(name)
+        if entry is not None and entry[0] == key and entry[2:] == (offset, scale):
+            return True
+
+        target = (key, offset, scale, width, height, dpr)
+        pending = self._pending.get(name)
+        if pending is None or pending[0] != target:
+            pixmap = QPixmap(max(1, int(width * dpr)), max(1, int(height * dpr)))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            pending = self._pending[name] = [target, pixmap, 0]
+
+        _, pixmap, y = pending
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        while y < height:
+            rect = QRect(0, y, width, min(REFINE_BAND, height - y))
+            painter.save()
+            painter.setClipRect(rect)
+            render(painter, rect)
+            painter.restore()
+            y += REFINE_BAND
+            if time.perf_counter() >= deadline:
+                break
+        painter.end()
+
+        if y < height:
+            pending[2] = y
+            return False
+        del self._pending[name]
+        self._layers[name] = (key, pixmap, offset, scale)
+        return True
+
+    @staticmethod
+    def exposed(dx: float, dy: float, width: int, height: int, dpr: float):
+        """Fasiile descoperite de o deplasare (dx, dy), fara suprapuneri; None daca nu merita.
+
+        Deplasarea trebuie sa fie un numar intreg de pixeli fizici, altfel
+        rasterul mutat nu s-ar mai potrivi cu cel desenat din nou.
+        """
+        if abs(dx) >= width or abs(dy) >= height:
+            return None
+        if abs(dx * dpr - round(dx * dpr)) > 1e-6 or abs(dy * dpr - round(dy * dpr)) > 1e-6:
+            return None
+        # fasiile, rotunjite in afara la pixeli logici intregi
+        left, right = (math.ceil(dx), 0) if dx > 0 else (0, math.ceil(-dx))
+        top, bottom = (math.ceil(dy), 0) if dy > 0 else (0, math.ceil(-dy))
+        strips = []
+        if left:
+            strips.append(QRect(0, 0, left, height))
+        if right:
+            strips.append(QRect(width - right, 0, right, height))
+        inner = width - left - right
+        if top and inner > 0:
+            strips.append(QRect(left, 0, inner, top))
+        if bottom and inner > 0:
+            strips.append(QRect(left, height - bottom, inner, bottom))
+        return strips
+
+    def clear(self):
+        self._layers = {}
+        self._pending = {}
+
+
+class PlanRenderer:
+    """Desenarea planului pe orice QPainter (widget, QImage offscreen).
+
+    Nu depinde de niciun widget; SimpleCanvas si exportul headless folosesc
+    acelasi cod. `assets` e optional: fara el mobilierul e desenat ca
+    dreptunghiuri simple.
+    """
+
+    def __init__(self, assets=None):
+        self.assets = assets
+        # perete -> (contur, QPolygonF); intrarile dispar odata cu peretii
+        self._polygons = WeakKeyDictionary()
+
+    # =============================== GRID ===============================
+
+    @traced("PlanRenderer.draw_grid", "paint")
+    def draw_grid(self, painter, grid_size: int, scale: float,
+                  offset_x: float, offset_y: float, width: int, height: int):
+        step = int(grid_size * scale)
+        if step <= 2:
+            return
+
+        start_x = -offset_x
+        start_y = -offset_y
+        end_x = start_x + width
+        end_y = start_y + height
+
+        tile_size = step * GRID_TILE_CELLS
+        if tile_size <= MAX_GRID_TILE:
+            painter.drawTiledPixmap(
+                QRectF(start_x, start_y, width, height), grid_tile(step),
+                QPointF(start_x % tile_size, start_y % tile_size)
+            )
+            return
+
+        first_x = start_x - (start_x % step)
+        first_y = start_y - (start_y % step)
+
+        pen_main = cached_pen((220, 220, 220), 1)
+        pen_bold = cached_pen((180, 180, 180), 1)
+
+        x = first_x
+        while x < end_x + step:
+            idx = int(x // step)
+            painter.setPen(pen_bold if idx % 10 == 0 else pen_main)
+            painter.drawLine(int(x), int(start_y), int(x), int(end_y))
+            x += step
+
+        y = first_y
+        while y < end_y + step:
+            idx = int(y // step)
+            painter.setPen(pen_bold if idx % 10 == 0 else pen_main)
+            painter.drawLine(int(start_x), int(y), int(end_x), int(y))
+            y += step
+
+    # ============================== OBJECTS =============================
+
+    def draw_objects(self, painter, pm, scale: float, dpr: float = 1.0, stats=None) -> int:
+        """Deseneaza straturile vizibile in ordinea din display list; returneaza cate obiecte."""
+        drawn = 0
+        for name in pm.layer_names():
+            if name is None or pm.is_layer_visible(name):
+                drawn += self.draw_layer(painter, pm, name, scale, dpr, stats)
+        return drawn
+
+    def draw_layer(self, painter, pm, name, scale: float, dpr: float = 1.0, stats=None,
+                   view=None) -> int:
+        """Deseneaza obiectele unui singur strat.
+
+        Obiectele consecutive de acelasi tip sunt desenate de aceeasi functie.
+        Cu `stats` (FrameStats) fiecare tip e cronometrat ca faza separata.
+        Cu `view` (x, y, w, h, in coordonate plan) sunt desenate doar obiectele din zona.
+        """
+        drawers = {
+            Wall: ("walls", lambda p, items, s: self.draw_walls(p, items, s, pm.wall_outlines)),
+            Door: ("doors", self.draw_doors),
+            Window: ("windows", self.draw_windows),
+            Furniture: ("furniture", lambda p, items, s: self.draw_furniture(p, items, s, dpr)),
+        }
+
+        drawn = 0
+        for obj_type, run in groupby(pm.layer_objects(name, view), key=type):
+            phase, fn = drawers[obj_type]
+            if stats is None:
+                drawn += fn(painter, run, scale)
+                continue
+            t = time.perf_counter()
+            drawn += fn(painter, run, scale)
+            stats.phase(phase, time.perf_counter() - t)
+        return drawn
+
+    @traced("PlanRenderer.draw_walls", "paint")
+    def draw_walls(self, painter, walls, scale: float, outlines) -> int:
+        """Peretii ca poligoane de contur (WallOutlines), cu imbinarile deja calculate."""
+        painter.save()
+        painter.scale(scale, scale)
+        n = 0
+        for n, w in enumerate(walls, 1):
+            points = outlines.outline(w)
+            if not points:
+                continue
+            color = SELECTED_COLOR if w.selected else w.color
+            # creion cosmetic de 1px: acopera rosturile dintre poligoane vecine
+            # si pastreaza vizibili peretii subtiri la zoom mic
+            painter.setPen(cached_pen(color, 0))
+            painter.setBrush(cached_brush(color))
+            painter.drawPolygon(self._polygon(w, points))
+        painter.restore()
+        return n
+
+    def _polygon(self, wall, points) -> QPolygonF:
+        # conturul se schimba doar cand WallOutlines il recalculeaza (alt tuplu)
+        entry = self._polygons.get(wall)
+        if entry is None or entry[0] is not points:
+            entry = self._polygons[wall] = (points, QPolygonF([QPointF(x, y) for x, y in points]))
+        return entry[1]
+
+    @staticmethod
+    def _rotate_about_center(painter, o, scale: float):
+        cx = (o.x + o.width / 2) * scale
+        cy = (o.y + o.height / 2) * scale
+
+        painter.translate(cx, cy)
+        painter.rotate(o.rotation)
+        painter.translate(-cx, -cy)
+
+    @traced("PlanRenderer.draw_doors", "paint")
+    def draw_doors(self, painter, doors, scale: float) -> int:
+        to_scr = lambda v: int(v * scale)
+
+        n = 0
+        for n, d in enumerate(doors, 1):
+            painter.save()
+            self._rotate_about_center(painter, d, scale)
+
+            sx, sy = to_scr(d.x), to_scr(d.y)
+            sw, sh = to_scr(d.width), to_scr(d.height)
+            color = SELECTED_COLOR if d.selected else d.color
+            painter.setPen(cached_pen(color))
+            painter.setBrush(cached_brush(color))
+            painter.drawRect(sx, sy, sw, sh)
+
+            painter.restore()
+        return n
+
+    @traced("PlanRenderer.draw_windows", "paint")
+    def draw_windows(self, painter, windows, scale: float) -> int:
+        to_scr = lambda v: int(v * scale)
+
+        n = 0
+        for n, w in enumerate(windows, 1):
+            painter.save()
+            self._rotate_about_center(painter, w, scale)
+
+            sx, sy = to_scr(w.x), to_scr(w.y)
+            sw, sh = to_scr(w.width), to_scr(w.height)
+            color = SELECTED_COLOR if w.selected else w.color
+            painter.setPen(cached_pen(color))
+            painter.setBrush(cached_brush(WINDOW_FILL))
+            painter.drawRect(sx, sy, sw, sh)
+
+            painter.restore()
+        return n
+
+    @traced("PlanRenderer.draw_furniture", "paint")
+    def draw_furniture(self, painter, furniture, scale: float, dpr: float = 1.0) -> int:
+        to_scr = lambda v: int(v * scale)
+
+        n = 0
+        for n, f in enumerate(furniture, 1):
+            painter.save()
+            self._rotate_about_center(painter, f, scale)
+
+            sx, sy = to_scr(f.x), to_scr(f.y)
+            sw, sh = to_scr(f.width), to_scr(f.height)
+            color = SELECTED_COLOR if f.selected else f.color
+
+            if get_symbol(f.furniture_type) and self.draw_symbol(painter, f, scale, dpr):
+                painter.setPen(cached_pen(color) if f.selected else Qt.NoPen)
+                painter.setBrush(Qt.NoBrush)
+            else:
+                # placeholder cat timp simbolul nu e decodat
+                painter.setPen(cached_pen(color))
+                painter.setBrush(cached_brush(color))
+            painter.drawRect(sx, sy, sw, sh)
+
+            painter.restore()
+        return n
+
+    # =============================== COTE ===============================
+
+    @traced("PlanRenderer.draw_dimensions", "paint")
+    def draw_dimensions(self, painter, pm, scale: float, view=None) -> int:
+        """Cotele automate (stratul de adnotari); `view` e zona vizibila, in coordonate plan."""
+        lines = []
+        labels = []
+        for dims in pm.visible_dimensions(view, MIN_DIM_PX / scale):
+            # prima cota e cea mai lunga (peretele intreg sau gabaritul)
+            if not dims or dims[0].length * scale < MIN_DIM_PX:
+                continue
+            for d in dims:
+                if d.length * scale < MIN_DIM_PX:
+                    continue
+                x1, y1 = d.x1 * scale, d.y1 * scale
+                x2, y2 = d.x2 * scale, d.y2 * scale
+                ax, ay = x1 + d.nx * scale, y1 + d.ny * scale
+                bx, by = x2 + d.nx * scale, y2 + d.ny * scale
+                lines += (
+                    QLineF(x1, y1, ax, ay), QLineF(x2, y2, bx, by), QLineF(ax, ay, bx, by),
+                    QLineF(ax - DIM_TICK, ay + DIM_TICK, ax + DIM_TICK, ay - DIM_TICK),
+                    QLineF(bx - DIM_TICK, by + DIM_TICK, bx + DIM_TICK, by - DIM_TICK),
+                )
+                labels.append((d.text, ax, ay, bx, by, d.length * scale))
+
+        if not lines:
+            return 0
+
+        painter.setPen(cached_pen(DIM_COLOR, 1))
+        painter.drawLines(lines)
+
+        painter.setFont(dim_font())
+        for text, ax, ay, bx, by, screen_len in labels:
+            label = static_label(text)
+            size = label.size()
+            if size.width() + 4 > screen_len:
+                continue
+            angle = math.degrees(math.atan2(by - ay, bx - ax))
+            if angle == 0 or angle == 180:
+                painter.drawStaticText(QPointF((ax + bx - size.width()) / 2, ay - size.height() - 1), label)
+                continue
+            # textul nu e niciodata rasturnat
+            if angle >= 90 or angle < -90:
+                angle -= 180
+            painter.save()
+            painter.translate((ax + bx) / 2, (ay + by) / 2)
+            painter.rotate(angle)
+            painter.drawStaticText(QPointF(-size.width() / 2, -size.height() - 1), label)
+            painter.restore()
+        return len(labels)
+
+    def draw_symbol(self, painter, f, scale: float, dpr: float = 1.0) -> bool:
+        if self.assets is None:
+            return False
+
+        w = f.width * scale
+        h = f.height * scale
+        img, residual = self.assets.get(f.furniture_type, w, h, f.rotation, dpr)
+        if img is None:
+            return False
+
+        # painter-ul e deja rotit cu f.rotation; raster-ul e rotit la treapta
+        base = f.rotation - residual
+        painter.save()
+        painter.translate((f.x + f.width / 2) * scale, (f.y + f.height / 2) * scale)
+        painter.rotate(-base)
+
+        rad = math.radians(base)
+        bw = abs(w * math.cos(rad)) + abs(h * math.sin(rad))
+        bh = abs(w * math.sin(rad)) + abs(h * math.cos(rad))
+
+        painter.setCompositionMode(QPainter.CompositionMode_Multiply)
+        painter.drawImage(QRectF(-bw / 2, -bh / 2, bw, bh), img)
+        painter.restore()
+        return True
+
+    # ============================== EXPORT ==============================
+
+    @traced("PlanRenderer.render_image", "paint")
+    def render_image(self, pm, scale: float = 1.0, margin: float = 20,
+                     max_side: int = 8000) -> QImage:
+        """Randeaza tot planul intr-un QImage (fara widget)."""
+        x, y, w, h = plan_bounds(pm._walls, chain(pm._doors, pm._windows, pm._furniture), margin)
+        scale = min(scale, max_side / max(w, h, 1))
+
+        image = QImage(max(1, int(w * scale)), max(1, int(h * scale)),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.white)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(-x * scale, -y * scale)
+        self.draw_objects(painter, pm, scale)
+        painter.end()
+        return image
@@ -0,0 +1,123 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from Business.Underlay import Pyramid
+
+
+class UnderlayCache(QObject):
+    """Tile-urile fundalului, citite de pe disc pe thread-uri si tinute intr-un LRU.
+
+    Paint-ul cere tile-urile vederii curente si primeste None pentru cele care
+    nu sunt inca in memorie. Cererile vechi (din vederi deja parasite) sunt
+    abandonate la inceputul fiecarui frame, iar cele noi sunt servite primele,
+    ca la pan si zoom rapid sa nu se astepte dupa tile-uri care nu mai sunt vizibile.
+    """
+
+    tile_ready = pyqtSignal()
+    build_progress = pyqtSignal(float)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'UnderlayCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, budget_bytes: int = 192 * 1024 * 1024, workers: int = 2):
+        super().__init__()
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Condition()
+        self._pyramids: Dict[str, Pyramid] = {}
+        self._building: Optional[str] = None
+        self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="underlay-build")
+
+        self._tiles: "OrderedDict[Tuple, QImage]" = OrderedDict()
+        self._bytes = 0
+        # cererile in asteptare, cele mai noi la sfarsit
+        self._wanted: "OrderedDict[Tuple, Pyramid]" = OrderedDict()
+        self._requested_now = set()
+        self._loading = set()
+        for _ in range(workers):
+            threading.Thread(target=self._load_loop, name="underlay-tiles", daemon=True).start()
+
+    # ----------------------------- PIRAMIDE ----------------------------
+
+    def pyramid(self, source: str) -> Optional[Pyramid]:
+        """Piramida imaginii; daca nu e completa, construirea porneste in fundal."""
+        pyramid = self._pyramids.get(source)
+        if pyramid is None:
+            try:
+                pyramid = Pyramid.for_source(source)
+            except Exception as e:
+                print(f"Eroare la deschiderea fundalului {source}: {e}")
+                return None
+            self._pyramids[source] = pyramid
+        if not pyramid.complete and self._building is None:
+            self._building = source
+            self._builder.submit(self._build, pyramid)
+        return pyramid
+
+    def _build(self, pyramid: Pyramid):
+        try:
+            pyramid.build(progress=self.build_progress.emit,
+                          on_level=lambda _level: self.tile_ready.emit())
+        except Exception as e:
+            print(f"Eroare la construirea piramidei pentru {pyramid.source}: {e}")
+        finally:
+            self._building = None
+            self.tile_ready.emit()
+
+    # ------------------------------ TILE-URI ---------------------------
+
+    def begin_frame(self):
+        """Uita cererile care nu au fost repetate in frame-ul anterior."""
+        with self._lock:
+            for key in [k for k in self._wanted if k not in self._requested_now]:
+                del self._wanted[key]
+            self._requested_now = set()
+
+    def peek(self, pyramid: Pyramid, level: int, tx: int, ty: int) -> Optional[QImage]:
+        with self._lock:
+            return self._tiles.get((pyramid.dir, level, tx, ty))
+
+    def tile(self, pyramid: Pyramid, level: int, tx: int, ty: int) -> Optional[QImage]:
+        key = (pyramid.dir, level, tx, ty)
+        with self._lock:
+            img = self._tiles.get(key)
+            if img is not None:
+                self._tiles.move_to_end(key)
+                return img
+            if level in pyramid.ready and key not in self._loading:
+                self._requested_now.add(key)
+                self._wanted[key] = pyramid
+                self._wanted.move_to_end(key)
+                self._lock.notify()
+        return None
+
+    def _load_loop(self):
+        while True:
+            with self._lock:
+                while not self._wanted:
+                    self._lock.wait()
+                key, pyramid = self._wanted.popitem(last=True)
+                self._loading.add(key)
+            _, level, tx, ty = key
+            img = QImage(pyramid.tile_path(level, tx, ty))
+            if not img.isNull():
+                img = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            with self._lock:
+                self._loading.discard(key)
+                if img.isNull():
+                    continue
+                self._tiles[key] = img
+                self._bytes += img.sizeInBytes()
+                while self._bytes > self.budget_bytes and len(self._tiles) > 1:
+                    _, old = self._tiles.popitem(last=False)
+                    self._bytes -= old.sizeInBytes()
+            self.tile_ready.emit()
@@ -1,19 +1,53 @@
 import math
 import os
 import sys
+import time
+from datetime import datetime
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QGroupBox,
-    QMessageBox, QFileDialog, QSpinBox, QCheckBox, QShortcut
+    QMessageBox, QFileDialog, QSpinBox, QCheckBox, QShortcut, QComboBox, QTabBar,
+    QProgressDialog, QApplication, QInputDialog
 )
-from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QKeySequence
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from Business.ArchitecturalObjects import Transform
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QKeySequence
+from PyQt5.QtCore import Qt, QTimer, QRectF, pyqtSignal
+from Business.ArchitecturalObjects import Furniture
+from Business.DxfImport import import_dxf
+from Business.Placement import group_center, polar_center
+from Business.SpatialIndex import obstacle_box
+from Business.SymbolLibrary import SYMBOLS
+from Business.Tracing import tracer, traced
+from Business.Underlay import TILE
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .Page import Page
+from .AssetCache import AssetCache
+from .PlanRenderer import PlanRenderer, LayerCache
+from .FrameStats import FrameStats, PHASES
+from .UnderlayCache import UnderlayCache
+from .Dialogs import ArrayDialog
 from Business.ProjectManager import ProjectManager
+from Business.Workspace import Workspace
+
+
+LAYER_LABELS = {
+    "structure": "Structură",
+    "doors_windows": "Uși și ferestre",
+    "furniture": "Mobilier",
+    "annotations": "Adnotări",
+}
+
+# raza de snap a unealtei de masurare, in pixeli de ecran
+SNAP_RADIUS_PX = 10
+# cat depasesc contururile (creion, antialiasing) dreptunghiul unui obiect, in pixeli de ecran
+STRIP_PAD_PX = 4
+# zoom progresiv: pauza rotitei dupa care straturile sunt redesenate si
+# cat timp dintr-un cadru poate lua redesenarea
+ZOOM_SETTLE_MS = 150
+REFINE_SLICE_MS = 12
+MEASURE_COLOR = QColor(33, 110, 200)
+CLEARANCE_COLOR = QColor(214, 91, 44)
 
 
 # =====================================================================
@@ -25,17 +59,37 @@ class SimpleCanvas(QWidget):
     project_changed_signal = pyqtSignal()
     status_message_signal = pyqtSignal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, pm=None):
         super().__init__(parent)
 
         self.is_rotating = False
         self.rotate_start_angle = 0.0
         self.initial_rotation = 0.0
-        self.pm = ProjectManager()
+        self.rotate_applied = 0.0
+        self.pm = pm if pm is not None else ProjectManager()
+        self.assets = AssetCache.instance()
+        self.assets.asset_ready.connect(self.on_asset_ready)
+        self.underlays = UnderlayCache.instance()
+        self.underlays.tile_ready.connect(self.update)
+        self.renderer = PlanRenderer(self.assets)
+        # un raster per strat; assets_epoch invalideaza stratul de mobilier cand
+        # un simbol termina de decodat
+        self.layer_cache = LayerCache()
+        self.assets_epoch = 0
+        self.frame_stats = FrameStats()
+        self.furniture_type = "mobilier"
 
         self.offset_x = 0
         self.offset_y = 0
         self.is_panning = False
+        # zoom progresiv: zoom_preview cat timp se roteste rotita, refining pana
+        # cand toate straturile sunt redesenate la noul zoom
+        self.zoom_preview = False
+        self.refining = False
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(ZOOM_SETTLE_MS)
+        self.zoom_timer.timeout.connect(self.refine_zoom)
         self.last_pan_x = 0
         self.last_pan_y = 0
 
@@ -50,13 +104,31 @@ class SimpleCanvas(QWidget):
         self.is_moving = False
         self.drag_start_x = 0
         self.drag_start_y = 0
+        # mobilier tras peste obstacole: unde ar fi vrut utilizatorul sa ajunga
+        # si cea mai apropiata pozitie libera (coltul stanga-sus)
+        self.drag_origin = (0, 0)
+        self.drag_anchor = (0, 0)
+        self.drop_suggestion = None
+
+        # unealta de masurare: segmentul masurat si punctul de snap de sub mouse
+        self.measure = None
+        self.snap = None
+        # distantele libere ale obiectului selectat fata de vecini
+        self.show_clearances = True
+        # cotele automate, desenate pe stratul de adnotari
+        self.show_dimensions = False
 
         self.setMinimumSize(600, 400)
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.StrongFocus)
 
     # =============================== DRAW ===============================
+    @traced("SimpleCanvas.paintEvent", "paint")
     def paintEvent(self, e):
+        if self.frame_stats.enabled:
+            self.paint_instrumented()
+            return
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.fillRect(self.rect(), Qt.white)
@@ -64,125 +136,294 @@ class SimpleCanvas(QWidget):
         scale = self.pm.get_view_scale()
         painter.translate(self.offset_x, self.offset_y)
 
+        self.draw_underlay(painter, scale)
         if self.pm.current_project and self.pm.current_project.grid_visible:
             self.draw_grid(painter, scale)
 
-        self.draw_objects(painter, scale)
+        self.load_view(scale)
+        self.draw_layers(painter, scale)
+        self.draw_pending_tiles(painter, scale)
 
         if self.is_drawing and self.current_tool:
             self.draw_preview(painter, scale)
+        if self.drop_suggestion:
+            self.draw_drop_suggestion(painter, scale)
+        self.draw_measurements(painter, scale)
 
-    def draw_grid(self, painter, scale: float):
-        if not self.pm.current_project:
-            return
-
-        grid_size = self.pm.current_project.grid_size
-        step = int(grid_size * scale)
-        if step <= 2:
-            return
-
-        width = self.width()
-        height = self.height()
+    def paint_instrumented(self):
+        # acelasi paint, cu fiecare faza cronometrata; folosit doar cu HUD-ul pornit
+        stats = self.frame_stats
+        stats.begin_frame()
+        t_frame = time.perf_counter()
 
-        start_x = -self.offset_x
-        start_y = -self.offset_y
-        end_x = start_x + width
-        end_y = start_y + height
-
-        first_x = start_x - (start_x % step)
-        first_y = start_y - (start_y % step)
-
-        pen_main = QPen(QColor(220, 220, 220))
-        pen_bold = QPen(QColor(180, 180, 180))
-        pen_main.setWidth(1)
-        pen_bold.setWidth(1)
-
-        x = first_x
-        while x < end_x + step:
-            idx = int(x // step)
-            painter.setPen(pen_bold if idx % 10 == 0 else pen_main)
-            painter.drawLine(int(x), int(start_y), int(x), int(end_y))
-            x += step
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), Qt.white)
 
-        y = first_y
-        while y < end_y + step:
-            idx = int(y // step)
-            painter.setPen(pen_bold if idx % 10 == 0 else pen_main)
-            painter.drawLine(int(start_x), int(y), int(end_x), int(y))
-            y += step
-    #MODIFICARE PT ROTIRE
-    def draw_objects(self, painter, scale: float):
-        to_scr = lambda v: int(v * scale)
+        scale = self.pm.get_view_scale()
+        painter.translate(self.offset_x, self.offset_y)
 
-        # WALLS
-        for w in self.pm._walls:
-            color = QColor("#FF5722") if w.selected else QColor(w.color)
-            pen = QPen(color)
-            pen.setWidth(max(2, int(w.thickness * scale)))
-            painter.setPen(pen)
-            painter.drawLine(to_scr(w.x1), to_scr(w.y1), to_scr(w.x2), to_scr(w.y2))
+        t = time.perf_counter()
+        self.draw_underlay(painter, scale)
+        stats.phase("underlay", time.perf_counter() - t)
 
-        # DOORS
-        for d in self.pm._doors:
+        t = time.perf_counter()
+        if self.pm.current_project and self.pm.current_project.grid_visible:
+            self.draw_grid(painter, scale)
+        stats.phase("grid", time.perf_counter() - t)
 
-            painter.save()
-            cx = (d.x + d.width / 2) * scale
-            cy = (d.y + d.height / 2) * scale
+        t = time.perf_counter()
+        self.load_view(scale)
+        stats.phase("load", time.perf_counter() - t)
 
-            painter.translate(cx, cy)
-            painter.rotate(d.rotation)
-            painter.translate(-cx, -cy)
+        drawn = self.draw_layers(painter, scale, stats)
+        self.draw_pending_tiles(painter, scale)
 
-            sx, sy = to_scr(d.x), to_scr(d.y)
-            sw, sh = to_scr(d.width), to_scr(d.height)
-            color = QColor("#FF5722") if d.selected else QColor(d.color)
-            painter.setPen(QPen(color, 2))
-            painter.setBrush(QBrush(color))
-            painter.drawRect(sx, sy, sw, sh)
+        t = time.perf_counter()
+        if self.is_drawing and self.current_tool:
+            self.draw_preview(painter, scale)
+        if self.drop_suggestion:
+            self.draw_drop_suggestion(painter, scale)
+        self.draw_measurements(painter, scale)
+        stats.phase("overlay", time.perf_counter() - t)
 
-            painter.restore()
+        stats.end_frame(time.perf_counter() - t_frame, drawn, len(self.pm.display_list))
 
-        # WINDOWS
-        for w in self.pm._windows:
-            painter.save()
+        painter.resetTransform()
+        self.draw_hud(painter)
 
-            cx = (w.x + w.width / 2) * scale
-            cy = (w.y + w.height / 2) * scale
+    def draw_hud(self, painter):
+        stats = self.frame_stats
+        last = stats.last()
+        if last is None:
+            return
 
-            painter.translate(cx, cy)
-            painter.rotate(w.rotation)
-            painter.translate(-cx, -cy)
+        pct = stats.percentiles()
+        lines = [
+            f"cadru: {last[1]:.2f} ms   FPS: {stats.fps():.1f}",
+            f"p50 {pct['p50']:.2f}  p95 {pct['p95']:.2f}  p99 {pct['p99']:.2f} ms",
+            f"desenate: {last[2]} / {last[3]}",
+        ]
+        lines += [f"{name:<10}{ms:>8.2f} ms" for name, ms in zip(PHASES, last[4:])]
+
+        font = QFont("Monospace", 9)
+        font.setStyleHint(QFont.TypeWriter)
+        painter.setFont(font)
+        line_h = painter.fontMetrics().height()
+        width = max(painter.fontMetrics().width(l) for l in lines) + 16
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 170))
+        painter.drawRect(8, 8, width, line_h * len(lines) + 12)
+        painter.setPen(QColor(255, 255, 255))
+        for i, line in enumerate(lines):
+            painter.drawText(16, 14 + line_h * (i + 1) - painter.fontMetrics().descent(), line)
+
+    def toggle_hud(self):
+        self.frame_stats.enabled = not self.frame_stats.enabled
+        if self.frame_stats.enabled:
+            self.frame_stats.clear()
+        self.update()
+        return self.frame_stats.enabled
 
-            sx, sy = to_scr(w.x), to_scr(w.y)
-            sw, sh = to_scr(w.width), to_scr(w.height)
-            color = QColor("#FF5722") if w.selected else QColor(w.color)
-            painter.setPen(QPen(color, 2))
-            painter.setBrush(QBrush(QColor(173, 216, 230, 150)))
-            painter.drawRect(sx, sy, sw, sh)
+    def draw_grid(self, painter, scale: float):
+        if not self.pm.current_project:
+            return
 
-            painter.restore()
+        self.renderer.draw_grid(
+            painter, self.pm.current_project.grid_size, scale,
+            self.offset_x, self.offset_y, self.width(), self.height()
+        )
 
-        # FURNITURE
-        for f in self.pm._furniture:
-            painter.save()
+    def draw_underlay(self, painter, scale: float):
+        """Fundalul: doar tile-urile vizibile, de la nivelul piramidei potrivit zoom-ului."""
+        u = self.pm.underlay
+        if not u or not u.get("visible", True):
+            return
+        self.underlays.begin_frame()
+        pyramid = self.underlays.pyramid(u["path"])
+        if pyramid is None or not pyramid.ready:
+            return
 
-            cx = (f.x + f.width / 2) * scale
-            cy = (f.y + f.height / 2) * scale
+        k = self.pm.underlay_scale()
+        if k <= 0:
+            return
+        # pixeli de ecran per pixel al imaginii originale
+        screen = k * scale * self.devicePixelRatioF()
+        wanted = pyramid.level_for(screen)
+        level = wanted if wanted in pyramid.ready else min(
+            pyramid.ready, key=lambda l: (l < wanted, abs(l - wanted)))
+
+        vx, vy, vw, vh = self.world_view(scale)
+        x0, y0 = (vx - u["x"]) / k, (vy - u["y"]) / k
+        f = k * scale
+
+        painter.save()
+        painter.setOpacity(u.get("opacity", 0.5))
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for tx, ty in pyramid.tiles_in(level, x0, y0, vw / k, vh / k):
+            img = self.underlays.tile(pyramid, level, tx, ty)
+            src = QRectF(0, 0, img.width(), img.height()) if img is not None else None
+            if img is None:
+                # pana soseste tile-ul, se deseneaza partea lui dintr-un nivel mai mic
+                img, src = self.coarser_tile(pyramid, level, tx, ty)
+                if img is None:
+                    continue
+            span = TILE * (1 << level)
+            w, h = pyramid.levels[level]
+            tw = min(TILE, w - tx * TILE) * (1 << level)
+            th = min(TILE, h - ty * TILE) * (1 << level)
+            target = QRectF((u["x"] + tx * span * k) * scale, (u["y"] + ty * span * k) * scale,
+                            tw * f, th * f)
+            painter.drawImage(target, img, src)
+        painter.restore()
+
+    def coarser_tile(self, pyramid, level, tx, ty):
+        for parent in range(level + 1, len(pyramid.levels)):
+            d = parent - level
+            img = self.underlays.peek(pyramid, parent, tx >> d, ty >> d)
+            if img is None:
+                continue
+            part = TILE >> d
+            sx, sy = (tx - ((tx >> d) << d)) * part, (ty - ((ty >> d) << d)) * part
+            w, h = pyramid.levels[level]
+            sw = min(TILE, w - tx * TILE) / (1 << d)
+            sh = min(TILE, h - ty * TILE) / (1 << d)
+            return img, QRectF(sx, sy, sw, sh)
+        return None, None
+
+    def world_view(self, scale: float):
+        return (-self.offset_x / scale, -self.offset_y / scale,
+                self.width() / scale, self.height() / scale)
+
+    def strip_view(self, rect, scale: float):
+        """Zona plan a unei fasii de ecran, largita cu cativa pixeli pentru contururi."""
+        pad = STRIP_PAD_PX
+        return ((rect.x() - pad - self.offset_x) / scale, (rect.y() - pad - self.offset_y) / scale,
+                (rect.width() + 2 * pad) / scale, (rect.height() + 2 * pad) / scale)
+
+    def load_view(self, scale: float):
+        # proiect fragmentat: tile-urile vederii se incarca in transe, cate una pe frame
+        if self.pm.tiles is not None and self.pm.ensure_view(self.world_view(scale)):
+            QTimer.singleShot(0, self.update)
+
+    def draw_pending_tiles(self, painter, scale: float):
+        """Conturul tile-urilor din vedere care nu sunt (inca) in memorie."""
+        tiles = self.pm.tiles
+        if tiles is None:
+            return
+        pending = [k for k in tiles.tiles_in(*self.world_view(scale)) if k not in tiles.resident]
+        if not pending:
+            return
+        painter.save()
+        painter.setPen(QPen(QColor(170, 170, 170), 1, Qt.DashLine))
+        painter.setBrush(QColor(0, 0, 0, 12))
+        for key in pending:
+            x, y, w, h = tiles.bbox_of(key)
+            painter.drawRect(int(x * scale), int(y * scale), int(w * scale), int(h * scale))
+        painter.restore()
+
+    def on_asset_ready(self, _name):
+        self.assets_epoch += 1
+        self.update()
 
-            painter.translate(cx, cy)
-            painter.rotate(f.rotation)
-            painter.translate(-cx, -cy)
+    def layer_key(self, name) -> tuple:
+        # tot ce schimba continutul rasterului unui strat, in afara de vedere
+        pm = self.pm
+        rev = pm.layer_revision
+        if name is None:
+            known = pm.current_project.layers if pm.current_project else {}
+            return tuple(v for k, v in rev.items() if k not in known)
+        key = (rev.get(name, 0),)
+        if name == "furniture":
+            key += (self.assets_epoch,)
+        elif name == "annotations" and self.show_dimensions:
+            cs = pm.coordinate_system
+            key += (rev.get("structure", 0), rev.get("doors_windows", 0), cs.grid_size, cs.scale)
+        return key
+
+    def draw_layers(self, painter, scale: float, stats=None) -> int:
+        """Compune rasterele straturilor vizibile; redeseneaza doar straturile schimbate."""
+        pm = self.pm
+        dpr = self.devicePixelRatioF()
+        width, height = self.width(), self.height()
+        # pan-ul si zoom-ul nu fac parte din cheie: rasterul e deplasat sau scalat
+        view = (id(pm), width, height, dpr)
+        offset = (self.offset_x, self.offset_y)
+        zooming = self.zoom_preview or self.refining
+        deadline = time.perf_counter() + REFINE_SLICE_MS / 1000
+        unfinished = False
+
+        drawn = 0
+        painter.save()
+        painter.resetTransform()
+        for name in pm.layer_names():
+            if name is not None and not pm.is_layer_visible(name):
+                continue
+
+            count = [0]
+
+            def render(p, rect, name=name):
+                # o fasie descoperita de pan: doar obiectele din ea
+                area = None if rect is None else self.strip_view(rect, scale)
+                p.translate(self.offset_x, self.offset_y)
+                count[0] += self.renderer.draw_layer(p, pm, name, scale, dpr, stats, area)
+                if name == "annotations":
+                    t = time.perf_counter()
+                    self.draw_dimensions(p, scale, area)
+                    if stats is not None:
+                        stats.phase("annotations", time.perf_counter() - t)
+
+            # simbolurile de mobilier sunt desenate cu Multiply; la fel si stratul lor
+            painter.setCompositionMode(
+                QPainter.CompositionMode_Multiply if name == "furniture"
+                else QPainter.CompositionMode_SourceOver
+            )
 
-            sx, sy = to_scr(f.x), to_scr(f.y)
-            sw, sh = to_scr(f.width), to_scr(f.height)
-            color = QColor("#FF5722") if f.selected else QColor(f.color)
-            painter.setPen(QPen(color, 2))
-            painter.setBrush(QBrush(color))
-            painter.drawRect(sx, sy, sw, sh)
+            key = view + self.layer_key(name)
+            last = self.layer_cache.last(name) if zooming else None
+            if last is not None and last[2] != scale:
+                # in timpul zoom-ului: ultimul raster, scalat; dupa zoom: redesenare pe
+                # benzi, in limita timpului unui cadru
+                done = (self.refining and time.perf_counter() < deadline and self.layer_cache.refine(
+                    name, key, width, height, dpr, render, offset, scale, deadline))
+                if not done:
+                    drawn += count[0]
+                    unfinished = True
+                    self.draw_scaled_layer(painter, *last, scale)
+                    continue
+
+            pixmap, _ = self.layer_cache.get(name, key, width, height, dpr, render, offset, scale)
+            drawn += count[0]
+            painter.drawPixmap(0, 0, pixmap)
+        painter.restore()
+
+        if self.refining:
+            if unfinished:
+                QTimer.singleShot(0, self.update)
+            else:
+                self.refining = False
+        return drawn
+
+    def draw_scaled_layer(self, painter, pixmap, offset, old_scale: float, scale: float):
+        """Un raster desenat la alt zoom, adus la vederea curenta."""
+        k = scale / old_scale
+        painter.save()
+        painter.translate(self.offset_x, self.offset_y)
+        painter.scale(k, k)
+        painter.translate(-offset[0], -offset[1])
+        painter.drawPixmap(0, 0, pixmap)
+        painter.restore()
 
-            painter.restore()
+    def draw_dimensions(self, painter, scale: float, view=None):
+        if not self.show_dimensions or not self.pm.current_project:
+            return
+        self.renderer.draw_dimensions(painter, self.pm, scale, view or self.world_view(scale))
 
     def draw_preview(self, painter, scale: float):
+        if self.current_tool == "measure":
+            # segmentul masurat e desenat de draw_measurements
+            return
         painter.setPen(QPen(QColor(100, 100, 100), 2, Qt.DashLine))
 
         sx = int(self.start_x * scale)
@@ -200,6 +441,81 @@ class SimpleCanvas(QWidget):
                 abs(my - sy)
             )
 
+    def draw_drop_suggestion(self, painter, scale: float):
+        obj = self.pm.selected_object
+        if obj is None:
+            return
+        x, y = self.drop_suggestion
+        cx = (x + obj.width / 2) * scale
+        cy = (y + obj.height / 2) * scale
+        w, h = obj.width * scale, obj.height * scale
+
+        painter.save()
+        painter.translate(cx, cy)
+        painter.rotate(obj.rotation)
+        painter.setPen(QPen(QColor(46, 160, 67), 2, Qt.DashLine))
+        painter.setBrush(QColor(46, 160, 67, 50))
+        painter.drawRect(int(-w / 2), int(-h / 2), int(w), int(h))
+        painter.restore()
+
+    def draw_measurements(self, painter, scale: float):
+        obj = self.pm.selected_object
+        if obj is not None and self.show_clearances:
+            # recalculate la fiecare cadru, ca sa urmareasca mutarea si vecinii
+            for d, _, pa, pb in self.pm.clearances(obj):
+                self.draw_dimension(painter, pa, pb, self.pm.format_length(d), CLEARANCE_COLOR, scale)
+
+        if self.measure:
+            x1, y1, x2, y2 = self.measure
+            d = math.hypot(x2 - x1, y2 - y1)
+            self.draw_dimension(painter, (x1, y1), (x2, y2), self.pm.format_length(d),
+                                MEASURE_COLOR, scale)
+
+        if self.snap and self.current_tool == "measure":
+            x, y, kind = self.snap
+            painter.setPen(QPen(MEASURE_COLOR, 2))
+            painter.setBrush(Qt.NoBrush)
+            px, py = int(x * scale), int(y * scale)
+            if kind == "endpoint":
+                painter.drawRect(px - 5, py - 5, 10, 10)
+            else:
+                painter.drawLine(px - 5, py - 5, px + 5, py + 5)
+                painter.drawLine(px - 5, py + 5, px + 5, py - 5)
+
+    def draw_dimension(self, painter, a, b, text: str, color: QColor, scale: float):
+        ax, ay = a[0] * scale, a[1] * scale
+        bx, by = b[0] * scale, b[1] * scale
+
+        painter.setPen(QPen(color, 1, Qt.DashLine))
+        painter.setBrush(color)
+        painter.drawLine(int(ax), int(ay), int(bx), int(by))
+        painter.drawEllipse(int(ax) - 2, int(ay) - 2, 4, 4)
+        painter.drawEllipse(int(bx) - 2, int(by) - 2, 4, 4)
+
+        painter.setFont(QFont("Arial", 8))
+        fm = painter.fontMetrics()
+        w = fm.width(text) + 6
+        h = fm.height()
+        x = int((ax + bx) / 2 - w / 2)
+        y = int((ay + by) / 2 - h / 2)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(255, 255, 255, 220))
+        painter.drawRect(x, y, w, h)
+        painter.setPen(color)
+        painter.drawText(x + 3, y + h - fm.descent(), text)
+
+    def update_drop_suggestion(self, wx, wy):
+        obj = self.pm.selected_object
+        want_x = self.drag_origin[0] + wx - self.drag_anchor[0]
+        want_y = self.drag_origin[1] + wy - self.drag_anchor[1]
+        if abs(obj.x - want_x) < 0.5 and abs(obj.y - want_y) < 0.5:
+            # mutarea a reusit, nu e nevoie de sugestie
+            self.drop_suggestion = None
+            return
+        self.drop_suggestion = self.pm.nearest_free_position(
+            obj.width, obj.height, want_x, want_y, obj.rotation, ignore=obj
+        )
+
     # =============================== MOUSE ==============================
     #MODIFICARE ROTIRE
     def mousePressEvent(self, e):
@@ -223,6 +539,9 @@ class SimpleCanvas(QWidget):
             self.is_rotating = True
             self.rotate_start_angle = self._angle_to_mouse(cx, cy, wx, wy)
             self.initial_rotation = obj.rotation
+            self.rotate_applied = 0.0
+            # toata rotirea devine un singur pas de undo
+            self.pm.begin()
             return
 
         if e.button() != Qt.LeftButton:
@@ -232,6 +551,16 @@ class SimpleCanvas(QWidget):
         wy = (e.y() - self.offset_y) / scale
 
 
+        # MEASURE MODE
+        if self.current_tool == "measure":
+            if self.snap:
+                wx, wy = self.snap[:2]
+            self.is_drawing = True
+            self.start_x, self.start_y = wx, wy
+            self.measure = (wx, wy, wx, wy)
+            self.update()
+            return
+
         # DRAW MODE
         if self.current_tool:
             if self.pm.current_project and self.pm.current_project.snap_to_grid:
@@ -249,6 +578,10 @@ class SimpleCanvas(QWidget):
             self.is_moving = True
             self.drag_start_x = wx
             self.drag_start_y = wy
+            self.drag_origin = (obj.x, obj.y)
+            self.drag_anchor = (wx, wy)
+            # toata tragerea devine un singur pas de undo
+            self.pm.begin()
 
         self.project_changed_signal.emit()
         self.update()
@@ -284,12 +617,21 @@ class SimpleCanvas(QWidget):
             current_angle = self._angle_to_mouse(cx, cy, wx, wy)
             delta = current_angle - self.rotate_start_angle
 
-            Transform.rotate(obj, delta)
-            obj.rotation = (self.initial_rotation + delta) % 360
+            # incremental fata de ultimul eveniment: peretii isi rotesc capetele
+            self.pm.rotate_selected(delta - self.rotate_applied)
+            self.rotate_applied = delta
 
             self.update()
             return
 
+        if self.current_tool == "measure":
+            self.snap = self.pm.snap_point(wx, wy, SNAP_RADIUS_PX / scale)
+            if self.is_drawing:
+                ex, ey = self.snap[:2] if self.snap else (wx, wy)
+                self.measure = (self.start_x, self.start_y, ex, ey)
+            self.update()
+            return
+
         if self.is_drawing:
             self.update()
             return
@@ -300,11 +642,15 @@ class SimpleCanvas(QWidget):
             self.pm.translate_selected(dx, dy)
             self.drag_start_x = wx
             self.drag_start_y = wy
+            if isinstance(self.pm.selected_object, Furniture):
+                self.update_drop_suggestion(wx, wy)
             self.update()
     #MODIFICARE ROTIRE
     def mouseReleaseEvent(self, e):
         scale = self.pm.get_view_scale()
         if e.button() == Qt.RightButton:
+            if self.is_rotating:
+                self.pm.commit()
             self.is_rotating = False
             self.project_changed_signal.emit()
             self.update()
@@ -324,6 +670,15 @@ class SimpleCanvas(QWidget):
         if self.is_moving:
             self.is_moving = False
 
+            # mobilierul blocat de obstacole ajunge in pozitia libera sugerata
+            obj = self.pm.selected_object
+            if self.drop_suggestion and obj:
+                sx, sy = self.drop_suggestion
+                self.pm.translate_selected(sx - obj.x, sy - obj.y)
+                self.status_message_signal.emit("Mobilier mutat în cea mai apropiată poziție liberă")
+            self.drop_suggestion = None
+            self.pm.commit()
+
             # FIX CRUCIAL – PREVINE DESENAREA DUPĂ MUTARE
             self.is_drawing = False
             self.current_tool = None
@@ -332,6 +687,15 @@ class SimpleCanvas(QWidget):
             self.update()
             return
 
+        # FINISH MEASURE
+        if self.is_drawing and self.current_tool == "measure":
+            self.is_drawing = False
+            x1, y1, x2, y2 = self.measure
+            d = math.hypot(x2 - x1, y2 - y1)
+            self.status_message_signal.emit(f"Distanță: {self.pm.format_length(d)}")
+            self.update()
+            return
+
         # FINISH DRAW
         if self.is_drawing and self.current_tool:
             self.is_drawing = False
@@ -354,7 +718,8 @@ class SimpleCanvas(QWidget):
                 self.pm.add_window(min(sx, ex), min(sy, ey), abs(ex - sx), abs(ey - sy))
                 self.status_message_signal.emit("Fereastră adăugată")
             elif self.current_tool == "furniture":
-                self.pm.add_furniture(min(sx, ex), min(sy, ey), abs(ex - sx), abs(ey - sy), "mobilier")
+                self.pm.add_furniture(min(sx, ex), min(sy, ey), abs(ex - sx), abs(ey - sy),
+                                     self.furniture_type)
                 self.status_message_signal.emit("Mobilier adăugat")
 
             self.project_changed_signal.emit()
@@ -383,9 +748,19 @@ class SimpleCanvas(QWidget):
         self.offset_x = cx - wx * new_scale
         self.offset_y = cy - wy * new_scale
 
+        # rasterele vechi sunt scalate pana se opreste rotita, apoi redesenate
+        self.zoom_preview = True
+        self.refining = False
+        self.zoom_timer.start()
+
         self.status_message_signal.emit(f"Zoom: {new_scale:.2f}x")
         self.update()
 
+    def refine_zoom(self):
+        self.zoom_preview = False
+        self.refining = True
+        self.update()
+
 #=================================Rotire=========================
 
     def _angle_to_mouse(self, cx, cy, mx, my):
@@ -399,6 +774,10 @@ class SimpleCanvas(QWidget):
 
 class WorkPage(Page):
 
+    @property
+    def pm(self) -> ProjectManager:
+        return self.workspace.active
+
     # -------------------------- Undo / Redo ---------------------------
 
     def undo(self):
@@ -417,12 +796,62 @@ class WorkPage(Page):
         else:
             self.lbl_status.setText("Nu există acțiuni pentru redo")
 
+    # ------------------------ Copiere / Multiplicare -------------------
+
+    def copy_selection(self):
+        objs = self.pm.copy_selection()
+        if not objs:
+            self.lbl_status.setText("Selectează un obiect pentru copiere")
+            return
+        self.workspace.clipboard = objs
+        self.lbl_status.setText(f"{len(objs)} obiecte copiate")
+
+    def paste_clipboard(self):
+        clip = self.workspace.clipboard
+        if not clip:
+            self.lbl_status.setText("Clipboard gol")
+            return
+        # grupul lipit e centrat pe ultima pozitie a mouse-ului pe canvas
+        scale = self.pm.get_view_scale()
+        mx = (self.canvas.mouse_x - self.canvas.offset_x) / scale
+        my = (self.canvas.mouse_y - self.canvas.offset_y) / scale
+        cx, cy = group_center(clip)
+        added = self.pm.paste(clip, mx - cx, my - cy)
+        self.report_added(added, len(clip), "lipite")
+
+    def array_selection(self):
+        group = self.pm.copy_selection()
+        if not group:
+            self.lbl_status.setText("Selectează un obiect pentru multiplicare")
+            return
+        _, _, w, h = obstacle_box(self.pm.selected_object)
+        dlg = ArrayDialog(self, size=(w, h), center=polar_center(group))
+        if not dlg.exec_():
+            return
+        if dlg.polar:
+            added = self.pm.array_polar(dlg.count.value(), dlg.cx.value(), dlg.cy.value(),
+                                        dlg.angle.value())
+            wanted = (dlg.count.value() - 1) * len(group)
+        else:
+            added = self.pm.array_rectangular(dlg.rows.value(), dlg.cols.value(),
+                                              dlg.dx.value(), dlg.dy.value())
+            wanted = (dlg.rows.value() * dlg.cols.value() - 1) * len(group)
+        self.report_added(added, wanted, "adăugate")
+
+    def report_added(self, added, wanted, verb):
+        self.canvas.update()
+        self.refresh_statistics()
+        text = f"{len(added)} obiecte {verb}"
+        if len(added) < wanted:
+            text += f", {wanted - len(added)} respinse (coliziuni)"
+        self.lbl_status.setText(text)
+
     # ----------------------------- INIT UI ----------------------------
 
     def init_ui(self):
-        self.pm = ProjectManager()
-        if not self.pm.current_project:
-            self.pm.create_new_project("Proiect Nou")
+        self.workspace = Workspace.instance()
+        if not self.workspace.active:
+            self.workspace.new_document("Proiect Nou")
 
         main = QVBoxLayout()
         main.setContentsMargins(0, 0, 0, 0)
@@ -438,8 +867,20 @@ class WorkPage(Page):
         canvas_holder = QWidget()
         ch_layout = QVBoxLayout()
         ch_layout.setContentsMargins(10, 10, 10, 10)
-
-        self.canvas = SimpleCanvas(self)
+        ch_layout.setSpacing(0)
+
+        self.tabs = QTabBar()
+        self.tabs.setTabsClosable(True)
+        self.tabs.setExpanding(False)
+        self.tabs.setDocumentMode(True)
+        for i in range(len(self.workspace)):
+            self.tabs.addTab(self.workspace.title(i))
+        self.tabs.setCurrentIndex(self.workspace.active_index)
+        self.tabs.currentChanged.connect(self.switch_document)
+        self.tabs.tabCloseRequested.connect(self.close_document)
+        ch_layout.addWidget(self.tabs)
+
+        self.canvas = SimpleCanvas(self, self.pm)
         ch_layout.addWidget(self.canvas)
 
         canvas_holder.setLayout(ch_layout)
@@ -460,16 +901,27 @@ class WorkPage(Page):
         # Shortcuts
         QShortcut(QKeySequence("Ctrl+Z"), self).activated.connect(self.undo)
         QShortcut(QKeySequence("Ctrl+Y"), self).activated.connect(self.redo)
+        QShortcut(QKeySequence("Ctrl+C"), self).activated.connect(self.copy_selection)
+        QShortcut(QKeySequence("Ctrl+V"), self).activated.connect(self.paste_clipboard)
+        QShortcut(QKeySequence("F3"), self).activated.connect(self.toggle_hud)
+        QShortcut(QKeySequence("Ctrl+F3"), self).activated.connect(self.dump_frame_stats)
 
-        # Timer pentru refresh statisitici (optional)
-        self.refresh_timer = QTimer()
+        # Timer pentru refresh statisitici (optional), pornit doar cat pagina e vizibila
+        self.refresh_timer = QTimer(self)
         self.refresh_timer.timeout.connect(self.refresh_statistics)
-        self.refresh_timer.start(1000)
     #MODIFICARE PT ROTIRE
         QShortcut(QKeySequence("Escape"), self).activated.connect(self.deselect_all)
 
         self.refresh_statistics()
 
+    def showEvent(self, e):
+        super().showEvent(e)
+        self.refresh_timer.start(1000)
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        self.refresh_timer.stop()
+
     # ----------------------------- HEADER -----------------------------
 
     def create_header(self):
@@ -485,6 +937,7 @@ class WorkPage(Page):
                 margin: 0 4px;
             }
             QPushButton:hover { background-color: #2679AE; }
+            QPushButton:checked { background-color: #FF6F61; }
             QLabel { color: white; font-size: 18px; font-weight: bold; }
         """)
 
@@ -505,6 +958,31 @@ class WorkPage(Page):
         btn_load.clicked.connect(self.load_project)
         h.addWidget(btn_load)
 
+        btn_import_dxf = QPushButton("Import DXF")
+        btn_import_dxf.clicked.connect(self.import_dxf)
+        h.addWidget(btn_import_dxf)
+
+        btn_import_scan = QPushButton("Import scanare")
+        btn_import_scan.setToolTip("Trasează pereții dintr-un plan scanat (PNG/JPG)")
+        btn_import_scan.clicked.connect(self.import_scan)
+        h.addWidget(btn_import_scan)
+
+        btn_export_svg = QPushButton("Export SVG")
+        btn_export_svg.clicked.connect(self.export_svg)
+        h.addWidget(btn_export_svg)
+
+        btn_export_takeoff = QPushButton("Export cantități")
+        btn_export_takeoff.setToolTip("Antemăsurătoare: pereți, uși, ferestre, mobilier și camere (CSV/JSON)")
+        btn_export_takeoff.clicked.connect(self.export_takeoff)
+        h.addWidget(btn_export_takeoff)
+
+        self.btn_trace = QPushButton("Trace")
+        self.btn_trace.setCheckable(True)
+        self.btn_trace.setChecked(tracer.enabled)
+        self.btn_trace.setToolTip("Înregistrează operațiile; la oprire se salvează un fișier Chrome trace")
+        self.btn_trace.toggled.connect(self.toggle_tracing)
+        h.addWidget(self.btn_trace)
+
         btn_menu = QPushButton("Meniu")
         btn_menu.clicked.connect(lambda: self.dashboard.update_page("main"))
         h.addWidget(btn_menu)
@@ -566,9 +1044,81 @@ class WorkPage(Page):
         self.btn_furniture.clicked.connect(lambda: self.select_tool("furniture"))
         tl.addWidget(self.btn_furniture)
 
+        self.btn_measure = QPushButton("Măsurare")
+        self.btn_measure.setCheckable(True)
+        self.btn_measure.clicked.connect(lambda: self.select_tool("measure"))
+        tl.addWidget(self.btn_measure)
+
+        self.clearance_check = QCheckBox("Distanțe față de vecini")
+        self.clearance_check.setChecked(True)
+        self.clearance_check.stateChanged.connect(self.toggle_clearances)
+        tl.addWidget(self.clearance_check)
+
+        self.dimensions_check = QCheckBox("Cote automate")
+        self.dimensions_check.setChecked(False)
+        self.dimensions_check.stateChanged.connect(self.toggle_dimensions)
+        tl.addWidget(self.dimensions_check)
+
+        self.furniture_combo = QComboBox()
+        self.furniture_combo.addItem("Generic", "mobilier")
+        for sym in SYMBOLS.values():
+            self.furniture_combo.addItem(sym.label, sym.name)
+        self.furniture_combo.currentIndexChanged.connect(self.change_furniture_type)
+        tl.addWidget(self.furniture_combo)
+
         tools.setLayout(tl)
         v.addWidget(tools)
 
+        # Editare
+        edit = QGroupBox("Editare")
+        el = QVBoxLayout()
+
+        btn_copy = QPushButton("Copiază")
+        btn_copy.setToolTip("Copiază obiectul selectat (Ctrl+C)")
+        btn_copy.clicked.connect(self.copy_selection)
+        el.addWidget(btn_copy)
+
+        btn_paste = QPushButton("Lipește")
+        btn_paste.setToolTip("Lipește la poziția mouse-ului (Ctrl+V)")
+        btn_paste.clicked.connect(self.paste_clipboard)
+        el.addWidget(btn_paste)
+
+        btn_array = QPushButton("Multiplică…")
+        btn_array.setToolTip("Copii pe o grilă sau în jurul unui punct")
+        btn_array.clicked.connect(self.array_selection)
+        el.addWidget(btn_array)
+
+        edit.setLayout(el)
+        v.addWidget(edit)
+
+        # Layers
+        layers = QGroupBox("Straturi")
+        ll = QVBoxLayout()
+        self.layer_checks = {}
+        for name, label in LAYER_LABELS.items():
+            row = QHBoxLayout()
+            visible = QCheckBox(label)
+            visible.stateChanged.connect(lambda _s, n=name: self.toggle_layer_visible(n))
+            locked = QCheckBox("blocat")
+            locked.stateChanged.connect(lambda _s, n=name: self.toggle_layer_locked(n))
+            row.addWidget(visible)
+            row.addWidget(locked)
+            ll.addLayout(row)
+            self.layer_checks[name] = (visible, locked)
+
+        row = QHBoxLayout()
+        self.underlay_check = QCheckBox("Fundal")
+        self.underlay_check.setToolTip("Imaginea scanată de sub grilă (blocată)")
+        self.underlay_check.stateChanged.connect(self.toggle_underlay)
+        btn_underlay = QPushButton("Alege…")
+        btn_underlay.clicked.connect(self.choose_underlay)
+        row.addWidget(self.underlay_check)
+        row.addWidget(btn_underlay)
+        ll.addLayout(row)
+        layers.setLayout(ll)
+        v.addWidget(layers)
+        self.sync_layer_controls()
+
         # Grid settings
         grid = QGroupBox("Setări grilă")
         gl = QVBoxLayout()
@@ -694,19 +1244,48 @@ class WorkPage(Page):
         self.pm.select_object(None)
 
         # deselectăm toate uneltele
-        for b in [self.btn_wall, self.btn_door, self.btn_window, self.btn_furniture]:
+        for b in [self.btn_wall, self.btn_door, self.btn_window, self.btn_furniture, self.btn_measure]:
             b.setChecked(False)
 
-        # anulăm tool-ul curent
+        # anulăm tool-ul curent și măsurătoarea
         self.canvas.current_tool = None
+        self.canvas.measure = None
+        self.canvas.snap = None
 
         self.lbl_status.setText("Gata | Nimic selectat")
         self.canvas.update()
 
+    def toggle_hud(self):
+        on = self.canvas.toggle_hud()
+        self.lbl_status.setText("HUD cadre pornit (Ctrl+F3 = export CSV)" if on else "HUD cadre oprit")
+
+    def dump_frame_stats(self):
+        fname = f"frame_stats_{datetime.now():%Y%m%d_%H%M%S}.csv"
+        n = self.canvas.frame_stats.to_csv(fname)
+        if n:
+            self.lbl_status.setText(f"{n} cadre scrise în {os.path.abspath(fname)}")
+        else:
+            self.lbl_status.setText("Nu există cadre înregistrate (pornește HUD-ul cu F3)")
+
+    def toggle_tracing(self, on: bool):
+        if on:
+            tracer.start()
+            self.lbl_status.setText("Trace pornit")
+            return
+
+        tracer.stop()
+        fname = f"trace_{datetime.now():%Y%m%d_%H%M%S}.json"
+        try:
+            n = tracer.export_chrome(fname)
+            self.lbl_status.setText(f"{n} span-uri scrise în {os.path.abspath(fname)}")
+        except Exception as e:
+            print(f"Eroare la export trace: {e}")
+            self.lbl_status.setText("Eroare la export trace")
+
     # ----------------------- TOOLBAR / GRID LOGIC ----------------------
 
     def select_tool(self, tool: str):
-        for b in [self.btn_wall, self.btn_door, self.btn_window, self.btn_furniture]:
+        for b in [self.btn_wall, self.btn_door, self.btn_window, self.btn_furniture, self.btn_measure]:
             b.setChecked(False)
 
         if tool == "wall":
@@ -721,9 +1300,64 @@ class WorkPage(Page):
         elif tool == "furniture":
             self.btn_furniture.setChecked(True)
             self.lbl_status.setText("Mobilier: click & drag pentru desenare")
+        elif tool == "measure":
+            self.btn_measure.setChecked(True)
+            self.lbl_status.setText("Măsurare: click & drag, capetele se prind de colțuri și muchii")
 
         self.canvas.current_tool = tool
 
+    def toggle_clearances(self):
+        self.canvas.show_clearances = self.clearance_check.isChecked()
+        self.canvas.update()
+
+    def toggle_layer_visible(self, name: str):
+        on = self.layer_checks[name][0].isChecked()
+        self.pm.set_layer_visible(name, on)
+        self.canvas.update()
+        self.refresh_statistics()
+        self.lbl_status.setText(f"Strat {LAYER_LABELS[name]}: {'vizibil' if on else 'ascuns'}")
+
+    def toggle_layer_locked(self, name: str):
+        on = self.layer_checks[name][1].isChecked()
+        self.pm.set_layer_locked(name, on)
+        self.canvas.update()
+        self.refresh_statistics()
+        self.lbl_status.setText(f"Strat {LAYER_LABELS[name]}: {'blocat' if on else 'deblocat'}")
+
+    def choose_underlay(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Fundal", "", "Imagini (*.png *.jpg *.jpeg *.tif *.tiff)"
+        )
+        if not fname:
+            return
+        current = self.pm.underlay
+        cm, ok = QInputDialog.getDouble(
+            self, "Scara fundalului", "Centimetri reali per pixel de imagine:",
+            current["cm_per_pixel"] if current else 1.0, 0.001, 10000.0, 3
+        )
+        if not ok:
+            return
+        self.pm.set_underlay(fname, cm)
+        self.sync_layer_controls()
+        self.canvas.update()
+        self.lbl_status.setText("Fundal setat; piramida de tile-uri se construiește în fundal la prima deschidere")
+
+    def toggle_underlay(self):
+        if not self.pm.underlay:
+            return
+        on = self.underlay_check.isChecked()
+        self.pm.set_underlay_visible(on)
+        self.canvas.update()
+        self.lbl_status.setText(f"Fundal {'vizibil' if on else 'ascuns'}")
+
+    def toggle_dimensions(self):
+        self.canvas.show_dimensions = self.dimensions_check.isChecked()
+        self.canvas.update()
+
+    def change_furniture_type(self, index: int):
+        self.canvas.furniture_type = self.furniture_combo.itemData(index)
+        self.select_tool("furniture")
+
     def change_grid_size(self, value: int):
         if self.pm.current_project:
             self.pm.current_project.grid_size = value
@@ -760,30 +1394,32 @@ class WorkPage(Page):
         if reply != QMessageBox.Yes:
             return
 
-        # curățăm tot
-        self.pm.current_project.clear()
-        self.pm._clear_cache()
-        # punem stare nouă în istoric
-        self.pm._push_history()
+        # un singur pas de undo pentru toată ștergerea
+        self.pm.clear_objects()
 
         self.canvas.update()
         self.refresh_statistics()
         self.lbl_status.setText("Toate obiectele au fost șterse")
 
     def new_project(self):
-        self.pm.create_new_project("Proiect Nou")
-        self.canvas.update()
-        self.refresh_statistics()
+        self.workspace.new_document(f"Proiect Nou {len(self.workspace) + 1}")
+        self.add_document_tab()
         self.lbl_status.setText("Proiect nou creat")
 
     def save_project(self):
-        fname, _ = QFileDialog.getSaveFileName(
-            self, "Salvează proiect", "", "JSON Files (*.json)"
-        )
+        if self.pm.tiles is not None:
+            # proiect fragmentat: doar tile-urile modificate sunt rescrise in fisierul lui
+            fname = self.pm.current_project.filepath
+        else:
+            fname, _ = QFileDialog.getSaveFileName(
+                self, "Salvează proiect", "", "JSON Files (*.json)"
+            )
         if not fname:
             return
 
         if self.pm.save_project(fname):
+            self.tabs.setTabText(self.workspace.active_index,
+                                 self.workspace.title(self.workspace.active_index))
             QMessageBox.information(self, "Succes", f"Proiect salvat: {fname}")
             self.lbl_status.setText(f"Proiect salvat: {fname}")
         else:
@@ -791,19 +1427,196 @@ class WorkPage(Page):
 
     def load_project(self):
         fname, _ = QFileDialog.getOpenFileName(
-            self, "Deschide proiect", "", "JSON Files (*.json)"
+            self, "Deschide proiect", "", "Proiecte (*.json *.a2dc)"
         )
         if not fname:
             return
 
-        if self.pm.load_project(fname):
-            self.canvas.update()
-            self.refresh_statistics()
+        count = len(self.workspace)
+        if self.workspace.open_document(fname):
+            if len(self.workspace) > count:
+                self.add_document_tab()
+            else:
+                # era deja deschis: doar il aducem in fata
+                self.tabs.setCurrentIndex(self.workspace.active_index)
             QMessageBox.information(self, "Succes", f"Proiect încărcat: {fname}")
             self.lbl_status.setText(f"Proiect încărcat: {fname}")
         else:
             QMessageBox.warning(self, "Eroare", "Nu s-a putut încărca proiectul")
 
+    def progress_dialog(self, text):
+        """Dialog de progres pentru operatiile lungi; intoarce (dialog, callback(fractie))."""
+        progress = QProgressDialog(text, None, 0, 100, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+
+        def step(fraction):
+            progress.setValue(int(fraction * 100))
+            QApplication.processEvents()
+
+        return progress, step
+
+    def import_dxf(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Import DXF", "", "Desene DXF (*.dxf)"
+        )
+        if not fname:
+            return
+
+        progress, step = self.progress_dialog("Se importă planul…")
+        try:
+            report = import_dxf(self.pm, fname, progress=step)
+        except Exception as e:
+            print(f"Eroare la import DXF: {e}")
+            QMessageBox.warning(self, "Eroare", f"Nu s-a putut importa desenul:\n{e}")
+            return
+        finally:
+            progress.close()
+
+        self.canvas.update()
+        self.refresh_statistics()
+        text = f"{report.added} obiecte importate, {report.skipped} entități ignorate"
+        if report.rejected:
+            text += f", {len(report.rejected)} respinse (coliziuni)"
+            box = QMessageBox(QMessageBox.Warning, "Import DXF", text + ".", QMessageBox.Ok, self)
+            box.setDetailedText("\n".join(
+                f"{r['type']} din {r['entity']} (handle {r['handle']}, strat {r['layer']})"
+                for r in report.rejected
+            ))
+            box.exec_()
+        self.lbl_status.setText(text)
+
+    def import_scan(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Import plan scanat", "", "Imagini (*.png *.jpg *.jpeg)"
+        )
+        if not fname:
+            return
+
+        # NumPy e incarcat doar la prima trasare, nu la pornirea aplicatiei
+        from Business.RasterTrace import import_raster
+
+        progress, step = self.progress_dialog("Se trasează pereții…")
+        try:
+            added, rejected = import_raster(self.pm, fname, progress=step)
+        except Exception as e:
+            print(f"Eroare la trasarea imaginii: {e}")
+            QMessageBox.warning(self, "Eroare", f"Nu s-a putut trasa imaginea:\n{e}")
+            return
+        finally:
+            progress.close()
+
+        self.canvas.update()
+        self.refresh_statistics()
+        text = f"{len(added)} pereți trasați"
+        if rejected:
+            text += f", {len(rejected)} respinși (coliziuni)"
+        self.lbl_status.setText(text)
+
+    def export_svg(self):
+        fname, _ = QFileDialog.getSaveFileName(
+            self, "Export SVG", "", "SVG Files (*.svg)"
+        )
+        if not fname:
+            return
+
+        if self.pm.export_svg(fname):
+            self.lbl_status.setText(f"Plan exportat: {fname}")
+        else:
+            QMessageBox.warning(self, "Eroare", "Nu s-a putut exporta planul")
+
+    def export_takeoff(self):
+        fname, selected = QFileDialog.getSaveFileName(
+            self, "Export cantități", "", "CSV (*.csv);;JSON (*.json)"
+        )
+        if not fname:
+            return
+        if not os.path.splitext(fname)[1]:
+            fname += ".json" if "json" in selected else ".csv"
+
+        if self.pm.export_takeoff(fname):
+            totals = self.pm.quantity_takeoff()["totals"]
+            self.lbl_status.setText(
+                f"Cantități exportate: {fname} | pereți net {totals['net_area_m2']} m², "
+                f"{totals['rooms']} camere, {totals['floor_area_m2']} m²"
+            )
+        else:
+            QMessageBox.warning(self, "Eroare", "Nu s-au putut exporta cantitățile")
+
+    # ----------------------------- DOCUMENTE ---------------------------
+
+    def add_document_tab(self):
+        # documentul nou e deja activ in workspace; tab-ul doar il urmeaza
+        index = self.workspace.active_index
+        self.tabs.blockSignals(True)
+        self.tabs.insertTab(index, self.workspace.title(index))
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        self.show_document(index)
+
+    def switch_document(self, index: int):
+        if index < 0 or index == self.workspace.active_index:
+            return
+        self.show_document(index)
+
+    def show_document(self, index: int):
+        # vederea (pan + zoom) documentului vechi ramane in proiectul lui
+        old = self.canvas.pm
+        if old and old.in_transaction:
+            # un gest neterminat in documentul vechi ramane un pas de undo
+            old.commit()
+        if old and old.current_project:
+            old.current_project.pan_x = self.canvas.offset_x
+            old.current_project.pan_y = self.canvas.offset_y
+
+        pm = self.workspace.activate(index)
+        self.canvas.pm = pm
+        self.canvas.is_drawing = self.canvas.is_moving = self.canvas.is_rotating = False
+        if pm.current_project:
+            self.canvas.offset_x = pm.current_project.pan_x
+            self.canvas.offset_y = pm.current_project.pan_y
+            self.sync_grid_controls()
+            self.sync_layer_controls()
+
+        self.canvas.update()
+        self.refresh_statistics()
+
+    def close_document(self, index: int):
+        if len(self.workspace) == 1:
+            # ramane mereu cel putin un document deschis
+            self.workspace.new_document("Proiect Nou")
+            self.add_document_tab()
+
+        self.workspace.close_document(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.setCurrentIndex(self.workspace.active_index)
+        self.tabs.blockSignals(False)
+        self.show_document(self.workspace.active_index)
+
+    def sync_grid_controls(self):
+        project = self.pm.current_project
+        for widget, setter, value in (
+            (self.grid_size_spin, self.grid_size_spin.setValue, project.grid_size),
+            (self.grid_visible_check, self.grid_visible_check.setChecked, project.grid_visible),
+            (self.snap_check, self.snap_check.setChecked, project.snap_to_grid),
+        ):
+            widget.blockSignals(True)
+            setter(value)
+            widget.blockSignals(False)
+
+    def sync_layer_controls(self):
+        u = self.pm.underlay
+        checks = [(self.underlay_check, bool(u and u.get("visible", True)))]
+        for name, (visible, locked) in self.layer_checks.items():
+            checks += [(visible, self.pm.is_layer_visible(name)),
+                       (locked, self.pm.is_layer_locked(name))]
+        for widget, value in checks:
+            widget.blockSignals(True)
+            widget.setChecked(value)
+            widget.blockSignals(False)
+        self.underlay_check.setEnabled(bool(u))
+
     # ----------------------------- UI UPDATE ---------------------------
 
     def update_mouse_position(self, x: int, y: int):
@@ -0,0 +1,191 @@
+# batch.py
+"""Procesare headless a proiectelor JSON, fara interfata grafica.
+
+    python batch.py validate  PATH... [--jobs N] [--timeout S]
+    python batch.py convert   PATH... --out-dir DIR
+    python batch.py chunk     PATH... --out-dir DIR [--tile-size PX]
+    python batch.py export    PATH... --out-dir DIR [--format svg|png] [--scale S]
+    python batch.py import    PATH... --out-dir DIR
+    python batch.py trace     PATH... --out-dir DIR [--scale S]
+    python batch.py takeoff   PATH... --out-dir DIR [--format csv|json]
+
+PATH poate fi un fisier .json / .a2dc (.dxf pentru import, .png / .jpg pentru trace)
+sau un director (cautat recursiv). Fisierele
+sunt distribuite pe un pool de procese; fiecare rezultat e scris pe stdout
+ca o linie JSON, iar la final se scrie un sumar.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from multiprocessing import Pool
+
+_qt_app = None
+
+
+def _init_worker():
+    # randarea foloseste platforma offscreen; nu se creeaza niciun widget
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _ensure_qt():
+    global _qt_app
+    if _qt_app is None:
+        from PyQt5.QtGui import QGuiApplication
+        _qt_app = QGuiApplication.instance() or QGuiApplication(["batch"])
+    return _qt_app
+
+
+def export_png_file(path: str, out_dir: str, scale: float) -> dict:
+    from Business.Batch import load_manager, output_path
+    from Presentation.PlanRenderer import PlanRenderer
+
+    _ensure_qt()
+    pm = load_manager(path)
+    out = output_path(path, out_dir, ".png")
+    image = PlanRenderer().render_image(pm, scale)
+    if not image.save(out):
+        raise IOError(f"nu s-a putut scrie {out}")
+    return {"output": out, "objects": len(pm.get_all_objects()),
+            "size": [image.width(), image.height()]}
+
+
+def _dispatch(command: str, path: str, options: dict) -> dict:
+    from Business import Batch
+
+    if command == "validate":
+        return Batch.validate_file(path)
+    if command == "convert":
+        return Batch.convert_file(path, options["out_dir"])
+    if command == "chunk":
+        return Batch.chunk_file(path, options["out_dir"], options["tile_size"])
+    if command == "import":
+        return Batch.import_dxf_file(path, options["out_dir"])
+    if command == "trace":
+        return Batch.trace_scan_file(path, options["out_dir"], options["scale"])
+    if command == "takeoff":
+        return Batch.takeoff_file(path, options["out_dir"],
+                                  "json" if options["format"] == "json" else "csv")
+    if command == "export":
+        if options["format"] == "png":
+            return export_png_file(path, options["out_dir"], options["scale"])
+        return Batch.export_svg_file(path, options["out_dir"])
+    raise ValueError(f"comanda necunoscuta: {command}")
+
+
+class _FileTimeout(Exception):
+    """Ridicata doar de alarma per fisier; TimeoutError-urile reale (retea, disc) raman erori."""
+
+
+def _on_timeout(signum, frame):
+    raise _FileTimeout("timpul alocat fisierului a expirat")
+
+
+def _run_task(task) -> dict:
+    command, path, options = task
+    timeout = options.get("timeout") or 0
+    use_alarm = timeout > 0 and hasattr(signal, "SIGALRM")
+
+    start = time.perf_counter()
+    result = {"event": "result", "file": path, "command": command, "pid": os.getpid()}
+    try:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _on_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        result.update(_dispatch(command, path, options))
+        result["ok"] = True
+    except _FileTimeout as e:
+        result.update(ok=False, error=str(e), timeout=True)
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}",
+                      traceback=traceback.format_exc(limit=3))
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def collect_files(paths, extensions=(".json", ".a2dc")):
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, names in os.walk(p):
+                files += [os.path.join(root, n) for n in sorted(names) if n.lower().endswith(extensions)]
+        else:
+            files.append(p)
+    return files
+
+
+def emit(record: dict, stream=None):
+    stream = stream or sys.stdout
+    stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def run(command: str, files, options: dict, jobs: int) -> dict:
+    tasks = [(command, f, options) for f in files]
+    total = len(tasks)
+    done = failed = 0
+    start = time.perf_counter()
+
+    emit({"event": "start", "command": command, "files": total, "jobs": jobs})
+
+    # bucati mici pentru echilibrare, dar nu cate un mesaj IPC per fisier mic
+    chunksize = max(1, total // (jobs * 16))
+    with Pool(processes=jobs, initializer=_init_worker) as pool:
+        for result in pool.imap_unordered(_run_task, tasks, chunksize=chunksize):
+            done += 1
+            if not result["ok"]:
+                failed += 1
+            result["done"] = done
+            result["total"] = total
+            emit(result)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "event": "summary", "command": command, "files": total,
+        "ok": total - failed, "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "files_per_s": round(total / elapsed, 2) if elapsed > 0 else None,
+    }
+    emit(summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesare headless a proiectelor 2D")
+    parser.add_argument("command", choices=["validate", "convert", "chunk", "export", "import",
+                                            "trace", "takeoff"])
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="secunde per fisier (0 = fara limita)")
+    parser.add_argument("--out-dir", default="batch_output")
+    parser.add_argument("--format", choices=["svg", "png", "csv", "json"], default="svg",
+                        help="svg/png pentru export, csv/json pentru takeoff")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--tile-size", type=int, default=2048,
+                        help="latura unui tile pentru comanda chunk, in pixeli")
+    args = parser.parse_args(argv)
+
+    options = {
+        "timeout": args.timeout,
+        "out_dir": os.path.abspath(args.out_dir),
+        "format": args.format,
+        "scale": args.scale,
+        "tile_size": args.tile_size,
+    }
+    extensions = {"import": (".dxf",), "trace": (".png", ".jpg", ".jpeg")}.get(
+        args.command, (".json", ".a2dc"))
+    summary = run(args.command, collect_files(args.paths, extensions), options, max(1, args.jobs))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Suita de benchmark-uri.
+
+    python -m benchmarks run [--sizes 100,1000,10000] [--cases a,b] [--output rezultate.json]
+    python -m benchmarks compare vechi.json nou.json [--threshold 0.20]
+    python -m benchmarks generate N [fisier.json]
+
+`run` scrie rezultatele ca JSON (mediana, p95, min per metrica si dimensiune).
+`compare` afiseaza diferentele si iese cu cod 1 daca exista regresii.
+"""
+import argparse
+import json
+import sys
+
+from . import suite
+
+
+def _cmd_run(args):
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    cases = [c for c in args.cases.split(",") if c] if args.cases else None
+    unknown = set(cases or []) - set(suite.CASES)
+    if unknown:
+        print(f"Cazuri necunoscute: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    result = suite.run_suite(sizes, cases, args.seed,
+                             progress=lambda m: print(f"... {m}", file=sys.stderr))
+    if args.startup:
+        from . import bench_startup
+        result["results"]["time_to_first_window"] = {
+            "app": {"median_ms": bench_startup.run(args.startup)["time_to_first_window_ms"]}
+        }
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Rezultate scrise in {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+def _cmd_compare(args):
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    rows = suite.compare(old, new, args.threshold)
+    regressions = [r for r in rows if r["regression"]]
+
+    print(f"{'metrica':<24} {'n':>8} {'vechi ms':>12} {'nou ms':>12} {'dif':>8}")
+    for r in rows:
+        flag = "  REGRESIE" if r["regression"] else ""
+        print(f"{r['metric']:<24} {r['size']:>8} {r['old_ms']:>12.4f} {r['new_ms']:>12.4f} "
+              f"{r['change'] * 100:>7.1f}%{flag}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+    print(f"\n{len(regressions)} regresii (prag {args.threshold * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+def _cmd_generate(args):
+    from Business.ProjectManager import ProjectManager
+    from .generator import populate
+
+    pm = populate(ProjectManager(), args.n, args.seed)
+    out = args.output or f"plan_{args.n}.json"
+    pm.save_project(out)
+    print(f"{len(pm.get_all_objects())} obiecte scrise in {out}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="ruleaza suita")
+    p_run.add_argument("--sizes", default="100,1000,10000",
+                       help="dimensiuni separate prin virgula (pana la 1000000)")
+    p_run.add_argument("--cases", help=f"subset din: {', '.join(suite.CASES)}")
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--startup", type=int, default=0, metavar="RUNS",
+                       help="include si benchmark-ul de pornire (nr. rulari)")
+    p_run.add_argument("--output", "-o")
+    p_run.set_defaults(func=_cmd_run)
+
+    p_cmp = sub.add_parser("compare", help="compara doua rulari")
+    p_cmp.add_argument("old")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=0.20)
+    p_cmp.add_argument("--json", help="scrie si comparatia ca JSON")
+    p_cmp.set_defaults(func=_cmd_compare)
+
+    p_gen = sub.add_parser("generate", help="scrie un plan generat ca proiect JSON")
+    p_gen.add_argument("n", type=int)
+    p_gen.add_argument("output", nargs="?")
+    p_gen.add_argument("--seed", type=int, default=42)
+    p_gen.set_defaults(func=_cmd_generate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
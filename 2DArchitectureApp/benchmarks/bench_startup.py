@@ -0,0 +1,66 @@
+"""Benchmark pornire: timpul pana la prima fereastra.
+
+    python -m benchmarks.bench_startup [--runs 5] [--output startup.json]
+
+Fiecare rulare porneste main.py intr-un proces nou (platforma offscreen),
+cu --profile-startup si --exit-after-startup, si citeste raportul JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once() -> dict:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+        subprocess.run(
+            [sys.executable, "main.py", "--profile-startup", "--exit-after-startup",
+             "--profile-output", path],
+            cwd=APP_DIR, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+
+def run(runs: int = 5) -> dict:
+    reports = [run_once() for _ in range(runs)]
+
+    def median(getter):
+        return round(statistics.median(getter(r) for r in reports), 2)
+
+    result = {
+        "time_to_first_window_ms": median(lambda r: r["marks_ms"]["prima fereastra"]),
+        "runs": runs,
+    }
+    for phase in reports[0]["phases_ms"]:
+        result[f"phase:{phase}_ms"] = median(lambda r: r["phases_ms"][phase])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="fisier JSON pentru rezultate")
+    args = parser.parse_args(argv)
+
+    result = run(args.runs)
+    text = json.dumps(result, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Generator determinist de planuri realiste pentru benchmark-uri.
+
+Planul e o grila de camere: fiecare camera are peretii de sus si din stanga
+(plus peretii de contur), o usa sau o fereastra pe pereti si mobilier asezat
+in interior, departe de pereti. Cu acelasi seed se obtine acelasi plan.
+"""
+import math
+import random
+
+from Business.ArchitecturalObjects import Wall, Door, Window, Furniture
+from Business.SymbolLibrary import SYMBOLS
+
+ROOM_SIZE = 400
+WALL_THICKNESS = 20
+FURNITURE_PER_ROOM = 8
+# ~2 pereti + 2 deschideri + mobilier per camera
+OBJECTS_PER_ROOM = 4 + FURNITURE_PER_ROOM
+
+FURNITURE_TYPES = ["mobilier"] + list(SYMBOLS)
+
+
+def _wall(x1, y1, x2, y2):
+    return Wall(x1, y1, x2, y2, WALL_THICKNESS)
+
+
+def _opening(rng, wall: Wall):
+    #deschidere centrata pe perete, cu bbox-ul suprapus peste perete
+    horizontal = wall.y1 == wall.y2
+    length = 80 if rng.random() < 0.5 else 100
+    cls = Door if length == 80 else Window
+    mid_x = (wall.x1 + wall.x2) / 2
+    mid_y = (wall.y1 + wall.y2) / 2
+    if horizontal:
+        return cls(mid_x - length / 2, mid_y - WALL_THICKNESS / 2, length, WALL_THICKNESS)
+    return cls(mid_x - WALL_THICKNESS / 2, mid_y - length / 2, WALL_THICKNESS, length)
+
+
+def generate(n_objects: int, seed: int = 42):
+    """Returneaza (walls, doors, windows, furniture) cu aproximativ n_objects obiecte."""
+    rng = random.Random(seed)
+    rooms = max(1, n_objects // OBJECTS_PER_ROOM)
+    cols = max(1, int(math.ceil(math.sqrt(rooms))))
+    rows = max(1, int(math.ceil(rooms / cols)))
+
+    walls, doors, windows, furniture = [], [], [], []
+    margin = WALL_THICKNESS + 10
+    cell = (ROOM_SIZE - 2 * margin) / 3
+
+    for r in range(rows):
+        for c in range(cols):
+            if r * cols + c >= rooms:
+                break
+            x0, y0 = c * ROOM_SIZE, r * ROOM_SIZE
+
+            room_walls = [_wall(x0, y0, x0 + ROOM_SIZE, y0), _wall(x0, y0, x0, y0 + ROOM_SIZE)]
+            if c == cols - 1:
+                room_walls.append(_wall(x0 + ROOM_SIZE, y0, x0 + ROOM_SIZE, y0 + ROOM_SIZE))
+            if r == rows - 1:
+                room_walls.append(_wall(x0, y0 + ROOM_SIZE, x0 + ROOM_SIZE, y0 + ROOM_SIZE))
+            walls += room_walls
+
+            for wall in room_walls[:2]:
+                o = _opening(rng, wall)
+                (doors if isinstance(o, Door) else windows).append(o)
+
+            # mobilier pe o grila 3x3 in interior, fara o celula aleasa la intamplare
+            free = list(range(9))
+            free.remove(rng.randrange(9))
+            for slot in free[:FURNITURE_PER_ROOM]:
+                gx, gy = slot % 3, slot // 3
+                w = rng.uniform(0.4, 0.9) * cell
+                h = rng.uniform(0.4, 0.9) * cell
+                fx = x0 + margin + gx * cell + (cell - w) / 2
+                fy = y0 + margin + gy * cell + (cell - h) / 2
+                f = Furniture(fx, fy, w, h, rng.choice(FURNITURE_TYPES))
+                f.rotation = rng.choice([0, 0, 0, 90, 180, 270])
+                furniture.append(f)
+
+    return walls, doors, windows, furniture
+
+
+def populate(pm, n_objects: int, seed: int = 42, name: str = "Benchmark"):
+    """Creeaza un proiect nou in pm si il umple direct (fara add_*; istoricul porneste de la planul generat)."""
+    pm.create_new_project(name, width=1000, height=800)
+    pm.set_objects(*generate(n_objects, seed))
+    return pm
+
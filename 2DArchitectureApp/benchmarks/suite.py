@@ -0,0 +1,483 @@
+"""Cazurile de benchmark si masurarea timpilor."""
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from Business.ArchitecturalObjects import Wall, Door, Furniture
+from Business.CollisionDetector import CollisionDetector
+from Business.ProjectManager import ProjectManager
+
+from .generator import populate, ROOM_SIZE
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(fn: Callable, min_time: float = 0.2, max_reps: int = 1000,
+            min_reps: int = 3, setup: Optional[Callable] = None) -> Dict:
+    """Ruleaza fn repetat (cel putin min_reps, pana la min_time) si da statistici in ms."""
+    samples: List[float] = []
+    total = 0.0
+    while len(samples) < min_reps or (total < min_time and len(samples) < max_reps):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 4),
+        "min_ms": round(samples[0] * 1000, 4),
+        "reps": len(samples),
+    }
+
+
+def _extent(pm):
+    walls = pm._walls
+    return max(w.x2 for w in walls), max(w.y2 for w in walls)
+
+
+# =============================== CASES ===============================
+
+def bench_find_object_at(pm, rng):
+    max_x, max_y = _extent(pm)
+    points = [(rng.uniform(0, max_x), rng.uniform(0, max_y)) for _ in range(64)]
+    it = iter(points * 10 ** 6)
+    return measure(lambda: pm.find_object_at(*next(it)))
+
+
+def bench_collision(pm, rng) -> Dict[str, Dict]:
+    cd = CollisionDetector
+    max_x, max_y = _extent(pm)
+    openings = pm._doors + pm._windows
+
+    # candidat in mijlocul unei camere, ca sa nu iasa devreme din bucla
+    cx = rng.randrange(int(max_x // ROOM_SIZE)) * ROOM_SIZE + ROOM_SIZE / 2
+    cy = rng.randrange(int(max_y // ROOM_SIZE)) * ROOM_SIZE + ROOM_SIZE / 2
+    wall = Wall(cx - 50, cy, cx + 50, cy)
+    door = Door(cx - 40, cy - 10, 80, 20)
+    furn = Furniture(cx - 5, cy - 5, 10, 10)
+    moved = pm._furniture[len(pm._furniture) // 2]
+    all_objects = pm.get_all_objects()
+
+    return {
+        "can_add_wall": measure(lambda: cd.can_add_wall(wall, pm._walls)),
+        "can_add_opening": measure(lambda: cd.can_add_opening(door, pm._walls, openings)),
+        "can_add_furniture": measure(lambda: cd.can_add_furniture(furn, pm._walls, openings)),
+        "can_move_object": measure(lambda: cd.can_move_object(moved, all_objects)),
+    }
+
+
+def bench_translate_selected(pm, rng):
+    obj = pm._furniture[len(pm._furniture) // 2]
+    pm.select_object(obj)
+    step = [1.0]
+
+    def drag():
+        # 20 evenimente de mouse mici, dus-intors
+        for _ in range(20):
+            pm.translate_selected(step[0], 0)
+        step[0] = -step[0]
+
+    result = measure(drag, max_reps=50)
+    pm.select_object(None)
+    return result
+
+
+def bench_free_space(pm, rng) -> Dict[str, Dict]:
+    max_x, max_y = _extent(pm)
+    obj = pm._furniture[len(pm._furniture) // 2]
+    points = [(rng.uniform(0, max_x), rng.uniform(0, max_y)) for _ in range(64)]
+    it = iter(points * 10 ** 6)
+    return {
+        "nearest_free_position": measure(
+            lambda: pm.nearest_free_position(obj.width, obj.height, *next(it), ignore=obj)),
+        "free_regions": measure(
+            lambda: pm.free_regions(*next(it), ROOM_SIZE * 2, ROOM_SIZE * 2)),
+    }
+
+
+def bench_proximity(pm, rng) -> Dict[str, Dict]:
+    max_x, max_y = _extent(pm)
+    obj = pm._furniture[len(pm._furniture) // 2]
+    points = [(rng.uniform(0, max_x), rng.uniform(0, max_y)) for _ in range(64)]
+    it = iter(points * 10 ** 6)
+    return {
+        "nearest_objects": measure(lambda: pm.nearest_objects(*next(it), k=4)),
+        "snap_point": measure(lambda: pm.snap_point(*next(it), 10)),
+        "clearances": measure(lambda: pm.clearances(obj)),
+    }
+
+
+def bench_history(pm, rng) -> Dict[str, Dict]:
+    """O tragere de 100 de pasi ca o singura tranzactie, apoi undo/redo pe ea."""
+    pm.select_object(pm._furniture[len(pm._furniture) // 2])
+
+    def drag():
+        pm.begin()
+        for _ in range(100):
+            pm.translate_selected(0.05, 0)
+        pm.commit()
+
+    # setup-ul anuleaza tragerea anterioara, ca obiectul sa porneasca mereu din acelasi loc
+    result = {"drag_transaction": measure(drag, max_reps=50, setup=pm.undo)}
+    result["undo"] = measure(lambda: (pm.undo(), pm.redo()), max_reps=200)
+    pm.undo()
+    pm.select_object(None)
+    return result
+
+
+def bench_paste(pm, rng, n: int = 10000) -> Dict[str, Dict]:
+    """Lipirea a n scaune intr-o zona goala de langa plan: validare, inserare, un pas de undo."""
+    from Business.ArchitecturalObjects import Furniture
+    from Business.Placement import clone
+
+    _, max_y = _extent(pm)
+    chair = Furniture(0, max_y + 1000, 40, 40, "chair")
+    group = [clone(chair, (i % 100) * 60, (i // 100) * 60) for i in range(n)]
+    # setup-ul anuleaza lipirea anterioara, planul ramane acelasi la fiecare repetitie
+    result = {"paste": measure(lambda: pm.paste(group), max_reps=10, setup=pm.undo)}
+    pm.undo()
+    return result
+
+
+def bench_save_load(pm, rng) -> Dict[str, Dict]:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        save = measure(lambda: pm.save_project(path), max_reps=20)
+        load = measure(lambda: pm.load_project(path), max_reps=20)
+    finally:
+        os.remove(path)
+    return {"Project.save": save, "Project.load": load}
+
+
+def bench_chunked(pm, rng, width: int = 1200, height: int = 800) -> Dict[str, Dict]:
+    """Proiect fragmentat: prima vedere (deschidere + tile-urile vederii + paint), pan, scriere."""
+    from Business.ChunkedProject import ChunkedFile, CHUNKED_EXT
+
+    fd, path = tempfile.mkstemp(suffix=CHUNKED_EXT)
+    os.close(fd)
+    doc = ProjectManager()
+    canvas, paint = _canvas(doc, width, height)
+    try:
+        ChunkedFile.create(path, pm.current_project, pm.display_list)
+        max_x, max_y = _extent(pm)
+
+        def first_view():
+            doc.open_chunked(path)
+            while doc.ensure_view(canvas.world_view(1.0)):
+                pass
+            paint()
+
+        def pan():
+            x, y = rng.uniform(0, max_x), rng.uniform(0, max_y)
+            while doc.ensure_view((x, y, width, height)):
+                pass
+
+        def write_back():
+            doc.tiles.changed(doc._furniture[0])
+            doc.flush_tiles()
+
+        result = {
+            "chunked.first_view": measure(first_view, max_reps=20),
+            "chunked.pan": measure(pan, max_reps=50),
+            "chunked.write_tile": measure(write_back, max_reps=50),
+        }
+    finally:
+        canvas.deleteLater()
+        os.remove(path)
+    return result
+
+
+def bench_tracing(pm, rng) -> Dict[str, Dict]:
+    """Costul unui apel @traced: oprit, pornit si fata de o functie simpla."""
+    from Business.Tracing import Tracer
+
+    local = Tracer(capacity=10_000)
+    calls = 10_000
+
+    def plain():
+        return None
+
+    wrapped = local.traced("noop")(plain)
+
+    def loop(fn):
+        def run():
+            for _ in range(calls):
+                fn()
+        return run
+
+    result = {"tracing.plain_x10k": measure(loop(plain))}
+    result["tracing.disabled_x10k"] = measure(loop(wrapped))
+    local.start()
+    result["tracing.enabled_x10k"] = measure(loop(wrapped))
+    local.stop()
+
+    # acelasi drag ca translate_selected, cu trasarea globala pornita
+    from Business.Tracing import tracer
+    tracer.start()
+    try:
+        result["translate_selected.traced"] = bench_translate_selected(pm, rng)
+    finally:
+        tracer.stop()
+        tracer.clear()
+    return result
+
+
+_qt_app = None
+
+
+def _canvas(pm, width: int, height: int):
+    global _qt_app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage, QPainter
+    from Presentation.WorkPage import SimpleCanvas
+
+    _qt_app = QApplication.instance() or QApplication(["bench"])
+    canvas = SimpleCanvas()
+    canvas.pm = pm
+    canvas.resize(width, height)
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+
+    def paint(cached=False):
+        # implicit fiecare strat e redesenat, ca masuratoarea sa nu fie un cache hit
+        if not cached:
+            canvas.layer_cache.clear()
+        painter = QPainter(image)
+        canvas.render(painter)
+        painter.end()
+
+    return canvas, paint
+
+
+def bench_paint(pm, rng, width: int = 1200, height: int = 800):
+    canvas, paint = _canvas(pm, width, height)
+    result = measure(paint, max_reps=100)
+    canvas.deleteLater()
+    return result
+
+
+def bench_layers(pm, rng, width: int = 1200, height: int = 800) -> Dict[str, Dict]:
+    """Paint din rastere de straturi: totul valid, comutarea unui strat, mobilier ascuns."""
+    canvas, paint = _canvas(pm, width, height)
+    paint()
+
+    def toggle():
+        pm.set_layer_visible("furniture", not pm.is_layer_visible("furniture"))
+        paint(cached=True)
+
+    result = {
+        "paintEvent.cached": measure(lambda: paint(cached=True), max_reps=100),
+        "paintEvent.toggle_layer": measure(toggle, max_reps=100),
+    }
+    pm.set_layer_visible("furniture", False)
+    result["paintEvent.furniture_hidden"] = measure(paint, max_reps=100)
+    pm.set_layer_visible("furniture", True)
+    canvas.deleteLater()
+    return result
+
+
+def bench_pan(pm, rng, width: int = 1200, height: int = 800) -> Dict[str, Dict]:
+    """Paint in timpul pan-ului: rasterele straturilor sunt deplasate, se deseneaza fasiile noi."""
+    canvas, paint = _canvas(pm, width, height)
+    paint()
+    steps = [(rng.randint(-20, 20), rng.randint(-20, 20)) for _ in range(64)]
+    state = {"i": 0}
+
+    def pan():
+        dx, dy = steps[state["i"] % len(steps)]
+        state["i"] += 1
+        canvas.offset_x += dx
+        canvas.offset_y += dy
+        paint(cached=True)
+
+    result = {"paintEvent.pan": measure(pan, max_reps=200)}
+    canvas.deleteLater()
+    return result
+
+
+def bench_zoom(pm, rng, width: int = 1200, height: int = 800) -> Dict[str, Dict]:
+    """Zoom progresiv: cadrele din timpul gestului (rastere scalate) si redesenarea de dupa."""
+    canvas, paint = _canvas(pm, width, height)
+    scale = pm.get_view_scale()
+    paint()
+    factors = [1.1, 0.9]
+    state = {"i": 0}
+
+    def step():
+        # ca wheelEvent: zoom in jurul centrului vederii
+        k = factors[state["i"] % 2]
+        state["i"] += 1
+        old = pm.get_view_scale()
+        pm.set_view_scale(old * k)
+        k = pm.get_view_scale() / old
+        canvas.offset_x = width / 2 - (width / 2 - canvas.offset_x) * k
+        canvas.offset_y = height / 2 - (height / 2 - canvas.offset_y) * k
+        canvas.zoom_preview = True
+        paint(cached=True)
+
+    def refine():
+        step()
+        canvas.refine_zoom()
+        while canvas.refining:
+            paint(cached=True)
+
+    result = {
+        "paintEvent.zoom_gesture": measure(step, max_reps=200),
+        "paintEvent.zoom_refine": measure(refine, max_reps=20),
+    }
+    canvas.zoom_preview = False
+    pm.set_view_scale(scale)
+    canvas.deleteLater()
+    return result
+
+
+def bench_dimensions(pm, rng, width: int = 1200, height: int = 800) -> Dict[str, Dict]:
+    """Paint cu cotele pornite (la zoom normal si micsorat) si calculul lor de la zero."""
+    canvas, paint = _canvas(pm, width, height)
+    canvas.show_dimensions = True
+    scale = pm.get_view_scale()
+
+    def cold():
+        pm.dimensions.invalidate_all()
+        pm.visible_dimensions()
+
+    result = {
+        "paintEvent.dimensions": measure(paint, max_reps=100),
+        "visible_dimensions.cold": measure(cold, max_reps=20),
+    }
+    pm.set_view_scale(0.1)
+    result["paintEvent.dimensions.zoomed_out"] = measure(paint, max_reps=100)
+    pm.set_view_scale(scale)
+    canvas.deleteLater()
+    return result
+
+
+def bench_takeoff(pm, rng) -> Dict[str, Dict]:
+    """Antemasuratoarea: de la zero, repetata fara modificari si dupa editari."""
+    def cold():
+        pm.takeoff.invalidate_all()
+        pm.quantity_takeoff()
+
+    result = {"quantity_takeoff.cold": measure(cold, max_reps=10)}
+    result["quantity_takeoff.cached"] = measure(pm.quantity_takeoff)
+
+    # editarile sunt in setup: se masoara doar aducerea la zi a cantitatilor
+    furniture = pm._furniture[len(pm._furniture) // 2]
+    step = [10.0]
+
+    def move_furniture():
+        pm.select_object(furniture)
+        pm.translate_selected(step[0], 0)
+        step[0] = -step[0]
+
+    result["quantity_takeoff.after_move"] = measure(pm.quantity_takeoff, max_reps=100,
+                                                    setup=move_furniture)
+
+    # stergerea unui perete uneste doua camere; undo le desparte din nou
+    wall = pm._walls[len(pm._walls) // 2]
+
+    def toggle_wall():
+        if wall in pm.display_list:
+            pm.remove_object(wall)
+        else:
+            pm.undo()
+
+    result["quantity_takeoff.wall_edit"] = measure(pm.quantity_takeoff, max_reps=50,
+                                                   setup=toggle_wall)
+    pm.select_object(None)
+    return result
+
+
+CASES = {
+    "find_object_at": bench_find_object_at,
+    "collision": bench_collision,
+    "translate_selected": bench_translate_selected,
+    "free_space": bench_free_space,
+    "proximity": bench_proximity,
+    "history": bench_history,
+    "paste": bench_paste,
+    "save_load": bench_save_load,
+    "chunked": bench_chunked,
+    "paintEvent": bench_paint,
+    "dimensions": bench_dimensions,
+    "layers": bench_layers,
+    "pan": bench_pan,
+    "zoom": bench_zoom,
+    "tracing": bench_tracing,
+    "takeoff": bench_takeoff,
+}
+
+
+# =============================== RUN ================================
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(sizes: List[int], cases: Optional[List[str]] = None, seed: int = 42,
+              progress=None) -> Dict:
+    results: Dict[str, Dict[str, Dict]] = {}
+    pm = ProjectManager()
+
+    for n in sizes:
+        populate(pm, n, seed)
+        for name in cases or list(CASES):
+            if progress:
+                progress(f"{name} @ {n}")
+            out = CASES[name](pm, random.Random(seed))
+            # cazurile cu mai multe masuratori intorc un dict de dict-uri
+            if "median_ms" in out:
+                out = {name: out}
+            for metric, stats in out.items():
+                results.setdefault(metric, {})[str(n)] = stats
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(old: Dict, new: Dict, threshold: float = 0.20, min_delta_ms: float = 0.01) -> List[Dict]:
+    """Compara medianele; o regresie e o crestere relativa peste prag."""
+    rows = []
+    for metric, by_size in new["results"].items():
+        for size, stats in by_size.items():
+            base = old["results"].get(metric, {}).get(size)
+            if not base:
+                continue
+            a, b = base["median_ms"], stats["median_ms"]
+            change = (b - a) / a if a > 0 else 0.0
+            rows.append({
+                "metric": metric,
+                "size": size,
+                "old_ms": a,
+                "new_ms": b,
+                "change": round(change, 4),
+                "regression": change > threshold and (b - a) > min_delta_ms,
+            })
+    return rows
@@ -1,11 +1,69 @@
 # main.py
 import sys
-from PyQt5.QtWidgets import QApplication
 
-from Presentation.Dashboard import Dashboard
 
-if __name__ == '__main__':
+def main():
+    profiler = None
+    if '--profile-startup' in sys.argv:
+        sys.argv.remove('--profile-startup')
+        from Business.StartupProfiler import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install_import_hook()
+
+    # --profile-output FILE: raportul e scris si ca JSON (folosit de benchmark)
+    profile_output = None
+    if '--profile-output' in sys.argv:
+        i = sys.argv.index('--profile-output')
+        if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith('--'):
+            profile_output = sys.argv[i + 1]
+            del sys.argv[i:i + 2]
+        else:
+            # fara fisier: raportul e doar afisat
+            print("--profile-output are nevoie de un fisier; raportul nu va fi salvat")
+            del sys.argv[i]
+
+    exit_after_startup = '--exit-after-startup' in sys.argv
+    if exit_after_startup:
+        sys.argv.remove('--exit-after-startup')
+
+    if profiler:
+        with profiler.phase("import PyQt5"):
+            from PyQt5.QtWidgets import QApplication
+            from PyQt5.QtCore import QTimer
+        with profiler.phase("import Dashboard"):
+            from Presentation.Dashboard import Dashboard
+    else:
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtCore import QTimer
+        from Presentation.Dashboard import Dashboard
+
     app = QApplication(sys.argv)
-    dashboard = Dashboard()
-    dashboard.run()
-    sys.exit(app.exec_())
+    if profiler:
+        profiler.mark("QApplication")
+        with profiler.phase("construire Dashboard"):
+            dashboard = Dashboard()
+        with profiler.phase("show"):
+            dashboard.run()
+    else:
+        dashboard = Dashboard()
+        dashboard.run()
+
+    def first_window():
+        # primul tick al event loop-ului: fereastra a fost desenata
+        if profiler:
+            profiler.mark("prima fereastra")
+            profiler.remove_import_hook()
+            profiler.print_report()
+            if profile_output:
+                profiler.write_json(profile_output)
+        if exit_after_startup:
+            app.quit()
+
+    if profiler or exit_after_startup:
+        QTimer.singleShot(0, first_window)
+
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
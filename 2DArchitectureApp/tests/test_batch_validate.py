@@ -0,0 +1,74 @@
+"""Verdictul din batch validate trebuie sa fie acelasi cu cel al editorului."""
+from Business import Batch
+from Business.ArchitecturalObjects import Wall, Door, Window, Furniture
+from Business.Project import Project
+from Business.ProjectManager import ProjectManager
+from benchmarks.generator import generate
+
+
+def _plan():
+    walls, doors, windows, furniture = generate(300, seed=7)
+    w0 = walls[0]
+    extra = [
+        # perete care il taie pe primul
+        Wall((w0.x1 + w0.x2) / 2, w0.y1 - 100, (w0.x1 + w0.x2) / 2, w0.y1 + 100, 20),
+        # usa peste o deschidere existenta
+        Door(doors[0].x + 10, doors[0].y, doors[0].width, doors[0].height),
+        # fereastra departe de orice perete
+        Window(-500, -500, 100, 20),
+        # mobilier peste un perete
+        Furniture(w0.x1 + 50, w0.y1 - 10, 60, 40),
+    ]
+    # o adnotare nu se ciocneste cu nimic, chiar daca e peste un perete
+    note = Furniture(w0.x1 + 150, w0.y1 - 10, 60, 40)
+    note.layer = "annotations"
+    extra.append(note)
+    return walls + doors + windows + furniture + extra
+
+
+def _by_kind(objects):
+    order = {Wall: 0, Door: 1, Window: 1}
+    return sorted(objects, key=lambda o: order.get(type(o), 2))
+
+
+def _editor_rejects(objects):
+    """Obiectele respinse cand sunt adaugate pe rand in editor (lipire)."""
+    pm = ProjectManager()
+    pm.create_new_project()
+    rejected = set()
+    for o in _by_kind(objects):
+        if not pm.add_objects([type(o).from_dict(o.to_dict())]):
+            rejected.add(o.id)
+    return rejected
+
+
+def _save(objects, path):
+    project = Project("validare")
+    for o in objects:
+        kind = {Wall: project.walls, Door: project.doors, Window: project.windows}
+        kind.get(type(o), project.furniture).append(o.to_dict())
+    assert project.save(str(path))
+
+
+def test_validate_matches_editor(tmp_path):
+    objects = _plan()
+    path = tmp_path / "plan.json"
+    _save(objects, path)
+
+    result = Batch.validate_file(str(path))
+    flagged = {issue["id"] for issue in result["issues"]}
+
+    assert flagged == _editor_rejects(objects)
+    assert len(flagged) == 4
+    assert not result["valid"]
+
+
+def test_editor_plan_is_valid(tmp_path):
+    pm = ProjectManager()
+    pm.create_new_project()
+    pm.add_objects(_by_kind(_plan()))
+    path = tmp_path / "plan.json"
+    assert pm.save_project(str(path))
+
+    result = Batch.validate_file(str(path))
+    assert result["valid"], result["issues"]
@@ -0,0 +1,25 @@
+"""Deschiderile gazduite citite din fisier nu pot strica indexul de intervale."""
+from Business.ArchitecturalObjects import Wall, Door
+from Business.HostedOpenings import OpeningHosts
+
+
+def _door(wall, offset, width):
+    door = Door(0, 0, width, 20)
+    door.host_wall_id = wall.id
+    door.offset = offset
+    return door
+
+
+def test_invalid_hosts_are_left_unhosted():
+    wall = Wall(0, 0, 400, 0, 20)
+    first = _door(wall, 50, 100)
+    inside = _door(wall, 65, 30)
+    past_end = _door(wall, 390, 100)
+
+    hosts = OpeningHosts()
+    hosts.rebuild([wall], [first, inside, past_end])
+
+    assert hosts.hosted(wall) == [first]
+    assert inside.host_wall_id is None and past_end.host_wall_id is None
+    # o deschidere noua in interiorul primei usi e refuzata
+    assert hosts.index_for(wall).overlaps(85, 95)